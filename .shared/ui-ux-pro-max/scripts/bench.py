@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+UI/UX Pro Max Bench - Tokenizer throughput over the full data directory,
+against the original re.sub tokenizer, plus table memory and result-cache
+behaviour with --search
+Usage: python bench.py [--rounds 5] [--no-stem] [--search]
+"""
+
+import argparse
+import csv
+import re
+import time
+from core import (
+    AVAILABLE_STACKS, CSV_CONFIG, DATA_DIR, _RESULT_CACHE, _all_sources, _deep_size, _tokenize,
+    cache_stats, search, search_all, search_stack,
+)
+
+SEARCH_QUERIES = [
+    "dark mode dashboard", "glassmorphism", "fintech colors", "bar chart accessibility",
+    "hero section cta", "button focus keyboard", "serif elegant", "saas landing",
+    "form validation", "animation performance",
+]
+
+
+def load_corpus():
+    """Read every cell of every CSV under the data directory"""
+    texts = []
+    for path in sorted(DATA_DIR.rglob("*.csv")):
+        with open(path, 'r', encoding='utf-8') as f:
+            for row in csv.DictReader(f):
+                texts.extend(str(v) for v in row.values() if v)
+    return texts
+
+
+def baseline_tokenize(text):
+    """The tokenizer BM25 used before the precompiled one, for comparison"""
+    text = re.sub(r'[^\w\s]', ' ', str(text).lower())
+    return [w for w in text.split() if len(w) > 2]
+
+
+def bench_tokenize(texts, rounds, tokenize):
+    """Return (tokens, seconds) for the best of `rounds` passes"""
+    best = float("inf")
+    tokens = 0
+    for _ in range(rounds):
+        start = time.perf_counter()
+        tokens = sum(len(tokenize(t)) for t in texts)
+        best = min(best, time.perf_counter() - start)
+    return tokens, best
+
+
+def dict_rows_bytes():
+    """Footprint of every corpus loaded as full per-row dicts (the pre-columnar layout)"""
+    corpora = []
+    for _, _, file, _, _ in _all_sources():
+        with open(DATA_DIR / file, 'r', encoding='utf-8') as f:
+            corpora.append(list(csv.DictReader(f)))
+    # Measure while everything is alive, so no two objects share an id
+    return _deep_size(corpora, set())
+
+
+def run_queries():
+    """One pass of every query against every domain, every stack and all"""
+    for query in SEARCH_QUERIES:
+        for domain in CSV_CONFIG:
+            search(query, domain)
+        for stack in AVAILABLE_STACKS:
+            search_stack(query, stack)
+        search_all(query)
+
+
+def bench_search(rounds):
+    """Return (cold seconds, best cached seconds) for one pass of run_queries"""
+    run_queries()  # Load tables and build indexes
+    _RESULT_CACHE.clear()
+    start = time.perf_counter()
+    run_queries()
+    cold = time.perf_counter() - start
+
+    cached = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        run_queries()
+        cached = min(cached, time.perf_counter() - start)
+    return cold, cached
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="UI Pro Max Benchmark")
+    parser.add_argument("--rounds", "-r", type=int, default=5, help="Timed passes (default: 5)")
+    parser.add_argument("--no-stem", action="store_true", help="Disable light stemming")
+    parser.add_argument("--search", action="store_true",
+                        help="Also report table memory and result cache hit rate")
+    args = parser.parse_args()
+
+    texts = load_corpus()
+    chars = sum(len(t) for t in texts)
+    stem = not args.no_stem
+    tokens, seconds = bench_tokenize(texts, args.rounds, lambda t: _tokenize(t, stem))
+    base_tokens, base_seconds = bench_tokenize(texts, args.rounds, baseline_tokenize)
+
+    print(f"Cells: {len(texts)} | Chars: {chars} | Tokens: {tokens}")
+    print(f"Best of {args.rounds}: {seconds * 1000:.1f} ms | {tokens / seconds:,.0f} tokens/sec")
+    print(f"re.sub baseline: {base_seconds * 1000:.1f} ms | "
+          f"{base_tokens / base_seconds:,.0f} tokens/sec ({base_tokens} tokens)")
+
+    if args.search:
+        cold, cached = bench_search(args.rounds)
+        stats = cache_stats()
+        searches = len(SEARCH_QUERIES) * (len(CSV_CONFIG) + len(AVAILABLE_STACKS) + 1)
+        print(f"Tables: {stats['tables']} | Rows: {stats['rows']} | "
+              f"Columnar: {stats['table_bytes'] / 1024:.0f} KiB | "
+              f"Row dicts: {dict_rows_bytes() / 1024:.0f} KiB")
+        print(f"{searches} searches | Uncached: {cold * 1000:.1f} ms | "
+              f"Cached (best of {args.rounds}): {cached * 1000:.2f} ms | "
+              f"Hit rate: {stats['result_cache_hit_rate']:.1%} "
+              f"({stats['result_cache_size']} cached)")
@@ -6,13 +6,18 @@ UI/UX Pro Max Core - BM25 search engine for UI/UX style guides
 
 import csv
 import re
+import sys
+import threading
+from functools import lru_cache
 from pathlib import Path
 from math import log
-from collections import defaultdict
+from collections import defaultdict, Counter, OrderedDict
 
 # ============ CONFIGURATION ============
 DATA_DIR = Path(__file__).parent.parent / "data"
 MAX_RESULTS = 3
+RRF_K = 60  # Reciprocal-rank fusion damping constant
+RESULT_CACHE_SIZE = 256  # Search results kept per (domain/stack, normalized query, max_results)
 
 CSV_CONFIG = {
     "style": {
@@ -78,15 +83,87 @@ _STACK_COLS = {
 
 AVAILABLE_STACKS = list(STACK_CONFIG.keys())
 
+# ============ TOKENIZER ============
+_TOKEN_RE = re.compile(r"\w+")
+QUERY_CACHE_SIZE = 1024
+
+# Filler words dropped instead of filtering by length, so "ui", "ux", "3d" survive
+STOPWORDS = frozenset({
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "in", "into", "is",
+    "it", "of", "on", "or", "that", "the", "this", "to", "use", "with", "vs", "via",
+})
+
+# Spelling variants and abbreviations mapped to the term used in the data files
+SYNONYMS = {
+    "colour": "color", "colours": "colors", "grey": "gray", "greys": "grays",
+    "dataviz": "chart", "graph": "chart", "graphs": "charts",
+    "ecommerce": "commerce",
+    "typeface": "font", "typefaces": "fonts", "fintech": "financial",
+    "a11y": "accessibility", "nav": "navigation", "btn": "button",
+    "darkmode": "dark", "anim": "animation", "responsiveness": "responsive",
+}
+
+
+def _light_stem(word):
+    """Strip common plural/verb suffixes; leaves short and non-alphabetic words alone"""
+    if len(word) <= 4 or not word.isalpha():
+        return word
+    if word.endswith("ies"):
+        return word[:-3] + "y"
+    if word.endswith("ing") and len(word) > 5:
+        return word[:-3]
+    if word.endswith("ed") and len(word) > 5:
+        return word[:-2]
+    if word.endswith(("sses", "xes", "zes", "ches", "shes")):
+        return word[:-2]
+    if word.endswith("s") and not word.endswith(("ss", "us", "is")):
+        return word[:-1]
+    return word
+
+
+_WORD_CACHE = {True: {}, False: {}}
+
+
+def _normalize_word(word, stem):
+    """Map a raw lowercase word to its interned index term, or None to drop it"""
+    term = SYNONYMS.get(word, word)
+    if len(term) < 2 or term in STOPWORDS:
+        return None
+    if stem:
+        term = _light_stem(term)
+    return sys.intern(term)
+
+
+def _tokenize(text, stem=True):
+    """Lowercase, split on punctuation, normalize synonyms, drop stopwords, stem, intern"""
+    cache = _WORD_CACHE[bool(stem)]
+    tokens = []
+    for word in _TOKEN_RE.findall(text.lower()):
+        try:
+            term = cache[word]
+        except KeyError:
+            term = cache[word] = _normalize_word(word, stem)
+        if term is not None:
+            tokens.append(term)
+    return tokens
+
+
+@lru_cache(maxsize=QUERY_CACHE_SIZE)
+def _tokenize_query(query, stem=True):
+    """LRU-cached tokenization for repeated queries"""
+    return tuple(_tokenize(query, stem))
+
 
 # ============ BM25 IMPLEMENTATION ============
 class BM25:
     """BM25 ranking algorithm for text search"""
 
-    def __init__(self, k1=1.5, b=0.75):
+    def __init__(self, k1=1.5, b=0.75, stem=True):
         self.k1 = k1
         self.b = b
+        self.stem = stem
         self.corpus = []
+        self.term_freqs = []
         self.doc_lengths = []
         self.avgdl = 0
         self.idf = {}
@@ -94,9 +171,8 @@ class BM25:
         self.N = 0
 
     def tokenize(self, text):
-        """Lowercase, split, remove punctuation, filter short words"""
-        text = re.sub(r'[^\w\s]', ' ', str(text).lower())
-        return [w for w in text.split() if len(w) > 2]
+        """Lowercase, split, remove punctuation, normalize and stem words"""
+        return _tokenize(str(text), self.stem)
 
     def fit(self, documents):
         """Build BM25 index from documents"""
@@ -104,30 +180,25 @@ class BM25:
         self.N = len(self.corpus)
         if self.N == 0:
             return
+        self.term_freqs = [Counter(doc) for doc in self.corpus]
         self.doc_lengths = [len(doc) for doc in self.corpus]
         self.avgdl = sum(self.doc_lengths) / self.N
 
-        for doc in self.corpus:
-            seen = set()
-            for word in doc:
-                if word not in seen:
-                    self.doc_freqs[word] += 1
-                    seen.add(word)
+        for freqs in self.term_freqs:
+            for word in freqs:
+                self.doc_freqs[word] += 1
 
         for word, freq in self.doc_freqs.items():
             self.idf[word] = log((self.N - freq + 0.5) / (freq + 0.5) + 1)
 
     def score(self, query):
         """Score all documents against query"""
-        query_tokens = self.tokenize(query)
+        query_tokens = _tokenize_query(str(query), self.stem)
         scores = []
 
-        for idx, doc in enumerate(self.corpus):
+        for idx, term_freqs in enumerate(self.term_freqs):
             score = 0
             doc_len = self.doc_lengths[idx]
-            term_freqs = defaultdict(int)
-            for word in doc:
-                term_freqs[word] += 1
 
             for token in query_tokens:
                 if token in self.idf:
@@ -143,35 +214,157 @@ class BM25:
 
 
 # ============ SEARCH FUNCTIONS ============
-def _load_csv(filepath):
-    """Load CSV and return list of dicts"""
-    with open(filepath, 'r', encoding='utf-8') as f:
-        return list(csv.DictReader(f))
+class _Table:
+    """Column-oriented CSV contents: one header tuple, rows as tuples of interned strings"""
 
+    __slots__ = ("columns", "positions", "rows")
 
-def _search_csv(filepath, search_cols, output_cols, query, max_results):
-    """Core search function using BM25"""
-    if not filepath.exists():
-        return []
+    def __init__(self, columns, rows):
+        self.columns = columns
+        self.positions = {col: i for i, col in enumerate(columns)}
+        self.rows = rows
+
+    def record(self, row, cols):
+        """Build the output dict for one row, skipping columns the CSV lacks"""
+        positions = self.positions
+        return {col: row[positions[col]] for col in cols if col in positions}
 
-    data = _load_csv(filepath)
+    def column(self, col):
+        """All values of one column, or empty strings if the CSV lacks it"""
+        i = self.positions.get(col)
+        return [row[i] for row in self.rows] if i is not None else [""] * len(self.rows)
 
-    # Build documents from search columns
-    documents = [" ".join(str(row.get(col, "")) for col in search_cols) for row in data]
 
-    # BM25 search
-    bm25 = BM25()
-    bm25.fit(documents)
+def _load_csv(filepath, columns):
+    """Load only `columns` (those present in the file) of a CSV into a _Table"""
+    with open(filepath, 'r', encoding='utf-8') as f:
+        reader = csv.reader(f)
+        header = next(reader, [])
+        keep = [(i, sys.intern(name)) for i, name in enumerate(header) if name in columns]
+        rows = [
+            tuple(sys.intern(cells[i]) if i < len(cells) else "" for i, _ in keep)
+            for cells in reader
+        ]
+    return _Table(tuple(name for _, name in keep), rows)
+
+
+_INDEX_CACHE = {}
+_INDEX_LOCK = threading.Lock()
+
+
+def _get_index(filepath, search_cols, output_cols):
+    """Load CSV and build its BM25 index once, reusing it for later queries"""
+    key = (str(filepath), tuple(search_cols), tuple(output_cols))
+    index = _INDEX_CACHE.get(key)
+    if index is None:
+        with _INDEX_LOCK:
+            index = _INDEX_CACHE.get(key)
+            if index is None:
+                table = _load_csv(filepath, set(search_cols) | set(output_cols))
+
+                # Build documents from search columns
+                columns = [table.column(col) for col in search_cols]
+                documents = [" ".join(values) for values in zip(*columns)]
+
+                bm25 = BM25()
+                bm25.fit(documents)
+                index = _INDEX_CACHE[key] = (table, bm25)
+    return index
+
+
+def _rank_csv(filepath, search_cols, output_cols, query, max_results):
+    """Return the table and its top (row, score) pairs with score > 0"""
+    if not filepath.exists():
+        return None, []
+
+    table, bm25 = _get_index(filepath, search_cols, output_cols)
     ranked = bm25.score(query)
 
-    # Get top results with score > 0
-    results = []
-    for idx, score in ranked[:max_results]:
-        if score > 0:
-            row = data[idx]
-            results.append({col: row.get(col, "") for col in output_cols if col in row})
+    return table, [(table.rows[idx], score) for idx, score in ranked[:max_results] if score > 0]
 
-    return results
+
+def _search_csv(filepath, search_cols, output_cols, query, max_results):
+    """Core search function using BM25"""
+    table, ranked = _rank_csv(filepath, search_cols, output_cols, query, max_results)
+    return [table.record(row, output_cols) for row, _ in ranked]
+
+
+class _ResultCache:
+    """Thread-safe LRU of search results with hit/miss counters"""
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, key, compute):
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+        value = compute()
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = 0
+
+    def __len__(self):
+        return len(self._data)
+
+
+_RESULT_CACHE = _ResultCache(RESULT_CACHE_SIZE)
+
+
+def _cached_results(source, query, max_results, compute):
+    """Results for `source` from the LRU, keyed on normalized query tokens.
+
+    Result dicts are shared between callers and must not be modified.
+    """
+    key = (source, _tokenize_query(str(query)), max_results)
+    return list(_RESULT_CACHE.get_or_compute(key, compute))
+
+
+def _deep_size(obj, seen):
+    """Bytes held by obj and the containers/strings it references (each object once)"""
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(_deep_size(k, seen) + _deep_size(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple)):
+        size += sum(_deep_size(item, seen) for item in obj)
+    return size
+
+
+def cache_stats():
+    """Memory held by the loaded tables and hit rate of the result cache"""
+    seen = set()
+    table_bytes = sum(
+        _deep_size(table.columns, seen) + _deep_size(table.rows, seen)
+        for table, _ in list(_INDEX_CACHE.values())
+    )
+    lookups = _RESULT_CACHE.hits + _RESULT_CACHE.misses
+    return {
+        "tables": len(_INDEX_CACHE),
+        "rows": sum(len(table.rows) for table, _ in list(_INDEX_CACHE.values())),
+        "table_bytes": table_bytes,
+        "result_cache_size": len(_RESULT_CACHE),
+        "result_cache_hits": _RESULT_CACHE.hits,
+        "result_cache_misses": _RESULT_CACHE.misses,
+        "result_cache_hit_rate": round(_RESULT_CACHE.hits / lookups, 4) if lookups else 0.0,
+    }
 
 
 def detect_domain(query):
@@ -196,6 +389,8 @@ def detect_domain(query):
 
 def search(query, domain=None, max_results=MAX_RESULTS):
     """Main search function with auto-domain detection"""
+    if domain == "all":
+        return search_all(query, max_results)
     if domain is None:
         domain = detect_domain(query)
 
@@ -205,7 +400,12 @@ def search(query, domain=None, max_results=MAX_RESULTS):
     if not filepath.exists():
         return {"error": f"File not found: {filepath}", "domain": domain}
 
-    results = _search_csv(filepath, config["search_cols"], config["output_cols"], query, max_results)
+    results = _cached_results(
+        domain, query, max_results,
+        lambda: _search_csv(
+            filepath, config["search_cols"], config["output_cols"], query, max_results
+        ),
+    )
 
     return {
         "domain": domain,
@@ -226,7 +426,12 @@ def search_stack(query, stack, max_results=MAX_RESULTS):
     if not filepath.exists():
         return {"error": f"Stack file not found: {filepath}", "stack": stack}
 
-    results = _search_csv(filepath, _STACK_COLS["search_cols"], _STACK_COLS["output_cols"], query, max_results)
+    results = _cached_results(
+        ("stack", stack), query, max_results,
+        lambda: _search_csv(
+            filepath, _STACK_COLS["search_cols"], _STACK_COLS["output_cols"], query, max_results
+        ),
+    )
 
     return {
         "domain": "stack",
@@ -236,3 +441,70 @@ def search_stack(query, stack, max_results=MAX_RESULTS):
         "count": len(results),
         "results": results
     }
+
+
+def _all_sources():
+    """List (domain, stack, file, search_cols, output_cols) for every corpus"""
+    sources = [
+        (domain, None, config["file"], config["search_cols"], config["output_cols"])
+        for domain, config in CSV_CONFIG.items()
+    ]
+    sources += [
+        ("stack", stack, config["file"], _STACK_COLS["search_cols"], _STACK_COLS["output_cols"])
+        for stack, config in STACK_CONFIG.items()
+    ]
+    return sources
+
+
+def _fuse_all(query, max_results):
+    """Uncached body of search_all: rank every source, then reciprocal-rank fuse"""
+    sources = _all_sources()
+
+    # Sequential on purpose: BM25 scoring is pure Python and holds the GIL,
+    # so a thread pool only adds dispatch overhead
+    ranked_lists = [
+        _rank_csv(DATA_DIR / file, search_cols, output_cols, query, max_results)
+        for _, _, file, search_cols, output_cols in sources
+    ]
+
+    candidates = []
+    for source, (table, ranked) in zip(sources, ranked_lists):
+        if not ranked:
+            continue
+        top = ranked[0][1]
+        for local_rank, (row, score) in enumerate(ranked, 1):
+            candidates.append([source, table, row, score / top, local_rank, 0.0])
+
+    candidates.sort(key=lambda c: c[3], reverse=True)
+    for global_rank, candidate in enumerate(candidates, 1):
+        candidate[5] = 1 / (RRF_K + candidate[4]) + 1 / (RRF_K + global_rank)
+    candidates.sort(key=lambda c: c[5], reverse=True)
+
+    results = []
+    for (domain, stack, file, _, output_cols), table, row, _, _, fused in candidates[:max_results]:
+        result = {"_domain": domain, "_file": file}
+        if stack:
+            result["_stack"] = stack
+        result["_score"] = round(fused, 6)
+        result.update(table.record(row, output_cols))
+        results.append(result)
+    return results
+
+
+def search_all(query, max_results=MAX_RESULTS):
+    """Search every domain and stack and fuse the rankings.
+
+    BM25 scores are not comparable across corpora, so each corpus is
+    max-normalized and the results are merged with reciprocal-rank fusion
+    over two rankings: the rank within the source corpus and the rank by
+    normalized score across all corpora.
+    """
+    results = _cached_results("all", query, max_results, lambda: _fuse_all(query, max_results))
+
+    return {
+        "domain": "all",
+        "query": query,
+        "file": ", ".join(sorted({r["_file"] for r in results})),
+        "count": len(results),
+        "results": results
+    }
@@ -4,7 +4,7 @@
 UI/UX Pro Max Search - BM25 search engine for UI/UX style guides
 Usage: python search.py "<query>" [--domain <domain>] [--stack <stack>] [--max-results 3]
 
-Domains: style, prompt, color, chart, landing, product, ux, typography
+Domains: style, prompt, color, chart, landing, product, ux, typography, all
 Stacks: html-tailwind, react, nextjs
 """
 
@@ -28,7 +28,12 @@ def format_output(result):
 
     for i, row in enumerate(result['results'], 1):
         output.append(f"### Result {i}")
+        if "_domain" in row:
+            source = row.get("_stack") or row["_domain"]
+            output.append(f"- **From:** {source} ({row['_file']})")
         for key, value in row.items():
+            if key.startswith("_"):
+                continue
             value_str = str(value)
             if len(value_str) > 300:
                 value_str = value_str[:300] + "..."
@@ -41,7 +46,8 @@ def format_output(result):
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="UI Pro Max Search")
     parser.add_argument("query", help="Search query")
-    parser.add_argument("--domain", "-d", choices=list(CSV_CONFIG.keys()), help="Search domain")
+    parser.add_argument("--domain", "-d", choices=list(CSV_CONFIG.keys()) + ["all"],
+                        help="Search domain (all: every domain and stack)")
     parser.add_argument("--stack", "-s", choices=AVAILABLE_STACKS, help="Stack-specific search (html-tailwind, react, nextjs)")
     parser.add_argument("--max-results", "-n", type=int, default=MAX_RESULTS, help="Max results (default: 3)")
     parser.add_argument("--json", action="store_true", help="Output as JSON")
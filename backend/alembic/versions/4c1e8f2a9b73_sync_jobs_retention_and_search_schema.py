@@ -0,0 +1,190 @@
+"""Change log, idempotency, jobs, daily stats, task counters, indexes and search
+
+Revision ID: 4c1e8f2a9b73
+Revises: da63ad42bb05
+Create Date: 2026-10-19 20:30:00.000000
+
+Brings a database created by an earlier release up to date. The application
+also creates any missing tables and indexes at startup (``init_db``), so every
+step checks what already exists, and steps on tables that do not exist yet
+are left to ``init_db``.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4c1e8f2a9b73'
+down_revision: Union[str, None] = 'da63ad42bb05'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_INDEXES = (
+    ("tasks", "ix_tasks_order", ["order", "created_at"]),
+    ("tasks", "ix_tasks_completed_order", ["completed", "order", "created_at"]),
+    ("pomodoro_sessions", "ix_pomodoro_sessions_state_created", ["state", "created_at"]),
+    (
+        "pomodoro_sessions",
+        "ix_pomodoro_sessions_type_state_completed",
+        ["session_type", "state", "completed_at"],
+    ),
+    ("pomodoro_sessions", "ix_pomodoro_sessions_task_id", ["task_id"]),
+)
+
+_COMPLETED_FOCUS = "session_type = 'focus' AND state = 'completed' AND task_id = tasks.id"
+
+
+def _create_tables(tables: set) -> None:
+    if "change_log" not in tables:
+        op.create_table(
+            "change_log",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("entity", sa.String(20), nullable=False),
+            sa.Column("entity_id", sa.Integer(), nullable=False),
+            sa.Column("deleted", sa.Boolean(), nullable=False),
+            sa.Column(
+                "created_at", sa.DateTime(timezone=True),
+                server_default=sa.func.now(), nullable=False,
+            ),
+            sqlite_autoincrement=True,
+        )
+        op.create_index("ix_change_log_entity", "change_log", ["entity", "entity_id"])
+
+    if "idempotency_records" not in tables:
+        op.create_table(
+            "idempotency_records",
+            sa.Column("key", sa.String(255), primary_key=True),
+            sa.Column("request_hash", sa.String(64), nullable=False),
+            sa.Column("status_code", sa.Integer(), nullable=True),
+            sa.Column("response_body", sa.Text(), nullable=True),
+            sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+            sa.Column("expires_at", sa.DateTime(timezone=True), nullable=False),
+        )
+        op.create_index(
+            "ix_idempotency_records_expires_at", "idempotency_records", ["expires_at"]
+        )
+
+    if "jobs" not in tables:
+        op.create_table(
+            "jobs",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("kind", sa.String(50), nullable=False),
+            sa.Column("payload", sa.Text(), nullable=True),
+            sa.Column("status", sa.String(20), nullable=False),
+            sa.Column("attempts", sa.Integer(), nullable=False),
+            sa.Column("max_attempts", sa.Integer(), nullable=False),
+            sa.Column("run_after", sa.DateTime(timezone=True), nullable=False),
+            sa.Column("leased_until", sa.DateTime(timezone=True), nullable=True),
+            sa.Column("lease_owner", sa.String(64), nullable=True),
+            sa.Column("last_error", sa.Text(), nullable=True),
+            sa.Column("result", sa.Text(), nullable=True),
+            sa.Column(
+                "created_at", sa.DateTime(timezone=True),
+                server_default=sa.func.now(), nullable=False,
+            ),
+            sa.Column("finished_at", sa.DateTime(timezone=True), nullable=True),
+        )
+        op.create_index("ix_jobs_status_run_after", "jobs", ["status", "run_after"])
+
+    if "pomodoro_daily_stats" not in tables:
+        op.create_table(
+            "pomodoro_daily_stats",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("day", sa.Date(), nullable=False),
+            sa.Column("task_id", sa.Integer(), nullable=True),
+            sa.Column("session_type", sa.String(20), nullable=False),
+            sa.Column("state", sa.String(20), nullable=False),
+            sa.Column("session_count", sa.Integer(), nullable=False),
+            sa.Column("total_minutes", sa.Integer(), nullable=False),
+            sa.Column("paused_duration_ms", sa.BigInteger(), nullable=False),
+        )
+        op.create_index("ix_pomodoro_daily_stats_day", "pomodoro_daily_stats", ["day"])
+
+
+def _add_focus_counters(inspector) -> None:
+    columns = {column["name"] for column in inspector.get_columns("tasks")}
+    if "focus_minutes" in columns:
+        return
+    op.add_column("tasks", sa.Column(
+        "focus_sessions_completed", sa.Integer(), server_default="0", nullable=False
+    ))
+    op.add_column("tasks", sa.Column(
+        "focus_minutes", sa.Integer(), server_default="0", nullable=False
+    ))
+    # Before this release sessions were never archived, so the live table has them all
+    op.execute(
+        "UPDATE tasks SET "
+        "focus_sessions_completed = (SELECT count(*) FROM pomodoro_sessions "
+        f"WHERE {_COMPLETED_FOCUS}), "
+        "focus_minutes = (SELECT coalesce(sum(duration), 0) FROM pomodoro_sessions "
+        f"WHERE {_COMPLETED_FOCUS})"
+    )
+
+
+def _create_search_index(sqlite: bool) -> None:
+    if sqlite:
+        op.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS tasks_fts "
+            "USING fts5(title, description, tokenize='unicode61 remove_diacritics 2')"
+        )
+        op.execute(
+            "INSERT INTO tasks_fts(rowid, title, description) "
+            "SELECT id, title, coalesce(description, '') FROM tasks "
+            "WHERE id NOT IN (SELECT rowid FROM tasks_fts)"
+        )
+    else:
+        op.execute(
+            "ALTER TABLE tasks ADD COLUMN IF NOT EXISTS search_vector tsvector "
+            "GENERATED ALWAYS AS ("
+            "setweight(to_tsvector('simple', coalesce(title, '')), 'A') || "
+            "setweight(to_tsvector('simple', coalesce(description, '')), 'B')"
+            ") STORED"
+        )
+        op.execute(
+            "CREATE INDEX IF NOT EXISTS ix_tasks_search_vector ON tasks USING GIN (search_vector)"
+        )
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    sqlite = bind.dialect.name == "sqlite"
+    tables = set(inspector.get_table_names())
+
+    _create_tables(tables)
+
+    for table, name, columns in _INDEXES:
+        if table not in tables:
+            continue
+        if name not in {index["name"] for index in inspector.get_indexes(table)}:
+            op.create_index(name, table, columns)
+
+    if "tasks" in tables:
+        if "pomodoro_sessions" in tables:
+            _add_focus_counters(inspector)
+        _create_search_index(sqlite)
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    sqlite = bind.dialect.name == "sqlite"
+
+    if sqlite:
+        op.execute("DROP TABLE IF EXISTS tasks_fts")
+    else:
+        op.execute("DROP INDEX IF EXISTS ix_tasks_search_vector")
+        op.execute("ALTER TABLE tasks DROP COLUMN IF EXISTS search_vector")
+
+    with op.batch_alter_table("tasks") as batch:
+        batch.drop_column("focus_minutes")
+        batch.drop_column("focus_sessions_completed")
+
+    for table, name, _ in reversed(_INDEXES):
+        op.drop_index(name, table_name=table)
+
+    op.drop_table("pomodoro_daily_stats")
+    op.drop_table("jobs")
+    op.drop_table("idempotency_records")
+    op.drop_table("change_log")
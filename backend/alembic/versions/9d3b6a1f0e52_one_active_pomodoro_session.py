@@ -0,0 +1,47 @@
+"""At most one active pomodoro session
+
+Revision ID: 9d3b6a1f0e52
+Revises: 4c1e8f2a9b73
+Create Date: 2026-10-19 21:00:00.000000
+
+A database from before the index may hold several active sessions. They are
+left alone and the index is skipped; starting a session cancels the others,
+and ``init_db`` creates the index on the next start after that.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9d3b6a1f0e52'
+down_revision: Union[str, None] = '4c1e8f2a9b73'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_INDEX = "ix_pomodoro_sessions_one_active"
+_ACTIVE = sa.text("state = 'active'")
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    if "pomodoro_sessions" not in inspector.get_table_names():
+        return
+    if _INDEX in {index["name"] for index in inspector.get_indexes("pomodoro_sessions")}:
+        return
+
+    active = bind.execute(sa.text(
+        "SELECT count(*) FROM pomodoro_sessions WHERE state = 'active'"
+    )).scalar()
+    if active > 1:
+        return
+    op.create_index(
+        _INDEX, "pomodoro_sessions", ["state"], unique=True,
+        sqlite_where=_ACTIVE, postgresql_where=_ACTIVE,
+    )
+
+
+def downgrade() -> None:
+    op.execute(f"DROP INDEX IF EXISTS {_INDEX}")
@@ -0,0 +1,34 @@
+"""Index daily stats by task
+
+Revision ID: b7e2c4d91a38
+Revises: 9d3b6a1f0e52
+Create Date: 2026-10-19 22:00:00.000000
+
+Deleting a task unlinks it from the rolled-up daily stats.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e2c4d91a38'
+down_revision: Union[str, None] = '9d3b6a1f0e52'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_INDEX = "ix_pomodoro_daily_stats_task_id"
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    if "pomodoro_daily_stats" not in inspector.get_table_names():
+        return
+    if _INDEX in {index["name"] for index in inspector.get_indexes("pomodoro_daily_stats")}:
+        return
+    op.create_index(_INDEX, "pomodoro_daily_stats", ["task_id"])
+
+
+def downgrade() -> None:
+    op.execute(f"DROP INDEX IF EXISTS {_INDEX}")
@@ -0,0 +1,98 @@
+"""Benchmark focus analytics on a year of synthetic pomodoro sessions.
+
+Builds a throwaway SQLite database (or uses DATABASE_URL when set to an
+empty database), inserts a year of sessions and times each analytics query
+cold and cached.
+
+Usage (from the backend directory):
+    python benchmarks/bench_analytics.py [--sessions-per-day 12] [--tasks 200] [--rounds 5]
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+if "DATABASE_URL" not in os.environ:
+    os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{tempfile.mkdtemp()}/bench_analytics.db"
+
+
+async def seed(db, sessions_per_day: int, task_count: int) -> int:
+    """Insert one year of focus and break sessions spread over waking hours."""
+    from sqlalchemy import insert
+    from src.models.task import Task
+    from src.models.pomodoro import PomodoroSession
+
+    await db.execute(insert(Task), [{"title": f"Task {i}", "order": i} for i in range(task_count)])
+    now = datetime.utcnow()
+    rows = []
+    for day in range(365):
+        base = (now - timedelta(days=day)).replace(hour=7, minute=0, second=0, microsecond=0)
+        for _ in range(random.randint(0, sessions_per_day * 2)):
+            start = base + timedelta(minutes=random.randint(0, 15 * 60))
+            focus = random.random() < 0.7
+            duration = 25 if focus else 5
+            state = "completed" if random.random() < 0.85 else "cancelled"
+            linked = focus and random.random() < 0.8
+            completed = state == "completed"
+            rows.append({
+                "task_id": random.randint(1, task_count) if linked else None,
+                "session_type": "focus" if focus else "break",
+                "duration": duration,
+                "state": state,
+                "started_at": start,
+                "completed_at": start + timedelta(minutes=duration) if completed else None,
+                "paused_duration_ms": 0,
+                "created_at": start,
+            })
+    await db.execute(insert(PomodoroSession), rows)
+    await db.commit()
+    return len(rows)
+
+
+async def main(args: argparse.Namespace) -> None:
+    from src.database import AsyncSessionLocal, init_db
+    from src.services import analytics_service
+
+    await init_db()
+    async with AsyncSessionLocal() as db:
+        count = await seed(db, args.sessions_per_day, args.tasks)
+        print(f"Seeded {count} sessions over 365 days, {args.tasks} tasks")
+
+        metrics = {
+            "streaks": lambda: analytics_service.get_streaks(db),
+            "tasks (365d)": lambda: analytics_service.get_task_focus(db, 365),
+            "hours (365d)": lambda: analytics_service.get_hourly_distribution(db, 365),
+            "completion (365d)": lambda: analytics_service.get_completion_rate(db, 365),
+        }
+        for name, call in metrics.items():
+            cold = []
+            for _ in range(args.rounds):
+                analytics_service._cache.clear()
+                start = time.perf_counter()
+                await call()
+                cold.append(time.perf_counter() - start)
+            start = time.perf_counter()
+            for _ in range(args.rounds):
+                await call()
+            cached = (time.perf_counter() - start) / args.rounds
+            print(f"{name:<18} cold {min(cold) * 1000:8.2f} ms   cached {cached * 1000:6.2f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="FocusFlow analytics benchmark")
+    parser.add_argument(
+        "--sessions-per-day", type=int, default=12, help="Average sessions per day (default: 12)"
+    )
+    parser.add_argument("--tasks", type=int, default=200, help="Number of tasks (default: 200)")
+    parser.add_argument(
+        "--rounds", type=int, default=5, help="Timed rounds per metric (default: 5)"
+    )
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,147 @@
+"""Measure request latency with logging off, synchronous and queued.
+
+Drives the app in-process with concurrent requests while every request writes
+one access-style INFO line, and reports p50/p99 latency for three setups:
+
+    off     no log output at all
+    sync    a plain StreamHandler writing on the event loop
+    queued  the QueueHandler/QueueListener pipeline from src.utils.logging_config
+
+Log output goes to a sink that blocks for ``--sink-latency-ms`` per write, the
+way a full pipe or a busy container log driver does.
+
+Usage (from the backend directory):
+    python benchmarks/bench_logging.py [--requests 3000] [--concurrency 32] [--sink-latency-ms 1]
+"""
+import argparse
+import asyncio
+import io
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+
+BACKEND_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+if "DATABASE_URL" not in os.environ:
+    os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{tempfile.mkdtemp()}/bench_logging.db"
+os.environ.setdefault("RATE_LIMIT_PER_SECOND", "0")
+os.environ.setdefault("JOB_RUNNER_ENABLED", "false")
+
+
+class SlowSink(io.TextIOBase):
+    """A stream whose writes block, counting the lines written."""
+
+    def __init__(self, latency: float) -> None:
+        self.latency = latency
+        self.lines = 0
+
+    def write(self, text: str) -> int:
+        time.sleep(self.latency)
+        self.lines += text.count("\n")
+        return len(text)
+
+
+def with_access_log(app):
+    """Wrap the app so every request logs one INFO line, like an access log."""
+    from src.middleware.request_id import RequestIdMiddleware
+
+    access = logging.getLogger("focusflow.access")
+
+    async def wrapped(scope, receive, send):
+        await app(scope, receive, send)
+        if scope["type"] == "http":
+            access.info("%s %s", scope["method"], scope["path"])
+
+    return RequestIdMiddleware(wrapped)
+
+
+def use_mode(mode: str, sink: SlowSink) -> None:
+    """Point the root logger at ``sink`` in the given mode."""
+    from src.utils import logging_config
+
+    logging_config.shutdown_logging()
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.setLevel(logging.INFO)
+
+    if mode == "off":
+        root.setLevel(logging.CRITICAL)
+    elif mode == "sync":
+        handler = logging.StreamHandler(sink)
+        handler.setFormatter(logging_config.JsonFormatter())
+        root.addHandler(handler)
+    else:
+        logging_config.LOG_FORMAT = "json"
+        logging_config.configure_logging(stream=sink)
+
+
+async def drive(app, path: str, requests: int, concurrency: int) -> list:
+    """Send ``requests`` GETs from ``concurrency`` workers; return latencies in seconds."""
+    latencies = []
+    remaining = iter(range(requests))
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+
+        async def worker():
+            for _ in remaining:
+                start = time.perf_counter()
+                response = await client.get(path)
+                response.raise_for_status()
+                latencies.append(time.perf_counter() - start)
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies
+
+
+async def main(args: argparse.Namespace) -> None:
+    from src.database import init_db
+    from src.main import app
+    from src.utils import logging_config
+
+    await init_db()
+    logging.getLogger("httpx").propagate = False
+    bench_app = with_access_log(app)
+    # Warm up routes, caches and the connection path before measuring
+    use_mode("off", SlowSink(0))
+    await drive(bench_app, args.path, 200, args.concurrency)
+
+    print(f"{args.requests} x GET {args.path}, concurrency {args.concurrency}, "
+          f"sink {args.sink_latency_ms} ms/write")
+    for mode in ("off", "sync", "queued"):
+        sink = SlowSink(args.sink_latency_ms / 1000)
+        use_mode(mode, sink)
+        started = time.perf_counter()
+        latencies = sorted(await drive(bench_app, args.path, args.requests, args.concurrency))
+        elapsed = time.perf_counter() - started
+        logging_config.shutdown_logging()
+
+        p50 = statistics.median(latencies) * 1000
+        p99 = latencies[int(len(latencies) * 0.99) - 1] * 1000
+        dropped = logging_config.logging_stats()["dropped"] if mode == "queued" else 0
+        rate = len(latencies) / elapsed
+        print(f"{mode:<7} {rate:>7.0f} req/s   p50 {p50:>7.2f} ms   "
+              f"p99 {p99:>7.2f} ms   lines {sink.lines:>6}   dropped {dropped}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="FocusFlow logging pipeline benchmark")
+    parser.add_argument(
+        "--requests", type=int, default=3000, help="Requests per mode (default: 3000)"
+    )
+    parser.add_argument(
+        "--concurrency", type=int, default=32, help="Concurrent clients (default: 32)"
+    )
+    parser.add_argument("--sink-latency-ms", type=float, default=1.0,
+                        help="Blocking time per log write (default: 1)")
+    parser.add_argument(
+        "--path", default="/api/v1/health", help="Path to request (default: /api/v1/health)"
+    )
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,120 @@
+"""Compare a file-backed SQLite database with the in-memory mode.
+
+Runs the same API workload (task CRUD, session planning and advancing, polling
+reads) in a fresh process per mode, timing database setup and the workload.
+The in-memory run then seeds rows and times a snapshot save and restore.
+
+Usage (from the backend directory):
+    python benchmarks/bench_memory_db.py [--rounds 200] [--seed-sessions 100000]
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+
+async def workload(rounds: int) -> None:
+    """One round: create, read, update and delete a task, advance the cycle and poll."""
+    import httpx
+    from src.main import app
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        await client.post("/api/v1/pomodoro/plan", json={"count": 4})
+        for i in range(rounds):
+            task = (await client.post("/api/v1/tasks", json={"title": f"Bench task {i}"})).json()
+            await client.get(f"/api/v1/tasks/{task['id']}")
+            await client.put(f"/api/v1/tasks/{task['id']}", json={"completed": True})
+            await client.post("/api/v1/pomodoro/advance")
+            await client.get("/api/v1/pomodoro/active")
+            await client.get("/api/v1/pomodoro/stats/today")
+            await client.get("/api/v1/bootstrap")
+            await client.delete(f"/api/v1/tasks/{task['id']}")
+
+
+async def run_mode(args: argparse.Namespace) -> dict:
+    """Body of the child process for one mode; returns timings."""
+    from src.database import engine, init_db, is_memory_db
+    from src.services import seed_service, snapshot_service
+
+    timings = {}
+    started = time.perf_counter()
+    await init_db()
+    timings["init_ms"] = (time.perf_counter() - started) * 1000
+
+    started = time.perf_counter()
+    await workload(args.rounds)
+    timings["workload_ms"] = (time.perf_counter() - started) * 1000
+
+    if is_memory_db and args.seed_sessions:
+        await seed_service.seed(
+            tasks=args.seed_sessions // 10, sessions=args.seed_sessions, random_seed=1
+        )
+        path = os.path.join(tempfile.mkdtemp(), "snapshot.db")
+        saved = await snapshot_service.save_snapshot(path)
+        timings["snapshot_bytes"] = saved.bytes
+        timings["save_ms"] = saved.seconds * 1000
+
+        # Restore into a fresh in-memory database, as a new process would at startup
+        await engine.dispose()
+        snapshot_service._restored = False
+        restored = await snapshot_service.restore_snapshot(path)
+        timings["restore_ms"] = restored.seconds * 1000
+
+    await engine.dispose()
+    return timings
+
+
+def spawn(name: str, url: str, args: argparse.Namespace) -> dict:
+    env = dict(
+        os.environ,
+        DATABASE_URL=url,
+        RATE_LIMIT_PER_SECOND="0",
+        JOB_RUNNER_ENABLED="false",
+        ENVIRONMENT="test",
+        LOG_LEVEL="WARNING",
+    )
+    env.pop("DATABASE_SNAPSHOT_PATH", None)
+    command = [sys.executable, __file__, "--child", "--rounds", str(args.rounds),
+               "--seed-sessions", str(args.seed_sessions)]
+    output = subprocess.run(
+        command, cwd=BACKEND_DIR, env=env, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="FocusFlow in-memory SQLite benchmark")
+    parser.add_argument("--rounds", type=int, default=200,
+                        help="Workload rounds, 8 requests each (default: 200)")
+    parser.add_argument("--seed-sessions", type=int, default=100000,
+                        help="Sessions seeded before timing snapshots, 0 to skip (default: 100000)")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(asyncio.run(run_mode(args))))
+        sys.exit(0)
+
+    modes = {
+        "file": f"sqlite+aiosqlite:///{tempfile.mkdtemp()}/bench.db",
+        "memory": "sqlite+aiosqlite:///:memory:",
+    }
+    print(f"{args.rounds * 8} requests per mode")
+    for name, url in modes.items():
+        timings = spawn(name, url, args)
+        line = f"{name:<7} init {timings['init_ms']:>7.1f} ms"
+        line += f"   workload {timings['workload_ms']:>8.1f} ms"
+        line += f"   {args.rounds * 8 / timings['workload_ms'] * 1000:>6.0f} req/s"
+        print(line)
+        if "save_ms" in timings:
+            print(f"        snapshot {timings['snapshot_bytes'] / 1e6:.1f} MB: "
+                  f"save {timings['save_ms']:.1f} ms, restore {timings['restore_ms']:.1f} ms")
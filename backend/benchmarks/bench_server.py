@@ -0,0 +1,106 @@
+"""Compare the single-process uvicorn setup with the production launcher.
+
+Starts each server profile on a local port against the configured
+DATABASE_URL, drives it with concurrent HTTP requests and reports
+throughput and latency percentiles.
+
+Usage (from the backend directory):
+    python benchmarks/bench_server.py [--duration 10] [--concurrency 64] [--path /api/v1/tasks]
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import httpx
+
+BACKEND_DIR = Path(__file__).parent.parent
+
+PROFILES = {
+    "single": [
+        sys.executable, "-m", "uvicorn", "src.main:app", "--host", "127.0.0.1", "--port", "{port}"
+    ],
+    "production": [sys.executable, "-m", "src.server"],
+}
+
+
+async def wait_ready(client: httpx.AsyncClient, timeout: float = 30) -> None:
+    """Poll the health endpoint until the server answers."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if (await client.get("/api/v1/health")).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        await asyncio.sleep(0.2)
+    raise RuntimeError("server did not start")
+
+
+async def drive(base_url: str, path: str, duration: float, concurrency: int) -> list:
+    """Send requests from ``concurrency`` workers for ``duration`` seconds; return latencies."""
+    latencies = []
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30) as client:
+        await wait_ready(client)
+        deadline = time.monotonic() + duration
+
+        async def worker():
+            while time.monotonic() < deadline:
+                start = time.perf_counter()
+                response = await client.get(path)
+                response.raise_for_status()
+                latencies.append(time.perf_counter() - start)
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies
+
+
+def run_profile(name: str, port: int, args: argparse.Namespace) -> None:
+    """Start one server profile, benchmark it and print a summary line."""
+    command = [part.format(port=port) for part in PROFILES[name]]
+    # One client sending far more than the per-client rate limit: measure the server, not 429s
+    env = dict(os.environ, PORT=str(port), HOST="127.0.0.1", RATE_LIMIT_PER_SECOND="0")
+    server = subprocess.Popen(command, cwd=BACKEND_DIR, env=env,
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        latencies = asyncio.run(
+            drive(f"http://127.0.0.1:{port}", args.path, args.duration, args.concurrency)
+        )
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+    latencies.sort()
+    p50 = statistics.median(latencies) * 1000
+    p99 = latencies[int(len(latencies) * 0.99) - 1] * 1000
+    rate = len(latencies) / args.duration
+    print(f"{name:<11} {rate:>9.0f} req/s   p50 {p50:>7.2f} ms   p99 {p99:>7.2f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="FocusFlow server profile benchmark")
+    parser.add_argument(
+        "--duration", type=float, default=10, help="Seconds per profile (default: 10)"
+    )
+    parser.add_argument(
+        "--concurrency", type=int, default=64, help="Concurrent clients (default: 64)"
+    )
+    parser.add_argument(
+        "--path", default="/api/v1/tasks", help="Endpoint to request (default: /api/v1/tasks)"
+    )
+    parser.add_argument(
+        "--port", type=int, default=8765, help="Local port to use (default: 8765)"
+    )
+    args = parser.parse_args()
+
+    print(
+        f"GET {args.path}, {args.concurrency} concurrent clients, "
+        f"{args.duration:.0f}s per profile"
+    )
+    for name in PROFILES:
+        run_profile(name, args.port, args)
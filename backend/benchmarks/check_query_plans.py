@@ -0,0 +1,218 @@
+"""Query plan regression check for the hot service-layer queries.
+
+Seeds a throwaway database, runs each hot service call while capturing the SQL
+it emits, then asks the database for the plan of every captured statement.
+Exits non-zero if a query reads a whole table without an index or sorts in a
+temporary structure instead of walking an index.
+
+Runs against a temporary SQLite database unless DATABASE_URL is set. Point it
+only at a scratch database: it seeds rows and exercises write paths.
+
+Usage (from the backend directory):
+    python benchmarks/check_query_plans.py [--tasks 5000] [--sessions 50000] [--verbose]
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Awaitable, Callable, List, Tuple
+
+BACKEND_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+if "DATABASE_URL" not in os.environ:
+    os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{tempfile.mkdtemp()}/query_plans.db"
+
+# Catalog lookups are cheap and not ours to index
+IGNORED_TABLES = ("sqlite_master", "sqlite_schema", "pg_class", "pg_inherits")
+
+
+@dataclass
+class HotQuery:
+    """A service call whose statements must all use indexes."""
+    name: str
+    call: Callable[[Any], Awaitable[Any]]
+    # Calls that return every row by design may scan, as long as they do not sort
+    full_read: bool = False
+
+
+@dataclass
+class Finding:
+    query: str
+    statement: str
+    plan: List[str]
+    problems: List[str] = field(default_factory=list)
+
+
+def hot_queries() -> List[HotQuery]:
+    """The service calls behind the frequently hit endpoints."""
+    from src.schemas.pomodoro import (
+        PomodoroAdvanceRequest,
+        PomodoroSessionCreate,
+        PomodoroSessionUpdate,
+    )
+    from src.schemas.task import TaskCreate
+    from src.services import pomodoro_service, settings_service, task_service
+
+    async def create_and_delete_task(db):
+        task = await task_service.create_task(db, TaskCreate(title="Plan check"))
+        await task_service.delete_task(db, task.id)
+
+    async def start_session(db):
+        session = await pomodoro_service.create_session(
+            db, PomodoroSessionCreate(session_type="focus", duration=25)
+        )
+        await pomodoro_service.update_session(db, session.id, PomodoroSessionUpdate(state="active"))
+
+    return [
+        HotQuery("task_service.list_tasks", lambda db: task_service.list_tasks(db), full_read=True),
+        HotQuery(
+            "task_service.list_tasks(open)",
+            lambda db: task_service.list_tasks(db, include_completed=False),
+            full_read=True,
+        ),
+        HotQuery("task_service.get_task", lambda db: task_service.get_task(db, 1)),
+        HotQuery("task_service.create_task+delete_task", create_and_delete_task),
+        HotQuery("pomodoro_service.create_session+update_session", start_session),
+        HotQuery(
+            "pomodoro_service.plan_sessions", lambda db: pomodoro_service.plan_sessions(db, 2)
+        ),
+        HotQuery(
+            "pomodoro_service.advance",
+            lambda db: pomodoro_service.advance(db, PomodoroAdvanceRequest()),
+        ),
+        HotQuery("pomodoro_service.get_active_session", pomodoro_service.get_active_session),
+        HotQuery("pomodoro_service.get_session", lambda db: pomodoro_service.get_session(db, 1)),
+        HotQuery("pomodoro_service.get_stats_today", pomodoro_service.get_stats_today),
+        HotQuery(
+            "pomodoro_service.get_stats_history",
+            lambda db: pomodoro_service.get_stats_history(db, 30),
+        ),
+        HotQuery("settings_service.get_settings", settings_service.get_settings),
+    ]
+
+
+def _sqlite_problems(plan: List[Tuple], full_read: bool) -> Tuple[List[str], List[str]]:
+    lines = [row[-1] for row in plan]
+    problems = []
+    for detail in lines:
+        words = detail.split()
+        if len(words) < 2 or words[1] in IGNORED_TABLES:
+            continue
+        scan = words[0] == "SCAN" and "INDEX" not in detail and "CONSTANT" not in detail
+        if scan and not full_read:
+            problems.append(f"full table scan: {detail}")
+        if detail.startswith("USE TEMP B-TREE FOR") and "ORDER BY" in detail:
+            problems.append(f"temp sort: {detail}")
+    return lines, problems
+
+
+def _postgres_problems(plan: Any, full_read: bool) -> Tuple[List[str], List[str]]:
+    lines: List[str] = []
+    problems: List[str] = []
+
+    def walk(node: dict, parent: str, depth: int) -> None:
+        kind = node["Node Type"]
+        relation = node.get("Relation Name")
+        lines.append("  " * depth + kind + (f" on {relation}" if relation else ""))
+        if kind == "Seq Scan" and relation not in IGNORED_TABLES and not full_read:
+            problems.append(f"full table scan: Seq Scan on {relation}")
+        # A Sort feeding an aggregate is grouping a filtered range, not ordering output
+        if kind == "Sort" and "Aggregate" not in parent and not full_read:
+            problems.append(f"temp sort: Sort on {node.get('Sort Key')}")
+        for child in node.get("Plans", []):
+            walk(child, kind, depth + 1)
+
+    document = plan[0][0] if isinstance(plan[0][0], list) else json.loads(plan[0][0])
+    walk(document[0]["Plan"], "", 0)
+    return lines, problems
+
+
+async def capture(hot: HotQuery) -> List[Tuple[str, Any]]:
+    """Run a hot call and return the SELECT/UPDATE/DELETE statements it executed."""
+    from sqlalchemy import event
+    from src.database import AsyncSessionLocal, engine
+
+    statements: List[Tuple[str, Any]] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        verb = statement.lstrip().split(None, 1)[0].upper()
+        if verb in ("SELECT", "UPDATE", "DELETE", "WITH") and not executemany:
+            statements.append((statement, parameters))
+
+    event.listen(engine.sync_engine, "before_cursor_execute", record)
+    try:
+        async with AsyncSessionLocal() as db:
+            await hot.call(db)
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", record)
+    return statements
+
+
+async def explain(hot: HotQuery, statement: str, parameters: Any) -> Finding:
+    from src.database import engine, is_sqlite
+
+    prefix = "EXPLAIN QUERY PLAN " if is_sqlite else "EXPLAIN (FORMAT JSON) "
+    async with engine.connect() as conn:
+        result = await conn.exec_driver_sql(prefix + statement, parameters)
+        plan = result.all()
+
+    if is_sqlite:
+        lines, problems = _sqlite_problems(plan, hot.full_read)
+    else:
+        lines, problems = _postgres_problems(plan, hot.full_read)
+    return Finding(hot.name, " ".join(statement.split()), lines, problems)
+
+
+async def check_plans() -> List[Finding]:
+    """Explain every statement the hot calls run against the current database."""
+    findings: List[Finding] = []
+    for hot in hot_queries():
+        for statement, parameters in await capture(hot):
+            findings.append(await explain(hot, statement, parameters))
+    return findings
+
+
+async def main(args: argparse.Namespace) -> int:
+    from sqlalchemy import text
+    from src.database import engine, init_db, is_sqlite
+    from src.services import seed_service
+
+    await init_db()
+    report = await seed_service.seed(tasks=args.tasks, sessions=args.sessions, random_seed=1)
+    async with engine.begin() as conn:
+        await conn.execute(text("ANALYZE"))
+    backend = "SQLite" if is_sqlite else "PostgreSQL"
+    print(f"Seeded {report.tasks} tasks and {report.sessions} sessions ({backend})")
+
+    findings = await check_plans()
+    failed = [finding for finding in findings if finding.problems]
+    for finding in findings:
+        if not (finding.problems or args.verbose):
+            continue
+        print(f"\n[{'FAIL' if finding.problems else 'ok'}] {finding.query}")
+        print(f"  {finding.statement[:200]}")
+        for line in finding.plan:
+            print(f"    {line}")
+        for problem in finding.problems:
+            print(f"  !! {problem}")
+
+    print(f"\n{len(findings)} statements checked, {len(failed)} with plan problems")
+    await engine.dispose()
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="FocusFlow query plan regression check")
+    parser.add_argument("--tasks", type=int, default=5000, help="Tasks to seed (default: 5000)")
+    parser.add_argument(
+        "--sessions", type=int, default=50000, help="Sessions to seed (default: 50000)"
+    )
+    parser.add_argument(
+        "--verbose", action="store_true", help="Print every plan, not just failures"
+    )
+    sys.exit(asyncio.run(main(parser.parse_args())))
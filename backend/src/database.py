@@ -1,10 +1,15 @@
 """Database configuration and session management."""
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.orm import declarative_base
-from sqlalchemy.pool import NullPool
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool
 from sqlalchemy import text
-from typing import AsyncGenerator
+from sqlalchemy.engine import make_url
+from fastapi import Request
+from typing import AsyncGenerator, Set
+import hashlib
+import hmac
 import os
+import time
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -12,27 +17,53 @@ load_dotenv()
 # Get database URL from environment
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite+aiosqlite:///./focusflow.db")
 
-# Handle Render's DATABASE_URL format
-# Render uses postgres:// but we need postgresql+psycopg:// for async psycopg3
-if DATABASE_URL.startswith("postgres://") or DATABASE_URL.startswith("postgresql://"):
-    # Strip any query params first
-    if "?" in DATABASE_URL:
-        base_url = DATABASE_URL.split("?")[0]
-        DATABASE_URL = base_url
+# Optional read-only replica for GET routes; falls back to the primary when unset
+DATABASE_READ_URL = os.getenv("DATABASE_READ_URL")
 
-    # Remove any existing driver specification
-    DATABASE_URL = DATABASE_URL.replace("postgres://", "postgresql://", 1)
-    DATABASE_URL = DATABASE_URL.replace("postgresql+asyncpg://", "postgresql://", 1)
-    DATABASE_URL = DATABASE_URL.replace("postgresql+psycopg://", "postgresql://", 1)
+# Seconds a client keeps reading from the primary after it writes, covering replica lag
+READ_AFTER_WRITE_SECONDS = float(os.getenv("READ_AFTER_WRITE_SECONDS", "5"))
 
-    # Now add the psycopg driver
-    DATABASE_URL = DATABASE_URL.replace("postgresql://", "postgresql+psycopg://", 1)
+
+def _normalize_database_url(url: str) -> str:
+    """Handle Render's DATABASE_URL format.
+
+    Render uses postgres:// but we need postgresql+psycopg:// for async psycopg3.
+    """
+    if url.startswith("postgres://") or url.startswith("postgresql://"):
+        # Strip any query params first
+        if "?" in url:
+            url = url.split("?")[0]
+
+        # Remove any existing driver specification
+        url = url.replace("postgres://", "postgresql://", 1)
+        url = url.replace("postgresql+asyncpg://", "postgresql://", 1)
+        url = url.replace("postgresql+psycopg://", "postgresql://", 1)
+
+        # Now add the psycopg driver
+        url = url.replace("postgresql://", "postgresql+psycopg://", 1)
+    return url
+
+
+DATABASE_URL = _normalize_database_url(DATABASE_URL)
 
 # Determine if using SQLite or PostgreSQL
 is_sqlite = "sqlite" in DATABASE_URL.lower()
 
+# In-memory SQLite (sqlite+aiosqlite:///:memory:) for tests and ephemeral instances
+is_memory_db = is_sqlite and make_url(DATABASE_URL).database in (None, "", ":memory:")
+
 # Configure engine parameters
-if is_sqlite:
+if is_memory_db:
+    # Every connection to :memory: opens a separate empty database, so keep exactly
+    # one connection for the life of the process and lend it to one session at a time.
+    # Background jobs share it with requests, so they must commit in short transactions.
+    engine_kwargs = {
+        "poolclass": AsyncAdaptedQueuePool,
+        "pool_size": 1,
+        "max_overflow": 0,
+        "connect_args": {"check_same_thread": False},
+    }
+elif is_sqlite:
     # SQLite configuration for local development
     engine_kwargs = {
         "poolclass": NullPool,
@@ -59,6 +90,16 @@ engine = create_async_engine(
     **engine_kwargs
 )
 
+# Read replica engine (same dialect and pool settings as the primary)
+if DATABASE_READ_URL:
+    read_engine = create_async_engine(
+        _normalize_database_url(DATABASE_READ_URL),
+        echo=True if os.getenv("ENVIRONMENT") == "development" else False,
+        **engine_kwargs
+    )
+else:
+    read_engine = engine
+
 # Configure session factory
 AsyncSessionLocal = async_sessionmaker(
     engine,
@@ -68,12 +109,55 @@ AsyncSessionLocal = async_sessionmaker(
     autoflush=False,
 )
 
+AsyncReadSessionLocal = async_sessionmaker(
+    read_engine,
+    class_=AsyncSession,
+    expire_on_commit=False,
+    autocommit=False,
+    autoflush=False,
+)
+
 # Base class for models
 Base = declarative_base()
 
 
-async def get_db() -> AsyncGenerator[AsyncSession, None]:
+# Read-your-writes stickiness travels with the client, so it holds on every worker:
+# a write answers with a signed token carrying the end of its window in the
+# READ_AFTER_WRITE_HEADER response header, and the client sends it back on reads
+READ_AFTER_WRITE_HEADER = "X-Read-After-Write"
+# Any secret shared by the workers; the database URL is one they already share
+_READ_AFTER_WRITE_KEY = (os.getenv("READ_AFTER_WRITE_SECRET") or DATABASE_URL).encode()
+_READ_ONLY_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+
+def _sign(expires: str) -> str:
+    return hmac.new(_READ_AFTER_WRITE_KEY, expires.encode(), hashlib.sha256).hexdigest()[:32]
+
+
+def read_after_write_token() -> str:
+    """Token keeping its bearer on the primary for READ_AFTER_WRITE_SECONDS."""
+    expires = f"{time.time() + READ_AFTER_WRITE_SECONDS:.3f}"
+    return f"{expires}:{_sign(expires)}"
+
+
+def _wrote_recently(request: Request) -> bool:
+    """Whether the request carries a valid, unexpired read-after-write token."""
+    expires, _, signature = request.headers.get(READ_AFTER_WRITE_HEADER, "").partition(":")
+    if not hmac.compare_digest(signature, _sign(expires)):
+        return False
+    try:
+        return float(expires) > time.time()
+    except ValueError:
+        return False
+
+
+async def get_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
     """Dependency for getting async database session."""
+    if read_engine is not engine and request.method not in _READ_ONLY_METHODS:
+        # Sent with the response by ReadAfterWriteMiddleware. Writes that fail mark
+        # the client too, which only keeps its reads on the primary a little longer
+        request.state.read_after_write = read_after_write_token()
+
     async with AsyncSessionLocal() as session:
         try:
             yield session
@@ -85,8 +169,46 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
             await session.close()
 
 
+def read_session_factory(request: Request) -> async_sessionmaker:
+    """Session factory for reads on behalf of ``request``.
+
+    The read replica, except for clients that wrote within
+    READ_AFTER_WRITE_SECONDS (they send back the token from their last write),
+    which stay on the primary to see their own writes.
+    """
+    if read_engine is engine or _wrote_recently(request):
+        return AsyncSessionLocal
+    return AsyncReadSessionLocal
+
+
+def database_role(db: AsyncSession) -> str:
+    """``"primary"`` or ``"replica"``: the database ``db`` reads from."""
+    return "primary" if db.bind is engine else "replica"
+
+
+async def get_read_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """Dependency for read-only routes (see ``read_session_factory``)."""
+    async with read_session_factory(request)() as session:
+        try:
+            yield session
+        finally:
+            await session.close()
+
+
+def _create_missing_indexes(sync_conn, skip: Set[str]) -> None:
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            if index.name not in skip:
+                index.create(sync_conn, checkfirst=True)
+
+
 async def init_db():
     """Initialize database. Applies SQLite optimizations if using SQLite."""
+    if is_memory_db:
+        # Load the last snapshot into the empty in-memory database, then upgrade it below
+        from src.services.snapshot_service import restore_snapshot
+        await restore_snapshot()
+
     async with engine.begin() as conn:
         # Enable WAL mode for better concurrency (SQLite only)
         if is_sqlite:
@@ -94,5 +216,38 @@ async def init_db():
             await conn.execute(text("PRAGMA synchronous=NORMAL"))
             await conn.execute(text("PRAGMA cache_size=-64000"))
 
-        # Create all tables
+        # Create all tables (import the models so they are registered on Base even
+        # when init_db runs outside the app, e.g. from the launcher or maintenance CLI)
+        from src.models import task, pomodoro, settings, sync, idempotency, job  # noqa: F401
         await conn.run_sync(Base.metadata.create_all)
+        # The one-active-session index cannot be created while several sessions are
+        # active; leave them alone and create it on a later start
+        from src.services.pomodoro_service import active_session_ids
+        from src.utils import logger
+        skip = set()
+        active = await active_session_ids(conn)
+        if len(active) > 1:
+            skip.add(pomodoro.ONE_ACTIVE_INDEX)
+            logger.warning(
+                "Pomodoro sessions %s are all active; %s is created on a later start, "
+                "after starting a session has cancelled the others",
+                active, pomodoro.ONE_ACTIVE_INDEX,
+            )
+        # create_all skips existing tables, so add indexes declared after a table was created
+        await conn.run_sync(_create_missing_indexes, skip)
+
+        # Task focus counters added after the tasks table may already exist
+        from src.services.focus_counter_service import ensure_counter_columns
+        await ensure_counter_columns(conn)
+
+        # Full-text search index over tasks
+        from src.services.search_service import setup_search_index
+        await setup_search_index(conn)
+
+        # Change log entries for rows created before delta sync existed
+        from src.services.sync_service import backfill_change_log
+        await backfill_change_log(conn)
+
+        # Seed the settings singleton so GET /settings never writes (it may hit a replica)
+        from src.services.settings_service import ensure_default_settings
+        await ensure_default_settings(conn)
@@ -39,20 +39,64 @@ if is_production and not allowed_origins:
         "Example: ALLOWED_ORIGINS=https://yourdomain.com,https://www.yourdomain.com"
     )
 
+# Read-after-write tokens for clients that just wrote (only with DATABASE_READ_URL)
+from src.middleware.read_after_write import ReadAfterWriteMiddleware
+app.add_middleware(ReadAfterWriteMiddleware)
+
+# Compress large responses and answer If-None-Match from content ETags
+from src.middleware.compression import CompressionMiddleware
+app.add_middleware(CompressionMiddleware)
+
+# On-demand profiling (X-Profile header with an admin token, or PROFILE_SAMPLE_RATE)
+from src.middleware.profiling import ProfilingMiddleware
+app.add_middleware(ProfilingMiddleware)
+
+# Per-client token-bucket rate limiting (outside the app's work, so rejected requests cost nothing)
+from src.middleware.rate_limit import RateLimitMiddleware
+app.add_middleware(RateLimitMiddleware)
+
+# Request ids for log correlation (outside the rate limiter, so even rejected requests get one)
+from src.middleware.request_id import RequestIdMiddleware
+app.add_middleware(RequestIdMiddleware)
+
+# CORS (outermost, so every response, including the rate limiter's 429s, can be read by the browser)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=origins,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "Retry-After", "X-Request-ID", "X-Profile-Id", "X-Read-After-Write"],
 )
 
 
 @app.on_event("startup")
 async def startup_event():
-    """Initialize database on startup."""
-    from src.database import init_db
-    await init_db()
+    """Initialize database on startup and start background tasks.
+
+    The production launcher initializes the database before forking workers,
+    so it is skipped here when that already happened.
+    """
+    from src.server import DB_INITIALIZED_ENV
+    if not os.getenv(DB_INITIALIZED_ENV):
+        from src.database import init_db
+        await init_db()
+
+    from src.services import job_service, snapshot_service
+    if job_service.RUNNER_ENABLED:
+        job_service.runner.start()
+    snapshot_service.writer.start()
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop the job runner and snapshot an in-memory database.
+
+    Unfinished jobs are returned to the queue.
+    """
+    from src.services import job_service, snapshot_service
+    await job_service.runner.stop()
+    await snapshot_service.writer.stop()
 
 
 @app.get("/api/v1/health")
@@ -66,12 +110,16 @@ async def health_check():
 
 
 # Include routers
-from src.routers import settings, tasks, pomodoro
+from src.routers import settings, tasks, pomodoro, sync, admin, analytics, bootstrap
 app.include_router(settings.router, prefix="/api/v1")
 app.include_router(tasks.router, prefix="/api/v1")
 app.include_router(pomodoro.router, prefix="/api/v1")
+app.include_router(sync.router, prefix="/api/v1")
+app.include_router(analytics.router, prefix="/api/v1")
+app.include_router(bootstrap.router, prefix="/api/v1")
+app.include_router(admin.router, prefix="/api/v1")
 
 
 if __name__ == "__main__":
-    import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    from src.server import run
+    run()
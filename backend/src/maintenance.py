@@ -0,0 +1,124 @@
+"""Maintenance commands for the FocusFlow database.
+
+Usage (from the backend directory):
+    python -m src.maintenance retention [--hot-months 3] [--retention-months 12] [--dry-run]
+    python -m src.maintenance seed [--tasks 100000] [--sessions 1000000] [--days 365] [--seed 42]
+    python -m src.maintenance reconcile-focus [--dry-run]
+"""
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+backend_dir = Path(__file__).parent.parent
+if str(backend_dir) not in sys.path:
+    sys.path.insert(0, str(backend_dir))
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+async def run_retention(args: argparse.Namespace) -> None:
+    """Archive old pomodoro sessions and compact expired archive months."""
+    from src.database import AsyncSessionLocal, init_db
+    from src.services import retention_service
+
+    await init_db()
+    async with AsyncSessionLocal() as db:
+        report = await retention_service.run_retention(
+            db,
+            hot_months=args.hot_months,
+            retention_months=args.retention_months,
+            dry_run=args.dry_run,
+        )
+    print(report.model_dump_json(indent=2))
+
+
+async def run_seed(args: argparse.Namespace) -> None:
+    """Bulk-generate synthetic tasks and pomodoro sessions."""
+    from src.database import init_db
+    from src.services import seed_service
+
+    await init_db()
+    report = await seed_service.seed(
+        tasks=args.tasks,
+        sessions=args.sessions,
+        days=args.days,
+        batch_size=args.batch_size,
+        random_seed=args.seed,
+    )
+    print(report.model_dump_json(indent=2))
+
+
+async def run_reconcile_focus(args: argparse.Namespace) -> None:
+    """Verify task focus counters against sessions and correct drift."""
+    from src.database import AsyncSessionLocal, init_db
+    from src.services import focus_counter_service
+
+    await init_db()
+    async with AsyncSessionLocal() as db:
+        report = await focus_counter_service.reconcile(db, fix=not args.dry_run)
+    print(report.model_dump_json(indent=2))
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the command-line parser."""
+    from src.services.retention_service import HOT_MONTHS, RETENTION_MONTHS
+    from src.services.seed_service import DEFAULT_BATCH_SIZE
+
+    parser = argparse.ArgumentParser(
+        prog="python -m src.maintenance", description=__doc__.splitlines()[0]
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    retention = commands.add_parser(
+        "retention", help="Archive and compact pomodoro session history"
+    )
+    retention.add_argument(
+        "--hot-months", type=int, default=HOT_MONTHS,
+        help=f"Months of finished sessions kept in the live table (default: {HOT_MONTHS})",
+    )
+    retention.add_argument(
+        "--retention-months", type=int, default=RETENTION_MONTHS,
+        help=f"Months of raw archived sessions kept before rollup (default: {RETENTION_MONTHS})",
+    )
+    retention.add_argument(
+        "--dry-run", action="store_true", help="Report what would change without writing"
+    )
+    retention.set_defaults(handler=run_retention)
+
+    seed = commands.add_parser(
+        "seed", help="Generate synthetic tasks and sessions for scale testing"
+    )
+    seed.add_argument("--tasks", type=int, default=1000, help="Tasks to create (default: 1000)")
+    seed.add_argument(
+        "--sessions", type=int, default=10000,
+        help="Pomodoro sessions to create (default: 10000)",
+    )
+    seed.add_argument(
+        "--days", type=int, default=365,
+        help="Days of history to spread sessions over (default: 365)",
+    )
+    seed.add_argument(
+        "--batch-size", type=int, default=DEFAULT_BATCH_SIZE,
+        help=f"Rows per insert batch and transaction (default: {DEFAULT_BATCH_SIZE})",
+    )
+    seed.add_argument("--seed", type=int, default=None, help="Random seed for reproducible data")
+    seed.set_defaults(handler=run_seed)
+
+    reconcile = commands.add_parser(
+        "reconcile-focus", help="Verify and repair per-task focus counters"
+    )
+    reconcile.add_argument(
+        "--dry-run", action="store_true", help="Report mismatches without correcting them"
+    )
+    reconcile.set_defaults(handler=run_reconcile_focus)
+
+    return parser
+
+
+if __name__ == "__main__":
+    args = build_parser().parse_args()
+    asyncio.run(args.handler(args))
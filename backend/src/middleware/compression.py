@@ -0,0 +1,253 @@
+"""Response compression middleware.
+
+Compresses buffered responses with Brotli (if the ``brotli`` package is
+installed and the client accepts it) or gzip. A response is compressed only
+when it is at least ``COMPRESSION_MIN_SIZE`` bytes and its content type is in
+the allowlist. Every compressible response gets a weak content-hash ETag
+(``W/"..."``): the identity, gzip and br bodies differ byte for byte, so
+their shared tag must not claim byte equality. An ETag set by the route is
+weakened for the same reason. Repeated
+identical payloads, such as settings or an unchanged task list, reuse the
+compressed bytes from a size-bounded LRU. A matching ``If-None-Match`` gets a
+304 with no body.
+"""
+import gzip
+import hashlib
+import os
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # Optional dependency
+    brotli = None
+
+MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+CACHE_MAX_BYTES = int(os.getenv("COMPRESSION_CACHE_BYTES", str(8 * 1024 * 1024)))
+GZIP_LEVEL = 5
+BROTLI_QUALITY = 4
+
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "text/",
+    "image/svg+xml",
+)
+
+
+class CompressionStats:
+    """Counters for bytes saved by compression and conditional requests."""
+
+    def __init__(self) -> None:
+        self.reset()
+
+    def reset(self) -> None:
+        self.responses = 0
+        self.compressed = 0
+        self.not_modified = 0
+        self.cache_hits = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+
+    def snapshot(self) -> Dict[str, float]:
+        saved = self.bytes_in - self.bytes_out
+        return {
+            "responses": self.responses,
+            "compressed": self.compressed,
+            "not_modified": self.not_modified,
+            "cache_hits": self.cache_hits,
+            "bytes_in": self.bytes_in,
+            "bytes_out": self.bytes_out,
+            "bytes_saved": saved,
+            "ratio": round(self.bytes_out / self.bytes_in, 4) if self.bytes_in else 1.0,
+            "brotli_available": brotli is not None,
+        }
+
+
+stats = CompressionStats()
+
+
+class _CompressedCache:
+    """LRU of compressed bodies keyed by (etag, encoding), bounded by total bytes."""
+
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.entries: "OrderedDict[Tuple[str, str], bytes]" = OrderedDict()
+
+    def get(self, key: Tuple[str, str]) -> Optional[bytes]:
+        body = self.entries.get(key)
+        if body is not None:
+            self.entries.move_to_end(key)
+        return body
+
+    def put(self, key: Tuple[str, str], body: bytes) -> None:
+        if len(body) > self.max_bytes or key in self.entries:
+            return
+        self.entries[key] = body
+        self.size += len(body)
+        while self.size > self.max_bytes:
+            _, evicted = self.entries.popitem(last=False)
+            self.size -= len(evicted)
+
+
+def _opaque_tag(tag: str) -> str:
+    tag = tag.strip()
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """Whether an ``If-None-Match`` header matches ``etag`` (weak comparison)."""
+    tags = {_opaque_tag(tag) for tag in if_none_match.split(",")}
+    return "*" in tags or _opaque_tag(etag) in tags
+
+
+def _choose_encoding(accept_encoding: str) -> Optional[str]:
+    """Pick the best supported encoding the client accepts."""
+    accepted = {
+        part.split(";")[0].strip().lower()
+        for part in accept_encoding.split(",")
+        if not part.strip().endswith(";q=0")
+    }
+    if brotli is not None and "br" in accepted:
+        return "br"
+    if "gzip" in accepted or "*" in accepted:
+        return "gzip"
+    return None
+
+
+def _compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+def _is_compressible(headers: MutableHeaders) -> bool:
+    if "content-encoding" in headers:
+        return False
+    content_type = headers.get("content-type", "").lower()
+    return content_type.startswith(COMPRESSIBLE_TYPES)
+
+
+class CompressionMiddleware:
+    """Compress responses and answer conditional GETs from content ETags."""
+
+    def __init__(
+        self, app: ASGIApp, minimum_size: int = MIN_SIZE, cache_bytes: int = CACHE_MAX_BYTES
+    ) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.cache = _CompressedCache(cache_bytes)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_headers = Headers(scope=scope)
+        encoding = _choose_encoding(request_headers.get("accept-encoding", ""))
+        # Only a GET or HEAD can be answered with 304; other methods have run by then
+        if_none_match = (
+            request_headers.get("if-none-match") if scope["method"] in ("GET", "HEAD") else None
+        )
+        conditional = if_none_match is not None
+
+        if encoding is None and not conditional:
+            await self.app(scope, receive, send)
+            return
+
+        start_message: Optional[Message] = None
+        chunks: List[bytes] = []
+        passthrough = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal start_message, passthrough
+
+            if message["type"] == "http.response.start":
+                start_message = message
+                return
+
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            if message.get("more_body", False) and not chunks:
+                # Streaming response: forward it untouched
+                passthrough = True
+                await send(start_message)
+                await send(message)
+                return
+
+            chunks.append(message.get("body", b""))
+            if message.get("more_body", False):
+                return
+
+            await self._finish(start_message, b"".join(chunks), encoding, if_none_match, send)
+
+        await self.app(scope, receive, send_wrapper)
+
+    async def _finish(
+        self,
+        start_message: Message,
+        body: bytes,
+        encoding: Optional[str],
+        if_none_match: Optional[str],
+        send: Send,
+    ) -> None:
+        headers = MutableHeaders(raw=list(start_message["headers"]))
+        status = start_message["status"]
+        stats.responses += 1
+
+        if status != 200 or not _is_compressible(headers):
+            await send(start_message)
+            await send({"type": "http.response.body", "body": body})
+            return
+
+        etag = headers.get("etag")
+        if etag is None:
+            etag = f'W/"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+            headers["ETag"] = etag
+        elif not etag.startswith("W/"):
+            etag = f"W/{etag}"
+            headers["ETag"] = etag
+        headers.append("Vary", "Accept-Encoding")
+
+        if if_none_match is not None and etag_matches(if_none_match, etag):
+            stats.not_modified += 1
+            stats.bytes_in += len(body)
+            for name in ("content-length", "content-type"):
+                if name in headers:
+                    del headers[name]
+            await send({"type": "http.response.start", "status": 304, "headers": headers.raw})
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        if encoding is not None and len(body) >= self.minimum_size:
+            key = (etag, encoding)
+            compressed = self.cache.get(key)
+            if compressed is None:
+                compressed = _compress(body, encoding)
+                self.cache.put(key, compressed)
+            else:
+                stats.cache_hits += 1
+
+            if len(compressed) < len(body):
+                stats.compressed += 1
+                stats.bytes_in += len(body)
+                stats.bytes_out += len(compressed)
+                headers["Content-Encoding"] = encoding
+                headers["Content-Length"] = str(len(compressed))
+                await send(
+                    {"type": "http.response.start", "status": status, "headers": headers.raw}
+                )
+                await send({"type": "http.response.body", "body": compressed})
+                return
+
+        stats.bytes_in += len(body)
+        stats.bytes_out += len(body)
+        await send({"type": "http.response.start", "status": status, "headers": headers.raw})
+        await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,287 @@
+"""On-demand request profiling.
+
+A request is profiled when it carries ``X-Profile: 1`` together with a valid
+admin token (``X-Admin-Token``), or when it is picked by
+``PROFILE_SAMPLE_RATE``. While a profiled request runs, a background thread
+samples its stack every ``PROFILE_INTERVAL_MS``: the live stack while the
+request is running on the event loop, and the chain of awaiting coroutines,
+ending in ``[await]``, while it waits on the database or other I/O. The result
+is a wall-clock profile in collapsed-stack format (one ``frame;frame;... count``
+line per stack), ready for flamegraph.pl or speedscope.
+
+Profiled responses get an ``X-Profile-Id`` header. Profiles are written as
+JSON files to ``PROFILE_DIR``, shared by all worker processes on the host, so
+``GET /api/v1/admin/profiles/{id}`` finds a profile whichever worker took the
+request; the newest ``PROFILE_MAX_STORED`` are kept. Requests that are not
+profiled only pay for a header lookup.
+"""
+import asyncio
+import json
+import os
+import random
+import re
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from collections import Counter
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.utils import logger
+from src.utils.logging_config import request_id_var
+
+SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+INTERVAL_SECONDS = float(os.getenv("PROFILE_INTERVAL_MS", "5")) / 1000
+MAX_STORED = int(os.getenv("PROFILE_MAX_STORED", "50"))
+PROFILE_DIR = Path(
+    os.getenv("PROFILE_DIR", os.path.join(tempfile.gettempdir(), "focusflow-profiles"))
+)
+# Never sample the admin API itself (profiles are fetched from it)
+EXEMPT_PREFIX = "/api/v1/admin"
+
+AWAIT_FRAME = "[await]"
+
+# Profile ids double as file names
+_VALID_ID = re.compile(r"^[A-Za-z0-9_][A-Za-z0-9._-]{0,127}$")
+
+
+@dataclass
+class RequestProfile:
+    """Samples collected for one request."""
+    id: str
+    method: str
+    path: str
+    trigger: str
+    started_at: datetime
+    status_code: Optional[int] = None
+    duration_ms: Optional[float] = None
+    samples: int = 0
+    stacks: Counter = field(default_factory=Counter)
+
+    def collapsed(self) -> str:
+        """Collapsed-stack text: ``root;...;leaf count`` per line, heaviest first."""
+        return "".join(
+            f"{';'.join(stack)} {count}\n" for stack, count in self.stacks.most_common()
+        )
+
+    def to_json(self) -> str:
+        data = asdict(self)
+        data["started_at"] = self.started_at.isoformat()
+        data["stacks"] = self.collapsed()
+        return json.dumps(data)
+
+
+_labels: Dict[object, str] = {}
+
+
+def _label(code) -> str:
+    label = _labels.get(code)
+    if label is None:
+        filename = code.co_filename.replace("\\", "/")
+        for marker in ("/site-packages/", "/backend/"):
+            if marker in filename:
+                filename = filename.rsplit(marker, 1)[1]
+                break
+        label = _labels[code] = f"{code.co_qualname} ({filename}:{code.co_firstlineno})"
+    return label
+
+
+def _await_chain(coro) -> List:
+    """Frames of a coroutine and everything it is awaiting, outermost first."""
+    frames = []
+    while coro is not None:
+        frame = getattr(coro, "cr_frame", None) or getattr(coro, "gi_frame", None)
+        if frame is None:
+            break
+        frames.append(frame)
+        coro = getattr(coro, "cr_await", None) or getattr(coro, "gi_yieldfrom", None)
+    return frames
+
+
+def _task_stack(
+    task: asyncio.Task, loop: asyncio.AbstractEventLoop, thread_frame
+) -> Tuple[str, ...]:
+    """The stack ``task`` is at right now, root first."""
+    chain = _await_chain(task.get_coro())
+    if not chain:
+        return ()
+
+    if thread_frame is None or asyncio.current_task(loop) is not task:
+        return tuple(_label(frame.f_code) for frame in chain) + (AWAIT_FRAME,)
+
+    live = []
+    frame = thread_frame
+    while frame is not None:
+        live.append(frame)
+        frame = frame.f_back
+    live.reverse()
+    try:
+        # Drop the event loop frames above the task
+        live = live[live.index(chain[0]):]
+    except ValueError:
+        # Running in a greenlet (SQLAlchemy's sync-over-async bridge): its stack starts fresh
+        live = chain + live
+    return tuple(_label(frame.f_code) for frame in live)
+
+
+class _Sampler:
+    """Background thread sampling the stacks of the requests being profiled."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._active: Dict[asyncio.Task, Tuple[RequestProfile, asyncio.AbstractEventLoop, int]] = {}
+        self._thread: Optional[threading.Thread] = None
+
+    def add(self, task: asyncio.Task, profile: RequestProfile) -> None:
+        with self._lock:
+            self._active[task] = (profile, task.get_loop(), threading.get_ident())
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="request-profiler", daemon=True
+                )
+                self._thread.start()
+
+    def remove(self, task: asyncio.Task) -> None:
+        with self._lock:
+            self._active.pop(task, None)
+
+    def _run(self) -> None:
+        while True:
+            time.sleep(INTERVAL_SECONDS)
+            with self._lock:
+                active = list(self._active.items())
+                if not active:
+                    self._thread = None
+                    return
+            frames = sys._current_frames()
+            for task, (profile, loop, thread_id) in active:
+                try:
+                    stack = _task_stack(task, loop, frames.get(thread_id))
+                except Exception:
+                    # The task moved on while we walked it; skip this sample
+                    continue
+                if stack:
+                    profile.stacks[stack] += 1
+                    profile.samples += 1
+            del frames
+
+
+_sampler = _Sampler()
+
+
+def _path(profile_id: str) -> Optional[Path]:
+    return PROFILE_DIR / f"{profile_id}.json" if _VALID_ID.match(profile_id) else None
+
+
+def _store(profile: RequestProfile) -> None:
+    """Write a finished profile and drop the oldest beyond ``MAX_STORED``."""
+    PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+    path = _path(profile.id)
+    temporary = path.with_suffix(f".{os.getpid()}.tmp")
+    temporary.write_text(profile.to_json())
+    os.replace(temporary, path)
+
+    stored = sorted(PROFILE_DIR.glob("*.json"), key=_mtime)
+    for old in stored[:max(len(stored) - MAX_STORED, 0)]:
+        old.unlink(missing_ok=True)
+
+
+def _mtime(path: Path) -> float:
+    try:
+        return path.stat().st_mtime
+    except FileNotFoundError:  # Pruned by another worker
+        return 0.0
+
+
+def _read(path: Path) -> Optional[Dict[str, Any]]:
+    try:
+        return json.loads(path.read_text())
+    except (FileNotFoundError, ValueError):  # Pruned, or still being replaced
+        return None
+
+
+def list_profiles() -> List[Dict[str, Any]]:
+    """Stored profiles without their stacks, newest first."""
+    if not PROFILE_DIR.is_dir():
+        return []
+    paths = sorted(PROFILE_DIR.glob("*.json"), key=_mtime, reverse=True)
+    return [profile for profile in map(_read, paths) if profile is not None]
+
+
+def load_profile(profile_id: str) -> Optional[Dict[str, Any]]:
+    """A stored profile, with its collapsed ``stacks`` text, or None."""
+    path = _path(profile_id)
+    return _read(path) if path is not None else None
+
+
+def _usable_id(request_id: str) -> bool:
+    """Whether the request id can name the profile (valid and not taken)."""
+    path = _path(request_id)
+    return path is not None and not path.exists()
+
+
+class ProfilingMiddleware:
+    """Profile requests that ask for it (admin only) or that are sampled."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    def _trigger(self, scope: Scope) -> Optional[str]:
+        headers = Headers(scope=scope)
+        if headers.get("x-profile") not in (None, "", "0"):
+            from src.routers.admin import admin_token_error
+
+            if admin_token_error(headers.get("x-admin-token")) is None:
+                return "header"
+        if (
+            SAMPLE_RATE > 0
+            and not scope["path"].startswith(EXEMPT_PREFIX)
+            and random.random() < SAMPLE_RATE
+        ):
+            return "sampled"
+        return None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        trigger = self._trigger(scope)
+        if trigger is None:
+            await self.app(scope, receive, send)
+            return
+
+        request_id = request_id_var.get()
+        profile = RequestProfile(
+            id=request_id if _usable_id(request_id) else uuid.uuid4().hex,
+            method=scope["method"],
+            path=scope["path"],
+            trigger=trigger,
+            started_at=datetime.utcnow(),
+        )
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                profile.status_code = message["status"]
+                MutableHeaders(scope=message)["X-Profile-Id"] = profile.id
+            await send(message)
+
+        task = asyncio.current_task()
+        started = time.perf_counter()
+        _sampler.add(task, profile)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _sampler.remove(task)
+            profile.duration_ms = round((time.perf_counter() - started) * 1000, 2)
+            try:
+                await asyncio.to_thread(_store, profile)
+            except OSError:
+                logger.exception("Could not store request profile %s", profile.id)
@@ -0,0 +1,143 @@
+"""Per-client token-bucket rate limiting.
+
+Every client has a bucket of ``RATE_LIMIT_BURST`` tokens that refills at
+``RATE_LIMIT_PER_SECOND``. Clients are told apart by address, and by their
+``X-Client-Id`` header within an address. The header is client-chosen, so
+the clients sending it from one address also share a bucket
+``RATE_LIMIT_CLIENTS_PER_ADDRESS`` times as large: inventing new ids does
+not buy more requests. A request with no token left gets ``429`` and a ``Retry-After``
+header.
+
+Buckets are in memory per process by default. To share limits across workers,
+set ``RATE_LIMIT_BACKEND`` to ``module:Class`` naming a ``RateLimitBackend``
+subclass, for example one backed by Redis.
+"""
+import importlib
+import json
+import math
+import os
+import time
+from typing import Dict, Optional, Tuple
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from src.utils.clients import client_address, scope_client_key
+
+RATE_PER_SECOND = float(os.getenv("RATE_LIMIT_PER_SECOND", "20"))
+BURST = int(os.getenv("RATE_LIMIT_BURST", "40"))
+CLIENTS_PER_ADDRESS = int(os.getenv("RATE_LIMIT_CLIENTS_PER_ADDRESS", "4"))
+EXEMPT_PATHS = ("/api/v1/health",)
+
+# Requests rejected with 429 by this process
+counters = {"rejected": 0}
+
+
+class RateLimitBackend:
+    """Storage for token buckets."""
+
+    async def take(self, key: str, rate: float, burst: int) -> Tuple[bool, float]:
+        """Take one token from ``key``'s bucket.
+
+        Returns (allowed, seconds until a token is available).
+        """
+        raise NotImplementedError
+
+
+class InMemoryBackend(RateLimitBackend):
+    """Per-process token buckets."""
+
+    MAX_BUCKETS = 100_000
+
+    def __init__(self) -> None:
+        self.buckets: Dict[str, Tuple[float, float]] = {}  # key -> (tokens, last refill)
+
+    async def take(self, key: str, rate: float, burst: int) -> Tuple[bool, float]:
+        now = time.monotonic()
+        tokens, last = self.buckets.get(key, (float(burst), now))
+        tokens = min(float(burst), tokens + (now - last) * rate)
+
+        if tokens >= 1:
+            self.buckets[key] = (tokens - 1, now)
+            allowed, retry_after = True, 0.0
+        else:
+            self.buckets[key] = (tokens, now)
+            allowed, retry_after = False, (1 - tokens) / rate
+
+        if len(self.buckets) > self.MAX_BUCKETS:
+            self._prune(now, rate, burst)
+        return allowed, retry_after
+
+    def _prune(self, now: float, rate: float, burst: int) -> None:
+        """Drop buckets that have refilled completely."""
+        full_after = burst / rate
+        for key, (_, last) in list(self.buckets.items()):
+            if now - last >= full_after:
+                del self.buckets[key]
+
+
+def load_backend() -> RateLimitBackend:
+    """Instantiate the backend named by RATE_LIMIT_BACKEND, or the in-memory one."""
+    path = os.getenv("RATE_LIMIT_BACKEND")
+    if not path:
+        return InMemoryBackend()
+    module_name, _, class_name = path.partition(":")
+    return getattr(importlib.import_module(module_name), class_name)()
+
+
+class RateLimitMiddleware:
+    """Reject clients that exceed their request rate with 429 Too Many Requests."""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        rate: float = RATE_PER_SECOND,
+        burst: int = BURST,
+        backend: Optional[RateLimitBackend] = None,
+        clients_per_address: int = CLIENTS_PER_ADDRESS,
+    ) -> None:
+        self.app = app
+        self.rate = rate
+        self.burst = burst
+        self.backend = backend or load_backend()
+        self.clients_per_address = clients_per_address
+
+    async def _take(self, scope: Scope) -> Tuple[bool, float]:
+        """Take a token from the client's bucket, then from its address's."""
+        address = client_address(scope)
+        key = scope_client_key(scope)
+        allowed, retry_after = await self.backend.take(key, self.rate, self.burst)
+        if not allowed or key == address:
+            return allowed, retry_after
+        return await self.backend.take(
+            f"{address}/*",
+            self.rate * self.clients_per_address,
+            self.burst * self.clients_per_address,
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or self.rate <= 0
+            or scope["method"] == "OPTIONS"
+            or scope["path"].startswith(EXEMPT_PATHS)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        allowed, retry_after = await self._take(scope)
+        if allowed:
+            await self.app(scope, receive, send)
+            return
+
+        counters["rejected"] += 1
+        body = json.dumps({"detail": "Too many requests"}).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 429,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(max(1, math.ceil(retry_after))).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
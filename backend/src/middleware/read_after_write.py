@@ -0,0 +1,33 @@
+"""Read-after-write token middleware.
+
+``get_db`` issues a signed token when a write runs with a read replica
+configured. This middleware puts it in the ``X-Read-After-Write`` response
+header, including on responses that routes build themselves (such as
+idempotent replays), which FastAPI would not merge dependency headers into.
+"""
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.database import READ_AFTER_WRITE_HEADER
+
+
+class ReadAfterWriteMiddleware:
+    """Send the read-after-write token issued for this request, if any."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                # request.state is backed by scope["state"]
+                token = scope.get("state", {}).get("read_after_write")
+                if token:
+                    MutableHeaders(scope=message)[READ_AFTER_WRITE_HEADER] = token
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
@@ -0,0 +1,16 @@
+"""Idempotency record model for replaying retried writes."""
+from sqlalchemy import Column, Integer, String, Text, DateTime
+from src.database import Base
+
+
+class IdempotencyRecord(Base):
+    """Stored response for a write made with an ``Idempotency-Key`` header."""
+    __tablename__ = "idempotency_records"
+
+    key = Column(String(255), primary_key=True)  # '<scope>:<client key>'
+    request_hash = Column(String(64), nullable=False)  # SHA-256 of the request body
+    # Both NULL while the request holding the key is still running
+    status_code = Column(Integer, nullable=True)
+    response_body = Column(Text, nullable=True)  # JSON
+    created_at = Column(DateTime(timezone=True), nullable=False)
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
@@ -0,0 +1,29 @@
+"""Background job model for the in-process job queue."""
+from sqlalchemy import Column, Integer, String, Text, DateTime, Index, func
+from src.database import Base
+
+
+class Job(Base):
+    """A unit of background work, leased by one worker at a time."""
+    __tablename__ = "jobs"
+    __table_args__ = (
+        # Runnable jobs in due order, and expired leases to take over
+        Index("ix_jobs_status_run_after", "status", "run_after"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    kind = Column(String(50), nullable=False)  # Registered handler name
+    payload = Column(Text, nullable=True)  # JSON arguments for the handler
+    # queued, running, succeeded, failed
+    status = Column(String(20), default="queued", nullable=False)
+    attempts = Column(Integer, default=0, nullable=False)
+    max_attempts = Column(Integer, default=3, nullable=False)
+    # Earliest start; pushed back on retry
+    run_after = Column(DateTime(timezone=True), nullable=False)
+    # Another worker may take over after this
+    leased_until = Column(DateTime(timezone=True), nullable=True)
+    lease_owner = Column(String(64), nullable=True)
+    last_error = Column(Text, nullable=True)
+    result = Column(Text, nullable=True)  # JSON returned by the handler
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
@@ -1,11 +1,28 @@
 """Pomodoro session model for tracking focus sessions."""
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, func, BigInteger
+from sqlalchemy import (
+    Column, Integer, String, Date, DateTime, ForeignKey, Index, func, text, BigInteger
+)
 from src.database import Base
 
+# At most one active session, however many requests start one concurrently
+ONE_ACTIVE_INDEX = "ix_pomodoro_sessions_one_active"
+
 
 class PomodoroSession(Base):
     """Pomodoro session model."""
     __tablename__ = "pomodoro_sessions"
+    __table_args__ = (
+        # Active session lookup (latest by state) and retention's archive scan
+        Index("ix_pomodoro_sessions_state_created", "state", "created_at"),
+        # Today's stats and focus history: completed focus sessions by completion time
+        Index("ix_pomodoro_sessions_type_state_completed", "session_type", "state", "completed_at"),
+        # Unlinking sessions when their task is deleted
+        Index("ix_pomodoro_sessions_task_id", "task_id"),
+        Index(
+            ONE_ACTIVE_INDEX, "state", unique=True,
+            sqlite_where=text("state = 'active'"), postgresql_where=text("state = 'active'"),
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     task_id = Column(Integer, ForeignKey("tasks.id", ondelete="SET NULL"), nullable=True)
@@ -17,3 +34,17 @@ class PomodoroSession(Base):
     paused_duration_ms = Column(BigInteger, default=0, nullable=False)  # Total paused time in milliseconds
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), onupdate=func.now(), nullable=True)
+
+
+class PomodoroDailyStat(Base):
+    """Daily rollup of pomodoro sessions compacted out of the archive by retention."""
+    __tablename__ = "pomodoro_daily_stats"
+
+    id = Column(Integer, primary_key=True)
+    day = Column(Date, nullable=False, index=True)  # Day the session completed (or was created)
+    task_id = Column(Integer, nullable=True, index=True)  # Unlinked when the task is deleted
+    session_type = Column(String(20), nullable=False)
+    state = Column(String(20), nullable=False)
+    session_count = Column(Integer, default=0, nullable=False)
+    total_minutes = Column(Integer, default=0, nullable=False)
+    paused_duration_ms = Column(BigInteger, default=0, nullable=False)
@@ -0,0 +1,19 @@
+"""Change log model for delta sync."""
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Index, func
+from src.database import Base
+
+
+class ChangeLogEntry(Base):
+    """Latest change per synced row; ``id`` is the monotonically increasing sync sequence."""
+    __tablename__ = "change_log"
+    __table_args__ = (
+        Index("ix_change_log_entity", "entity", "entity_id"),
+        # Never reuse ids of deleted rows, so the sequence stays monotonic on SQLite
+        {"sqlite_autoincrement": True},
+    )
+
+    id = Column(Integer, primary_key=True)
+    entity = Column(String(20), nullable=False)  # 'task' or 'pomodoro_session'
+    entity_id = Column(Integer, nullable=False)
+    deleted = Column(Boolean, default=False, nullable=False)  # Tombstone for deleted rows
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
@@ -1,16 +1,25 @@
 """Task model for managing user tasks."""
-from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, func
+from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, Index, func
 from src.database import Base
 
 
 class Task(Base):
     """Task model for focus sessions."""
     __tablename__ = "tasks"
+    __table_args__ = (
+        # Task list order, and the highest order when appending a task
+        Index("ix_tasks_order", "order", "created_at"),
+        # Task list without completed tasks
+        Index("ix_tasks_completed_order", "completed", "order", "created_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(255), nullable=False)
     description = Column(Text, nullable=True)
     completed = Column(Boolean, default=False, nullable=False)
     order = Column(Integer, default=0, nullable=False)
+    # Completed focus sessions linked to this task, kept by focus_counter_service
+    focus_sessions_completed = Column(Integer, default=0, server_default="0", nullable=False)
+    focus_minutes = Column(Integer, default=0, server_default="0", nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), onupdate=func.now(), nullable=True)
@@ -0,0 +1,95 @@
+"""Admin router for operational metrics and background jobs."""
+import os
+import secrets
+from typing import List, Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, status
+from fastapi.responses import PlainTextResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.database import get_db
+from src.middleware import compression, profiling, rate_limit
+from src.schemas.job import JobCreate, JobQueueStatus, JobResponse
+from src.schemas.profile import ProfileSummary
+from src.services import job_service
+from src.utils.logging_config import logging_stats
+from src.utils.singleflight import polling
+
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN")
+
+
+def admin_token_error(token: Optional[str]) -> Optional[str]:
+    """Return why ``token`` does not grant admin access, or None if it does.
+
+    Without ADMIN_TOKEN, admin access is open outside production only.
+    """
+    if ADMIN_TOKEN:
+        if not token or not secrets.compare_digest(token, ADMIN_TOKEN):
+            return "Admin token required"
+    elif os.getenv("ENVIRONMENT", "development").lower() == "production":
+        return "ADMIN_TOKEN is not configured"
+    return None
+
+
+async def require_admin(x_admin_token: Optional[str] = Header(None)):
+    """Require the X-Admin-Token header to match ADMIN_TOKEN when one is configured."""
+    error = admin_token_error(x_admin_token)
+    if error:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=error)
+
+
+router = APIRouter(prefix="/admin", tags=["admin"], dependencies=[Depends(require_admin)])
+
+
+@router.get("/metrics/compression")
+async def get_compression_metrics():
+    """Get response compression counters and bytes saved."""
+    return compression.stats.snapshot()
+
+
+@router.get("/metrics/traffic")
+async def get_traffic_metrics():
+    """Get rate limiting, polling coalescing and log pipeline counters for this worker."""
+    logs = logging_stats()
+    return {
+        "rate_limited": rate_limit.counters["rejected"],
+        "polling_queries": polling.calls,
+        "polling_shared": polling.shared,
+        "log_queue_depth": logs["queued"],
+        "logs_dropped": logs["dropped"],
+        "logs_sampled_out": logs["sampled_out"],
+    }
+
+
+@router.get("/jobs", response_model=JobQueueStatus)
+async def get_job_queue(db: AsyncSession = Depends(get_db)):
+    """Get job counts by status and kind, this worker's running jobs and the latest jobs."""
+    return await job_service.get_status(db)
+
+
+@router.post("/jobs", response_model=JobResponse, status_code=status.HTTP_202_ACCEPTED)
+async def enqueue_job(job: JobCreate, db: AsyncSession = Depends(get_db)):
+    """Queue a maintenance job to run in the background."""
+    return await job_service.enqueue(db, job.kind, job.payload, job.delay_seconds)
+
+
+@router.get("/jobs/{job_id}", response_model=JobResponse)
+async def get_job(job_id: int, db: AsyncSession = Depends(get_db)):
+    """Get a job's status and result."""
+    job = await job_service.get_job(db, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+@router.get("/profiles", response_model=List[ProfileSummary])
+async def list_profiles():
+    """List the stored request profiles, newest first."""
+    return profiling.list_profiles()
+
+
+@router.get("/profiles/{profile_id}", response_class=PlainTextResponse)
+async def get_profile(profile_id: str):
+    """Get a request profile as collapsed stacks (for flamegraph.pl or speedscope)."""
+    profile = profiling.load_profile(profile_id)
+    if not profile:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return PlainTextResponse(profile["stacks"])
@@ -0,0 +1,56 @@
+"""Focus analytics router."""
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.database import get_read_db
+from src.schemas.analytics import (
+    AnalyticsSummaryResponse,
+    CompletionRateResponse,
+    HourlyDistributionResponse,
+    StreakResponse,
+    TaskFocusResponse,
+)
+from src.services import analytics_service
+
+router = APIRouter(prefix="/analytics", tags=["analytics"])
+
+
+@router.get("/summary", response_model=AnalyticsSummaryResponse)
+async def get_summary(
+    days: int = Query(30, ge=1, le=366),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Get streaks, per-task focus time, hourly distribution and completion rate."""
+    return await analytics_service.get_summary(db, days)
+
+
+@router.get("/streaks", response_model=StreakResponse)
+async def get_streaks(db: AsyncSession = Depends(get_read_db)):
+    """Get current and longest daily focus streaks."""
+    return await analytics_service.get_streaks(db)
+
+
+@router.get("/tasks", response_model=TaskFocusResponse)
+async def get_task_focus(
+    days: int = Query(30, ge=1, le=366),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Get completed focus sessions and minutes per task."""
+    return await analytics_service.get_task_focus(db, days)
+
+
+@router.get("/hours", response_model=HourlyDistributionResponse)
+async def get_hourly_distribution(
+    days: int = Query(90, ge=1, le=366),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Get completed focus sessions by hour of day (UTC)."""
+    return await analytics_service.get_hourly_distribution(db, days)
+
+
+@router.get("/completion", response_model=CompletionRateResponse)
+async def get_completion_rate(
+    days: int = Query(30, ge=1, le=366),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Get the share of focus sessions completed rather than cancelled."""
+    return await analytics_service.get_completion_rate(db, days)
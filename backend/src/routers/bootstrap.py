@@ -0,0 +1,29 @@
+"""Dashboard bootstrap router."""
+from typing import Optional
+from fastapi import APIRouter, Header, Request, Response, status
+from src.database import read_session_factory
+from src.middleware.compression import etag_matches
+from src.schemas.bootstrap import BootstrapResponse
+from src.services import bootstrap_service
+
+router = APIRouter(prefix="/bootstrap", tags=["bootstrap"])
+
+
+@router.get("", response_model=BootstrapResponse)
+async def get_bootstrap(
+    request: Request,
+    include_completed: bool = True,
+    if_none_match: Optional[str] = Header(None),
+):
+    """Get settings, tasks, the active session and today's stats in one round trip.
+
+    Returns 304 when If-None-Match carries the current combined ETag.
+    """
+    body, etag = await bootstrap_service.get_bootstrap(
+        read_session_factory(request), include_completed
+    )
+    if if_none_match and etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+    # Already serialized JSON; response_model above documents its shape
+    return Response(content=body, media_type="application/json", headers={"ETag": etag})
@@ -1,15 +1,20 @@
 """Pomodoro router."""
-from typing import Optional
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import List, Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from src.database import get_db
+from src.database import database_role, get_db, get_read_db
 from src.schemas.pomodoro import (
     PomodoroSessionCreate,
     PomodoroSessionUpdate,
     PomodoroSessionResponse,
-    PomodoroStatsResponse
+    PomodoroPlanRequest,
+    PomodoroAdvanceRequest,
+    PomodoroAdvanceResponse,
+    PomodoroStatsResponse,
+    PomodoroHistoryResponse
 )
-from src.services import pomodoro_service
+from src.services import pomodoro_service, idempotency_service
+from src.utils.singleflight import polling
 
 router = APIRouter(prefix="/pomodoro", tags=["pomodoro"])
 
@@ -17,14 +22,28 @@ router = APIRouter(prefix="/pomodoro", tags=["pomodoro"])
 @router.post("/sessions", response_model=PomodoroSessionResponse, status_code=status.HTTP_201_CREATED)
 async def create_session(
     session: PomodoroSessionCreate,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key", max_length=200)
 ):
-    """Create a new pomodoro session."""
-    return await pomodoro_service.create_session(db, session)
+    """Create a new pomodoro session.
+
+    Retries with the same Idempotency-Key replay the first response.
+    """
+    if not idempotency_key:
+        return await pomodoro_service.create_session(db, session)
+
+    async def execute():
+        created = await pomodoro_service.create_session(db, session, commit=False)
+        return PomodoroSessionResponse.model_validate(created).model_dump(mode="json")
+
+    return await idempotency_service.run_idempotent(
+        db, "pomodoro_sessions", idempotency_key, session.model_dump(mode="json"), execute,
+        status.HTTP_201_CREATED
+    )
 
 
 @router.get("/sessions/{session_id}", response_model=PomodoroSessionResponse)
-async def get_session(session_id: int, db: AsyncSession = Depends(get_db)):
+async def get_session(session_id: int, db: AsyncSession = Depends(get_read_db)):
     """Get a pomodoro session by ID."""
     session = await pomodoro_service.get_session(db, session_id)
     if not session:
@@ -33,9 +52,13 @@ async def get_session(session_id: int, db: AsyncSession = Depends(get_db)):
 
 
 @router.get("/active", response_model=Optional[PomodoroSessionResponse])
-async def get_active_session(db: AsyncSession = Depends(get_db)):
-    """Get the currently active pomodoro session."""
-    return await pomodoro_service.get_active_session(db)
+async def get_active_session(db: AsyncSession = Depends(get_read_db)):
+    """Get the currently active pomodoro session. Concurrent polls share one query."""
+    async def fetch():
+        session = await pomodoro_service.get_active_session(db)
+        return PomodoroSessionResponse.model_validate(session) if session else None
+
+    return await polling.do(f"pomodoro:active:{database_role(db)}", fetch)
 
 
 @router.put("/sessions/{session_id}", response_model=PomodoroSessionResponse)
@@ -51,7 +74,40 @@ async def update_session(
     return session
 
 
+@router.post(
+    "/plan", response_model=List[PomodoroSessionResponse], status_code=status.HTTP_201_CREATED
+)
+async def plan_sessions(plan: PomodoroPlanRequest, db: AsyncSession = Depends(get_db)):
+    """Create the next sessions of the pomodoro cycle (focus, break, long break) as pending."""
+    return await pomodoro_service.plan_sessions(db, plan.count, plan.task_id)
+
+
+@router.post("/advance", response_model=PomodoroAdvanceResponse)
+async def advance(
+    request: Optional[PomodoroAdvanceRequest] = None,
+    db: AsyncSession = Depends(get_db)
+):
+    """Complete the active session and start the next one atomically.
+
+    The next session is planned if none is pending.
+    """
+    completed, active = await pomodoro_service.advance(db, request or PomodoroAdvanceRequest())
+    return PomodoroAdvanceResponse(completed=completed, active=active)
+
+
 @router.get("/stats/today", response_model=PomodoroStatsResponse)
-async def get_stats_today(db: AsyncSession = Depends(get_db)):
-    """Get pomodoro statistics for today."""
-    return await pomodoro_service.get_stats_today(db)
+async def get_stats_today(db: AsyncSession = Depends(get_read_db)):
+    """Get pomodoro statistics for today. Concurrent polls share one query."""
+    return await polling.do(
+        f"pomodoro:stats:today:{database_role(db)}",
+        lambda: pomodoro_service.get_stats_today(db),
+    )
+
+
+@router.get("/stats/history", response_model=PomodoroHistoryResponse)
+async def get_stats_history(
+    days: int = Query(30, ge=1, le=366),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Get completed focus sessions per day, including archived history."""
+    return await pomodoro_service.get_stats_history(db, days)
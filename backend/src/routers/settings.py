@@ -1,7 +1,7 @@
 """Settings router."""
 from fastapi import APIRouter, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
-from src.database import get_db
+from src.database import get_db, get_read_db
 from src.schemas.settings import SettingsResponse, SettingsUpdate
 from src.services import settings_service
 
@@ -9,7 +9,7 @@ router = APIRouter(prefix="/settings", tags=["settings"])
 
 
 @router.get("", response_model=SettingsResponse)
-async def get_settings(db: AsyncSession = Depends(get_db)):
+async def get_settings(db: AsyncSession = Depends(get_read_db)):
     """Get user settings."""
     return await settings_service.get_settings(db)
 
@@ -0,0 +1,24 @@
+"""Delta sync router."""
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.database import get_db, get_read_db
+from src.schemas.sync import SyncResponse, SyncPushRequest, SyncPushResponse
+from src.services import sync_service
+
+router = APIRouter(prefix="/sync", tags=["sync"])
+
+
+@router.get("", response_model=SyncResponse)
+async def get_changes(
+    since: int = Query(0, ge=0),
+    limit: int = Query(500, ge=1, le=1000),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Get tasks and sessions changed or deleted after the given cursor."""
+    return await sync_service.get_changes(db, since, limit)
+
+
+@router.post("", response_model=SyncPushResponse)
+async def push_changes(batch: SyncPushRequest, db: AsyncSession = Depends(get_db)):
+    """Apply a batch of queued client writes in order."""
+    return await sync_service.push_changes(db, batch)
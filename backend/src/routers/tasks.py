@@ -1,31 +1,56 @@
 """Tasks router."""
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from src.database import get_db
-from src.schemas.task import TaskCreate, TaskUpdate, TaskResponse
-from src.services import task_service
-from typing import List
+from src.database import get_db, get_read_db
+from src.schemas.task import TaskCreate, TaskUpdate, TaskResponse, TaskSearchResponse
+from src.services import task_service, search_service, idempotency_service
+from typing import List, Optional
 
 router = APIRouter(prefix="/tasks", tags=["tasks"])
 
 
 @router.post("", response_model=TaskResponse, status_code=status.HTTP_201_CREATED)
-async def create_task(task: TaskCreate, db: AsyncSession = Depends(get_db)):
-    """Create a new task."""
-    return await task_service.create_task(db, task)
+async def create_task(
+    task: TaskCreate,
+    db: AsyncSession = Depends(get_db),
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key", max_length=200)
+):
+    """Create a new task. Retries with the same Idempotency-Key replay the first response."""
+    if not idempotency_key:
+        return await task_service.create_task(db, task)
+
+    async def execute():
+        created = await task_service.create_task(db, task, commit=False)
+        return TaskResponse.model_validate(created).model_dump(mode="json")
+
+    return await idempotency_service.run_idempotent(
+        db, "tasks", idempotency_key, task.model_dump(mode="json"), execute, status.HTTP_201_CREATED
+    )
 
 
 @router.get("", response_model=List[TaskResponse])
 async def list_tasks(
     include_completed: bool = True,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """List all tasks."""
     return await task_service.list_tasks(db, include_completed)
 
 
+@router.get("/search", response_model=TaskSearchResponse)
+async def search_tasks(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    include_completed: bool = True,
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Full-text search over task titles and descriptions."""
+    return await search_service.search_tasks(db, q, limit, offset, include_completed)
+
+
 @router.get("/{task_id}", response_model=TaskResponse)
-async def get_task(task_id: int, db: AsyncSession = Depends(get_db)):
+async def get_task(task_id: int, db: AsyncSession = Depends(get_read_db)):
     """Get a task by ID."""
     task = await task_service.get_task(db, task_id)
     if not task:
@@ -0,0 +1,56 @@
+"""Focus analytics schemas."""
+from pydantic import BaseModel
+from datetime import date
+from typing import List, Optional
+
+
+class StreakResponse(BaseModel):
+    """Daily focus streaks (days with at least one completed focus session)."""
+    current_streak_days: int
+    longest_streak_days: int
+    last_active_day: Optional[date] = None
+    active_today: bool
+
+
+class TaskFocusTime(BaseModel):
+    """Completed focus sessions and minutes for one task."""
+    task_id: Optional[int] = None  # None for sessions without a task
+    title: Optional[str] = None
+    sessions: int
+    focus_minutes: int
+
+
+class TaskFocusResponse(BaseModel):
+    """Focus time per task, most focused first."""
+    days: int
+    tasks: List[TaskFocusTime]
+
+
+class HourBucket(BaseModel):
+    """Completed focus sessions started in one UTC hour of the day."""
+    hour: int
+    sessions: int
+    focus_minutes: int
+    share: float  # Fraction of all sessions in the window
+
+
+class HourlyDistributionResponse(BaseModel):
+    """Hour-of-day productivity curve."""
+    days: int
+    hours: List[HourBucket]
+
+
+class CompletionRateResponse(BaseModel):
+    """Share of finished focus sessions that were completed rather than cancelled."""
+    days: int
+    completed: int
+    cancelled: int
+    completion_rate: float
+
+
+class AnalyticsSummaryResponse(BaseModel):
+    """All focus analytics in one payload."""
+    streaks: StreakResponse
+    tasks: TaskFocusResponse
+    hours: HourlyDistributionResponse
+    completion: CompletionRateResponse
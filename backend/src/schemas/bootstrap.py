@@ -0,0 +1,14 @@
+"""Dashboard bootstrap schemas."""
+from pydantic import BaseModel
+from typing import List, Optional
+from src.schemas.settings import SettingsResponse
+from src.schemas.task import TaskResponse
+from src.schemas.pomodoro import PomodoroSessionResponse, PomodoroStatsResponse
+
+
+class BootstrapResponse(BaseModel):
+    """Everything the dashboard needs on load."""
+    settings: SettingsResponse
+    tasks: List[TaskResponse]
+    active_session: Optional[PomodoroSessionResponse] = None
+    stats_today: PomodoroStatsResponse
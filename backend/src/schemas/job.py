@@ -0,0 +1,47 @@
+"""Background job schemas."""
+from pydantic import BaseModel, Field
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+
+class JobCreate(BaseModel):
+    """Schema for enqueueing a job."""
+    kind: str = Field(..., min_length=1, max_length=50)
+    payload: Dict[str, Any] = {}
+    delay_seconds: int = Field(0, ge=0, le=86400)
+
+
+class JobResponse(BaseModel):
+    """Schema for a job's state."""
+    id: int
+    kind: str
+    payload: Optional[Dict[str, Any]] = None
+    status: str
+    attempts: int
+    max_attempts: int
+    run_after: datetime
+    leased_until: Optional[datetime] = None
+    last_error: Optional[str] = None
+    result: Optional[Any] = None
+    created_at: datetime
+    finished_at: Optional[datetime] = None
+
+
+class JobKindStatus(BaseModel):
+    """Registered job kind with its limits and per-status counts."""
+    kind: str
+    concurrency: int
+    max_attempts: int
+    running_here: int
+    counts: Dict[str, int] = {}
+
+
+class JobQueueStatus(BaseModel):
+    """Queue overview for the admin endpoint."""
+    worker: str
+    runner_active: bool
+    concurrency: int
+    running_here: int
+    counts: Dict[str, int] = {}
+    kinds: List[JobKindStatus] = []
+    recent: List[JobResponse] = []
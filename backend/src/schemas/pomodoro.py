@@ -1,7 +1,7 @@
 """Pomodoro session schemas."""
 from pydantic import BaseModel, Field
-from datetime import datetime
-from typing import Optional
+from datetime import date, datetime
+from typing import List, Optional
 
 
 class PomodoroSessionBase(BaseModel):
@@ -38,7 +38,37 @@ class PomodoroSessionResponse(PomodoroSessionBase):
         from_attributes = True
 
 
+class PomodoroPlanRequest(BaseModel):
+    """Schema for planning the next sessions of the pomodoro cycle."""
+    count: int = Field(2, ge=1, le=20)
+    task_id: Optional[int] = None
+
+
+class PomodoroAdvanceRequest(BaseModel):
+    """Schema for completing the active session and starting the next one."""
+    task_id: Optional[int] = None
+    paused_duration_ms: Optional[int] = Field(None, ge=0)
+
+
+class PomodoroAdvanceResponse(BaseModel):
+    """Schema for the result of advancing the cycle."""
+    completed: Optional[PomodoroSessionResponse] = None
+    active: PomodoroSessionResponse
+
+
 class PomodoroStatsResponse(BaseModel):
     """Schema for pomodoro statistics."""
     completed_today: int
     total_focus_time_minutes: int
+
+
+class PomodoroHistoryDay(BaseModel):
+    """Completed focus totals for one day."""
+    day: date
+    completed: int
+    focus_minutes: int
+
+
+class PomodoroHistoryResponse(BaseModel):
+    """Schema for daily focus history."""
+    days: List[PomodoroHistoryDay]
@@ -0,0 +1,19 @@
+"""Request profile schemas."""
+from pydantic import BaseModel
+from datetime import datetime
+from typing import Optional
+
+
+class ProfileSummary(BaseModel):
+    """A stored request profile, without its stacks."""
+    id: str
+    method: str
+    path: str
+    trigger: str
+    started_at: datetime
+    status_code: Optional[int] = None
+    duration_ms: Optional[float] = None
+    samples: int
+
+    class Config:
+        from_attributes = True
@@ -0,0 +1,51 @@
+"""Delta sync schemas."""
+from pydantic import BaseModel, Field
+from typing import Any, Dict, List, Optional
+from src.schemas.task import TaskResponse
+from src.schemas.pomodoro import PomodoroSessionResponse
+
+
+class SyncDeleted(BaseModel):
+    """IDs of rows deleted since the client's cursor."""
+    tasks: List[int] = []
+    pomodoro_sessions: List[int] = []
+
+
+class SyncResponse(BaseModel):
+    """Rows changed since the client's cursor."""
+    cursor: int
+    has_more: bool
+    tasks: List[TaskResponse] = []
+    pomodoro_sessions: List[PomodoroSessionResponse] = []
+    deleted: SyncDeleted = SyncDeleted()
+
+
+class SyncOperation(BaseModel):
+    """A single queued client write."""
+    entity: str = Field(..., pattern="^(task|pomodoro_session)$")
+    action: str = Field(..., pattern="^(create|update|delete)$")
+    id: Optional[int] = None  # Target row for update/delete
+    # Echoed back to map offline-created rows
+    client_ref: Optional[str] = Field(None, max_length=64)
+    data: Dict[str, Any] = {}
+
+
+class SyncPushRequest(BaseModel):
+    """Batch of client writes applied in order."""
+    operations: List[SyncOperation] = Field(..., max_length=500)
+
+
+class SyncOperationResult(BaseModel):
+    """Outcome of a single pushed operation."""
+    client_ref: Optional[str] = None
+    entity: str
+    action: str
+    id: Optional[int] = None
+    status: str  # ok, not_found, invalid, conflict, error
+    detail: Optional[str] = None
+
+
+class SyncPushResponse(BaseModel):
+    """Outcome of a pushed batch."""
+    results: List[SyncOperationResult]
+    cursor: int
@@ -1,7 +1,7 @@
 """Task schemas."""
 from pydantic import BaseModel, Field
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
 
 class TaskBase(BaseModel):
@@ -28,8 +28,19 @@ class TaskResponse(TaskBase):
     id: int
     completed: bool
     order: int
+    focus_sessions_completed: int = 0
+    focus_minutes: int = 0
     created_at: datetime
     updated_at: Optional[datetime] = None
 
     class Config:
         from_attributes = True
+
+
+class TaskSearchResponse(BaseModel):
+    """Schema for a page of task search results."""
+    query: str
+    items: List[TaskResponse]
+    limit: int
+    offset: int
+    has_more: bool
@@ -0,0 +1,106 @@
+"""Production server launcher.
+
+Runs the database initialization once, then starts uvicorn with multiple
+worker processes and the fastest available event loop and HTTP parser.
+
+Usage (from the backend directory):
+    python -m src.server
+
+Configuration (environment variables):
+    PORT                  Listen port (default: 8000)
+    HOST                  Listen address (default: 0.0.0.0)
+    WEB_CONCURRENCY       Worker processes (default: CPU count, capped by MAX_WORKERS;
+                          always 1 with an in-memory SQLite database)
+    MAX_WORKERS           Upper bound for the automatic worker count (default: 8)
+    KEEP_ALIVE_SECONDS    Idle keep-alive timeout (default: 75, above typical proxy timeouts)
+    BACKLOG               Listen socket backlog (default: 2048)
+    FORWARDED_ALLOW_IPS   Comma-separated proxy addresses whose X-Forwarded-For header is
+                          trusted as the client address (default: 127.0.0.1). Never use
+                          "*": uvicorn then takes the leftmost entry, which any client sets.
+"""
+import asyncio
+import importlib.util
+import os
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+backend_dir = Path(__file__).parent.parent
+if str(backend_dir) not in sys.path:
+    sys.path.insert(0, str(backend_dir))
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Set by the launcher so workers skip init_db in their startup event
+DB_INITIALIZED_ENV = "FOCUSFLOW_DB_INITIALIZED"
+
+
+def _has_module(name: str) -> bool:
+    return importlib.util.find_spec(name) is not None
+
+
+def worker_count() -> int:
+    """Number of worker processes: WEB_CONCURRENCY, else one per CPU up to MAX_WORKERS.
+
+    Always one for an in-memory database, which a second process could not see.
+    """
+    from src.database import is_memory_db
+    if is_memory_db:
+        return 1
+    configured = os.getenv("WEB_CONCURRENCY")
+    if configured:
+        return max(1, int(configured))
+    return max(1, min(os.cpu_count() or 1, int(os.getenv("MAX_WORKERS", "8"))))
+
+
+def server_options() -> dict:
+    """Uvicorn options for the production profile."""
+    return {
+        "host": os.getenv("HOST", "0.0.0.0"),
+        "port": int(os.getenv("PORT", "8000")),
+        "workers": worker_count(),
+        "loop": "uvloop" if _has_module("uvloop") else "asyncio",
+        "http": "httptools" if _has_module("httptools") else "h11",
+        "timeout_keep_alive": int(os.getenv("KEEP_ALIVE_SECONDS", "75")),
+        "backlog": int(os.getenv("BACKLOG", "2048")),
+        "proxy_headers": True,
+        "forwarded_allow_ips": os.getenv("FORWARDED_ALLOW_IPS", "127.0.0.1"),
+        "access_log": os.getenv("ACCESS_LOG", "false").lower() == "true",
+        # Keep uvicorn's loggers on the queue set up by src.utils.logging_config
+        "log_config": None,
+    }
+
+
+def init_database() -> None:
+    """Create tables and indexes once in the parent process."""
+    from src.database import init_db, engine
+
+    async def run():
+        await init_db()
+        await engine.dispose()
+
+    asyncio.run(run())
+    os.environ[DB_INITIALIZED_ENV] = "1"
+
+
+def run() -> None:
+    """Initialize the database, then serve with multiple workers."""
+    import uvicorn
+    from src.database import is_memory_db
+    from src.utils import logger
+
+    # An in-memory database only exists in the worker, which initializes it itself
+    if not is_memory_db:
+        init_database()
+    options = server_options()
+    logger.info(
+        "Starting FocusFlow: %d workers, loop=%s, http=%s, port=%d",
+        options["workers"], options["loop"], options["http"], options["port"],
+    )
+    uvicorn.run("src.main:app", **options)
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,239 @@
+"""Focus analytics service.
+
+Each metric is one set-based SQL query over every raw session table (the live
+table plus archives) and, where the metric survives rollup, the compacted
+daily stats. Results are cached per UTC day and sync cursor, so repeat calls
+cost one indexed ``max(id)`` lookup until a task or session changes.
+"""
+from datetime import date, datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.database import is_sqlite
+from src.schemas.analytics import (
+    AnalyticsSummaryResponse,
+    CompletionRateResponse,
+    HourBucket,
+    HourlyDistributionResponse,
+    StreakResponse,
+    TaskFocusResponse,
+    TaskFocusTime,
+)
+from src.services import retention_service, sync_service
+
+_cache: Dict[Tuple[Any, ...], Any] = {}
+_cache_day: Optional[date] = None
+
+_COMPLETED_FOCUS = "session_type = 'focus' AND state = 'completed'"
+
+
+def _as_date(value: Any) -> date:
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, str):
+        return date.fromisoformat(value[:10])
+    return value
+
+
+def _union(selects: List[str]) -> str:
+    return " UNION ALL ".join(selects)
+
+
+async def _cached(
+    db: AsyncSession,
+    key: Tuple[Any, ...],
+    compute: Callable[[], Awaitable[Any]],
+) -> Any:
+    """Return a cached result for today's data version, computing it on a miss."""
+    global _cache_day
+    today = datetime.utcnow().date()
+    if _cache_day != today:
+        _cache.clear()
+        _cache_day = today
+
+    full_key = key + (await sync_service.get_cursor(db),)
+    if full_key not in _cache:
+        # Drop results computed for an older data version of this metric
+        for stale in [k for k in _cache if k[:-1] == key]:
+            del _cache[stale]
+        _cache[full_key] = await compute()
+    return _cache[full_key]
+
+
+async def get_streaks(db: AsyncSession) -> StreakResponse:
+    """Current and longest runs of consecutive days with a completed focus session."""
+    return await _cached(db, ("streaks",), lambda: _compute_streaks(db))
+
+
+async def _compute_streaks(db: AsyncSession) -> StreakResponse:
+    today = datetime.utcnow().date()
+    tables = await retention_service.raw_session_tables(db)
+    days = _union(
+        [
+            f"SELECT date(completed_at) AS day FROM {table} WHERE {_COMPLETED_FOCUS}"
+            for table in tables
+        ]
+        + [
+            "SELECT day FROM pomodoro_daily_stats "
+            f"WHERE {_COMPLETED_FOCUS} AND session_count > 0"
+        ]
+    )
+    # Gaps and islands: consecutive days share the same (day - row_number) value
+    island = (
+        "julianday(day) - ROW_NUMBER() OVER (ORDER BY day)"
+        if is_sqlite
+        else "day - CAST(ROW_NUMBER() OVER (ORDER BY day) AS INTEGER)"
+    )
+    result = await db.execute(text(
+        f"WITH days AS (SELECT DISTINCT day FROM ({days}) AS all_days WHERE day IS NOT NULL), "
+        f"islands AS (SELECT day, {island} AS grp FROM days), "
+        "streaks AS (SELECT max(day) AS end_day, count(*) AS length FROM islands GROUP BY grp) "
+        "SELECT end_day, length, max(length) OVER () AS longest FROM streaks "
+        "ORDER BY end_day DESC LIMIT 1"
+    ))
+    row = result.first()
+    if row is None:
+        return StreakResponse(current_streak_days=0, longest_streak_days=0, active_today=False)
+
+    last_day = _as_date(row.end_day)
+    # A streak stays current until a whole day passes without a session
+    current = row.length if last_day >= today - timedelta(days=1) else 0
+    return StreakResponse(
+        current_streak_days=current,
+        longest_streak_days=row.longest,
+        last_active_day=last_day,
+        active_today=last_day == today,
+    )
+
+
+async def get_task_focus(db: AsyncSession, days: int = 30) -> TaskFocusResponse:
+    """Completed focus sessions and minutes per task over the last ``days`` days."""
+    return await _cached(db, ("tasks", days), lambda: _compute_task_focus(db, days))
+
+
+async def _compute_task_focus(db: AsyncSession, days: int) -> TaskFocusResponse:
+    start = datetime.utcnow().date() - timedelta(days=days - 1)
+    tables = await retention_service.raw_session_tables(db, since=start)
+    rows = _union(
+        [
+            f"SELECT task_id, 1 AS sessions, duration AS minutes FROM {table} "
+            f"WHERE {_COMPLETED_FOCUS} AND completed_at >= :start_ts"
+            for table in tables
+        ]
+        + [
+            "SELECT task_id, session_count AS sessions, total_minutes AS minutes "
+            f"FROM pomodoro_daily_stats WHERE {_COMPLETED_FOCUS} AND day >= :start_day"
+        ]
+    )
+    result = await db.execute(
+        text(
+            "SELECT s.task_id, t.title, sum(s.sessions) AS sessions, sum(s.minutes) AS minutes "
+            f"FROM ({rows}) AS s LEFT JOIN tasks t ON t.id = s.task_id "
+            "GROUP BY s.task_id, t.title ORDER BY minutes DESC, sessions DESC"
+        ),
+        {"start_ts": datetime.combine(start, datetime.min.time()), "start_day": start},
+    )
+    return TaskFocusResponse(days=days, tasks=[
+        TaskFocusTime(
+            task_id=row.task_id,
+            title=row.title,
+            sessions=row.sessions,
+            focus_minutes=row.minutes or 0,
+        )
+        for row in result.all()
+    ])
+
+
+async def get_hourly_distribution(db: AsyncSession, days: int = 90) -> HourlyDistributionResponse:
+    """Completed focus sessions by UTC hour of day over the last ``days`` days.
+
+    Rollups have no time of day, so only raw sessions count here.
+    """
+    return await _cached(db, ("hours", days), lambda: _compute_hourly(db, days))
+
+
+async def _compute_hourly(db: AsyncSession, days: int) -> HourlyDistributionResponse:
+    start = datetime.utcnow().date() - timedelta(days=days - 1)
+    tables = await retention_service.raw_session_tables(db, since=start)
+    hour = (
+        "CAST(strftime('%H', coalesce(started_at, completed_at)) AS INTEGER)"
+        if is_sqlite
+        else "CAST(EXTRACT(HOUR FROM coalesce(started_at, completed_at)) AS INTEGER)"
+    )
+    rows = _union([
+        f"SELECT {hour} AS hour, duration FROM {table} "
+        f"WHERE {_COMPLETED_FOCUS} AND completed_at >= :start_ts"
+        for table in tables
+    ])
+    result = await db.execute(
+        text(
+            "SELECT hour, count(*) AS sessions, sum(duration) AS minutes, "
+            "CAST(count(*) AS FLOAT) / sum(count(*)) OVER () AS share "
+            f"FROM ({rows}) AS s GROUP BY hour ORDER BY hour"
+        ),
+        {"start_ts": datetime.combine(start, datetime.min.time())},
+    )
+    by_hour = {row.hour: row for row in result.all()}
+    return HourlyDistributionResponse(days=days, hours=[
+        HourBucket(
+            hour=h,
+            sessions=by_hour[h].sessions if h in by_hour else 0,
+            focus_minutes=(by_hour[h].minutes or 0) if h in by_hour else 0,
+            share=round(by_hour[h].share, 4) if h in by_hour else 0.0,
+        )
+        for h in range(24)
+    ])
+
+
+async def get_completion_rate(db: AsyncSession, days: int = 30) -> CompletionRateResponse:
+    """Completed vs cancelled focus sessions over the last ``days`` days."""
+    return await _cached(db, ("completion", days), lambda: _compute_completion(db, days))
+
+
+async def _compute_completion(db: AsyncSession, days: int) -> CompletionRateResponse:
+    start = datetime.utcnow().date() - timedelta(days=days - 1)
+    tables = await retention_service.raw_session_tables(db, since=start)
+    rows = _union(
+        [
+            f"SELECT state, 1 AS sessions FROM {table} WHERE session_type = 'focus' "
+            "AND state IN ('completed', 'cancelled') "
+            "AND coalesce(completed_at, updated_at, created_at) >= :start_ts"
+            for table in tables
+        ]
+        + [
+            "SELECT state, session_count AS sessions FROM pomodoro_daily_stats "
+            "WHERE session_type = 'focus' AND state IN ('completed', 'cancelled') "
+            "AND day >= :start_day"
+        ]
+    )
+    result = await db.execute(
+        text(
+            "SELECT "
+            "coalesce(sum(CASE WHEN state = 'completed' THEN sessions ELSE 0 END), 0) "
+            "AS completed, "
+            "coalesce(sum(CASE WHEN state = 'cancelled' THEN sessions ELSE 0 END), 0) "
+            "AS cancelled "
+            f"FROM ({rows}) AS s"
+        ),
+        {"start_ts": datetime.combine(start, datetime.min.time()), "start_day": start},
+    )
+    row = result.one()
+    finished = row.completed + row.cancelled
+    return CompletionRateResponse(
+        days=days,
+        completed=row.completed,
+        cancelled=row.cancelled,
+        completion_rate=round(row.completed / finished, 4) if finished else 0.0,
+    )
+
+
+async def get_summary(db: AsyncSession, days: int = 30) -> AnalyticsSummaryResponse:
+    """All analytics for the dashboard."""
+    return AnalyticsSummaryResponse(
+        streaks=await get_streaks(db),
+        tasks=await get_task_focus(db, days),
+        hours=await get_hourly_distribution(db, days),
+        completion=await get_completion_rate(db, days),
+    )
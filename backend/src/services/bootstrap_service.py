@@ -0,0 +1,87 @@
+"""Dashboard bootstrap service.
+
+Loads settings, tasks, the active session and today's stats in one request.
+On PostgreSQL the four independent reads run at the same time on separate
+pooled sessions, so the request takes as long as the slowest read. On SQLite
+they share one session, since connections are not pooled there.
+"""
+import asyncio
+import hashlib
+from typing import Any, Awaitable, Callable, List, Optional, Tuple
+
+from pydantic import TypeAdapter
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.database import database_role, is_sqlite
+from src.schemas.pomodoro import PomodoroSessionResponse, PomodoroStatsResponse
+from src.schemas.settings import SettingsResponse
+from src.schemas.task import TaskResponse
+from src.services import pomodoro_service, settings_service, task_service
+from src.utils.singleflight import polling
+
+# Serializers for each section of the BootstrapResponse schema
+_settings_adapter = TypeAdapter(SettingsResponse)
+_tasks_adapter = TypeAdapter(List[TaskResponse])
+_active_adapter = TypeAdapter(Optional[PomodoroSessionResponse])
+_stats_adapter = TypeAdapter(PomodoroStatsResponse)
+
+
+async def _active_session(db: AsyncSession):
+    # Same flight key as GET /pomodoro/active, so bootstrap shares in-flight polls.
+    # Keys name the database, so a client reading its own writes from the primary
+    # never gets a result read from a lagging replica
+    async def fetch():
+        session = await pomodoro_service.get_active_session(db)
+        return PomodoroSessionResponse.model_validate(session) if session else None
+
+    return await polling.do(f"pomodoro:active:{database_role(db)}", fetch)
+
+
+async def _stats_today(db: AsyncSession):
+    return await polling.do(
+        f"pomodoro:stats:today:{database_role(db)}",
+        lambda: pomodoro_service.get_stats_today(db),
+    )
+
+
+async def get_bootstrap(
+    session_factory: async_sessionmaker,
+    include_completed: bool = True,
+) -> Tuple[bytes, str]:
+    """Load the dashboard payload as JSON bytes matching ``BootstrapResponse``, with its ETag.
+
+    Each section is serialized once; the ETag combines a digest of each
+    section, so it changes when any one of them does.
+    """
+    loaders: Tuple[Callable[[AsyncSession], Awaitable[Any]], ...] = (
+        settings_service.get_settings,
+        lambda db: task_service.list_tasks(db, include_completed),
+        _active_session,
+        _stats_today,
+    )
+    if is_sqlite:
+        # Unpooled connections and one database file: a single session beats four connection setups
+        async with session_factory() as db:
+            results = [await load(db) for load in loaders]
+    else:
+        async def read(load: Callable[[AsyncSession], Awaitable[Any]]) -> Any:
+            async with session_factory() as db:
+                return await load(db)
+
+        results = await asyncio.gather(*(read(load) for load in loaders))
+    settings_row, task_rows, active_session, stats_today = results
+    settings = _settings_adapter.validate_python(settings_row, from_attributes=True)
+    tasks = _tasks_adapter.validate_python(task_rows, from_attributes=True)
+    sections = (
+        ("settings", _settings_adapter.dump_json(settings)),
+        ("tasks", _tasks_adapter.dump_json(tasks)),
+        ("active_session", _active_adapter.dump_json(active_session)),
+        ("stats_today", _stats_adapter.dump_json(stats_today)),
+    )
+
+    combined = hashlib.blake2b(digest_size=16)
+    for _, data in sections:
+        combined.update(hashlib.blake2b(data, digest_size=16).digest())
+    body = b"{" + b",".join(b'"%s":%s' % (name.encode(), data) for name, data in sections) + b"}"
+    # Weak: the compression middleware may send this body gzip or br encoded
+    return body, f'W/"{combined.hexdigest()}"'
@@ -0,0 +1,159 @@
+"""Per-task focus counters.
+
+``tasks.focus_sessions_completed`` and ``tasks.focus_minutes`` hold the
+completed focus sessions linked to a task, so task responses carry them
+without touching ``pomodoro_sessions``. Session writes adjust them with
+in-database increments in the same transaction. Reconciliation recomputes
+them from raw sessions, archives and rollups, and repairs any drift.
+"""
+from typing import List, Optional, Tuple, Union
+
+from pydantic import BaseModel
+from sqlalchemy import text, update
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+
+from src.database import is_sqlite
+from src.models.pomodoro import PomodoroSession
+from src.models.task import Task
+from src.services import retention_service, sync_service
+from src.utils import logger
+
+_COMPLETED_FOCUS = "session_type = 'focus' AND state = 'completed' AND task_id IS NOT NULL"
+
+
+class FocusCounterMismatch(BaseModel):
+    """A task whose stored counters disagree with its sessions."""
+    task_id: int
+    stored_sessions: int
+    actual_sessions: int
+    stored_minutes: int
+    actual_minutes: int
+
+
+class ReconcileReport(BaseModel):
+    """Summary of a reconciliation run."""
+    mismatched: int = 0
+    corrected: bool = False
+    mismatches: List[FocusCounterMismatch] = []
+
+
+def contribution(session: PomodoroSession) -> Tuple[Optional[int], int, int]:
+    """The (task_id, sessions, minutes) a session adds to its task's counters."""
+    if session.task_id is None or session.session_type != "focus" or session.state != "completed":
+        return session.task_id, 0, 0
+    return session.task_id, 1, int(session.duration or 0)
+
+
+async def apply_change(
+    db: AsyncSession,
+    before: Tuple[Optional[int], int, int],
+    after: Tuple[Optional[int], int, int],
+) -> None:
+    """Move a session's contribution from ``before`` to ``after``.
+
+    Uses ``SET x = x + delta`` so concurrent writers never lose an update.
+    Call before the session write is committed.
+    """
+    if before == after:
+        return
+
+    deltas = {}
+    for (task_id, sessions, minutes), sign in ((before, -1), (after, 1)):
+        if task_id is not None and sessions:
+            count, total = deltas.get(task_id, (0, 0))
+            deltas[task_id] = (count + sign * sessions, total + sign * minutes)
+
+    for task_id, (sessions, minutes) in deltas.items():
+        if not (sessions or minutes):
+            continue
+        await db.execute(
+            update(Task)
+            .where(Task.id == task_id)
+            .values(
+                focus_sessions_completed=Task.focus_sessions_completed + sessions,
+                focus_minutes=Task.focus_minutes + minutes,
+            )
+        )
+        await sync_service.record_change(db, sync_service.TASK, task_id)
+
+
+async def ensure_counter_columns(conn: AsyncConnection) -> None:
+    """Add the counter columns to a ``tasks`` table created before they existed, then fill them."""
+    if is_sqlite:
+        result = await conn.execute(text("PRAGMA table_info(tasks)"))
+        if "focus_minutes" in {row[1] for row in result.all()}:
+            return
+    else:
+        result = await conn.execute(text(
+            "SELECT 1 FROM information_schema.columns "
+            "WHERE table_schema = current_schema() AND table_name = 'tasks' "
+            "AND column_name = 'focus_minutes'"
+        ))
+        if result.first() is not None:
+            return
+
+    for name in ("focus_sessions_completed", "focus_minutes"):
+        await conn.execute(text(f"ALTER TABLE tasks ADD COLUMN {name} INTEGER NOT NULL DEFAULT 0"))
+    report = await reconcile(conn)
+    logger.info("Added task focus counters, filled %d tasks", report.mismatched)
+
+
+async def reconcile(
+    db: Union[AsyncSession, AsyncConnection],
+    fix: bool = True,
+    sample_size: int = 50,
+) -> ReconcileReport:
+    """Compare every task's counters with its sessions and optionally correct them.
+
+    Counts the live table, archive tables and daily rollups, so counters keep
+    including sessions after retention moves them.
+    """
+    tables = await retention_service.raw_session_tables(db)
+    sources = " UNION ALL ".join(
+        [
+            "SELECT task_id, 1 AS sessions, duration AS minutes "
+            f"FROM {table} WHERE {_COMPLETED_FOCUS}"
+            for table in tables
+        ]
+        + [
+            "SELECT task_id, session_count, total_minutes "
+            f"FROM pomodoro_daily_stats WHERE {_COMPLETED_FOCUS}"
+        ]
+    )
+    result = await db.execute(text(
+        "SELECT t.id, t.focus_sessions_completed, t.focus_minutes, "
+        "coalesce(s.sessions, 0) AS sessions, coalesce(s.minutes, 0) AS minutes FROM tasks t "
+        "LEFT JOIN (SELECT task_id, sum(sessions) AS sessions, sum(minutes) AS minutes "
+        f"FROM ({sources}) AS linked GROUP BY task_id) s ON s.task_id = t.id "
+        "WHERE t.focus_sessions_completed != coalesce(s.sessions, 0) "
+        "OR t.focus_minutes != coalesce(s.minutes, 0)"
+    ))
+    rows = result.all()
+
+    if rows and fix:
+        await db.execute(
+            text(
+                "UPDATE tasks SET focus_sessions_completed = :sessions, focus_minutes = :minutes "
+                "WHERE id = :id"
+            ),
+            [{"id": row.id, "sessions": row.sessions, "minutes": row.minutes} for row in rows],
+        )
+        if isinstance(db, AsyncSession):
+            for row in rows:
+                await sync_service.record_change(db, sync_service.TASK, row.id)
+            await db.commit()
+
+    return ReconcileReport(
+        mismatched=len(rows),
+        corrected=bool(rows) and fix,
+        mismatches=[
+            FocusCounterMismatch(
+                task_id=row.id,
+                stored_sessions=row.focus_sessions_completed,
+                actual_sessions=row.sessions,
+                stored_minutes=row.focus_minutes,
+                actual_minutes=row.minutes,
+            )
+            for row in rows[:sample_size]
+        ],
+    )
@@ -0,0 +1,245 @@
+"""Idempotency service for safely retried writes.
+
+A write sent with an ``Idempotency-Key`` header stores its response. A retry
+with the same key gets that response back without running the write again.
+
+The ``idempotency_records`` table is the source of truth across workers. A
+request claims its key by inserting a record, runs the write and stores the
+response on the record, all in one transaction: the key, the write and the
+response commit together, and an error or crash part-way leaves nothing
+behind, so a retry runs the write again. A duplicate that arrives meanwhile
+hits the record's primary key, waits for a stored response and replays it.
+Completed responses are also kept in a bounded in-memory LRU, read through
+from the table.
+"""
+import asyncio
+import hashlib
+import json
+import os
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Optional, Tuple
+
+from fastapi.responses import JSONResponse
+from sqlalchemy import select, delete, update, func
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.models.idempotency import IdempotencyRecord
+from src.utils.error_handling import ConflictException, ValidationException
+
+TTL_SECONDS = int(os.getenv("IDEMPOTENCY_TTL_SECONDS", "86400"))
+MAX_RECORDS = int(os.getenv("IDEMPOTENCY_MAX_RECORDS", "10000"))
+MEMORY_CACHE_SIZE = int(os.getenv("IDEMPOTENCY_MEMORY_CACHE_SIZE", "1024"))
+# How long a duplicate waits for the request holding its key to finish
+WAIT_SECONDS = float(os.getenv("IDEMPOTENCY_WAIT_SECONDS", "10"))
+EVICT_INTERVAL_SECONDS = 60
+
+# (request_hash, status_code, body, expires_at epoch seconds)
+_CachedResponse = Tuple[str, int, Any, float]
+
+_memory: "OrderedDict[str, _CachedResponse]" = OrderedDict()
+_last_eviction = 0.0
+
+
+def _request_hash(payload: Any) -> str:
+    """Hash a request body so a reused key with a different body is rejected."""
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+def _remember(key: str, entry: _CachedResponse) -> None:
+    """Put a response in the in-memory LRU."""
+    _memory[key] = entry
+    _memory.move_to_end(key)
+    while len(_memory) > MEMORY_CACHE_SIZE:
+        _memory.popitem(last=False)
+
+
+def _recall(key: str) -> Optional[_CachedResponse]:
+    """Get an unexpired response from the in-memory LRU."""
+    entry = _memory.get(key)
+    if entry is None:
+        return None
+    if entry[3] < time.time():
+        del _memory[key]
+        return None
+    _memory.move_to_end(key)
+    return entry
+
+
+def clear_cache() -> None:
+    """Forget the in-memory responses (the table is unaffected)."""
+    _memory.clear()
+
+
+async def _load(db: AsyncSession, key: str) -> Optional[Tuple[str, Optional[_CachedResponse]]]:
+    """Get the unexpired record for ``key`` from the database.
+
+    Returns ``(request_hash, response)``, where ``response`` is None while the
+    request holding the key is still running, or None when there is no record.
+    """
+    result = await db.execute(
+        select(
+            IdempotencyRecord.request_hash,
+            IdempotencyRecord.status_code,
+            IdempotencyRecord.response_body,
+            IdempotencyRecord.expires_at,
+        ).where(
+            IdempotencyRecord.key == key,
+            IdempotencyRecord.expires_at >= datetime.utcnow(),
+        )
+    )
+    row = result.one_or_none()
+    if row is None:
+        return None
+    if row.status_code is None:
+        return row.request_hash, None
+
+    expires_in = (row.expires_at.replace(tzinfo=None) - datetime.utcnow()).total_seconds()
+    entry = (
+        row.request_hash,
+        row.status_code,
+        json.loads(row.response_body),
+        time.time() + expires_in,
+    )
+    _remember(key, entry)
+    return row.request_hash, entry
+
+
+async def _claim(db: AsyncSession, key: str, request_hash: str) -> bool:
+    """Insert a pending record for ``key`` in the current transaction.
+
+    Returns False, with the transaction rolled back, when another request
+    holds the key.
+    """
+    now = datetime.utcnow()
+    # An expired record still occupies the primary key until eviction runs
+    await db.execute(
+        delete(IdempotencyRecord).where(
+            IdempotencyRecord.key == key,
+            IdempotencyRecord.expires_at < now,
+        )
+    )
+    db.add(IdempotencyRecord(
+        key=key,
+        request_hash=request_hash,
+        created_at=now,
+        expires_at=now + timedelta(seconds=TTL_SECONDS),
+    ))
+    try:
+        await db.flush()
+    except IntegrityError:
+        await db.rollback()
+        return False
+    return True
+
+
+async def _store_response(db: AsyncSession, key: str, entry: _CachedResponse) -> None:
+    """Store the response on the claimed record, in the current transaction."""
+    await db.execute(
+        update(IdempotencyRecord)
+        .where(IdempotencyRecord.key == key)
+        .values(status_code=entry[1], response_body=json.dumps(entry[2]))
+    )
+
+
+async def evict_expired(db: AsyncSession, force: bool = False) -> None:
+    """Delete expired records and trim the table to ``MAX_RECORDS`` rows.
+
+    Runs at most once per ``EVICT_INTERVAL_SECONDS`` unless forced.
+    """
+    global _last_eviction
+    if not force and time.monotonic() - _last_eviction < EVICT_INTERVAL_SECONDS:
+        return
+    _last_eviction = time.monotonic()
+
+    await db.execute(
+        delete(IdempotencyRecord).where(IdempotencyRecord.expires_at < datetime.utcnow())
+    )
+
+    result = await db.execute(select(func.count()).select_from(IdempotencyRecord))
+    excess = (result.scalar() or 0) - MAX_RECORDS
+    if excess > 0:
+        oldest = (
+            select(IdempotencyRecord.key)
+            .where(IdempotencyRecord.status_code.is_not(None))
+            .order_by(IdempotencyRecord.created_at)
+            .limit(excess)
+            .scalar_subquery()
+        )
+        await db.execute(delete(IdempotencyRecord).where(IdempotencyRecord.key.in_(oldest)))
+
+    await db.commit()
+
+
+def _replay(entry: _CachedResponse, request_hash: str) -> JSONResponse:
+    """Build the replayed response, rejecting a key reused for a different request."""
+    _check_hash(entry[0], request_hash)
+    return JSONResponse(
+        status_code=entry[1],
+        content=entry[2],
+        headers={"Idempotent-Replayed": "true"},
+    )
+
+
+def _check_hash(stored_hash: str, request_hash: str) -> None:
+    if stored_hash != request_hash:
+        raise ValidationException("Idempotency-Key was already used with a different request body")
+
+
+async def run_idempotent(
+    db: AsyncSession,
+    scope: str,
+    idempotency_key: str,
+    payload: Any,
+    execute: Callable[[], Awaitable[Any]],
+    status_code: int,
+) -> JSONResponse:
+    """Run ``execute`` once per key and replay its JSON response on retries.
+
+    ``execute`` must return the JSON-serializable response body without
+    committing (the services' ``commit=False``). It runs in the transaction
+    that claimed the key, which is committed once the response is stored.
+    """
+    key = f"{scope}:{idempotency_key}"
+    request_hash = _request_hash(payload)
+
+    entry = _recall(key)
+    if entry is not None:
+        return _replay(entry, request_hash)
+
+    deadline = time.monotonic() + WAIT_SECONDS
+    delay = 0.02
+    while True:
+        record = await _load(db, key)
+        if record is None:
+            if await _claim(db, key, request_hash):
+                break
+        else:
+            stored_hash, entry = record
+            if entry is not None:
+                return _replay(entry, request_hash)
+            _check_hash(stored_hash, request_hash)
+            # End the transaction so the pooled connection is free for the
+            # request holding the key, and the next read sees its commit
+            await db.rollback()
+
+        if time.monotonic() >= deadline:
+            raise ConflictException("A request with this Idempotency-Key is still in progress")
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, 0.5)
+
+    try:
+        body = await execute()
+        entry = (request_hash, status_code, body, time.time() + TTL_SECONDS)
+        await _store_response(db, key, entry)
+        await db.commit()
+    except Exception:
+        # Drops the claim with the write, so a retry runs it again
+        await db.rollback()
+        raise
+    _remember(key, entry)
+    await evict_expired(db)
+    return JSONResponse(status_code=status_code, content=body)
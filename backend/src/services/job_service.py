@@ -0,0 +1,419 @@
+"""In-process background job queue.
+
+Jobs are rows in the ``jobs`` table, so they survive restarts and any worker
+process can run them. Every worker runs a ``JobRunner`` that leases due jobs
+with a conditional UPDATE (exactly one worker wins each job), runs the
+registered handler with a timeout shorter than the lease, and stores the
+result. Failures are retried with exponential backoff up to ``max_attempts``.
+A job whose worker died is taken over once its lease expires.
+
+Concurrency limits (overall and per kind) apply per worker process.
+"""
+import asyncio
+import json
+import os
+import random
+import socket
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from sqlalchemy import and_, delete, func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.database import AsyncSessionLocal
+from src.models.job import Job
+from src.schemas.job import JobKindStatus, JobQueueStatus, JobResponse
+from src.utils import logger
+from src.utils.error_handling import ValidationException
+
+RUNNER_ENABLED = os.getenv("JOB_RUNNER_ENABLED", "true").lower() == "true"
+JOB_CONCURRENCY = int(os.getenv("JOB_CONCURRENCY", "2"))
+POLL_INTERVAL_SECONDS = float(os.getenv("JOB_POLL_INTERVAL_SECONDS", "2"))
+DEFAULT_TIMEOUT_SECONDS = float(os.getenv("JOB_TIMEOUT_SECONDS", "300"))
+RETRY_BASE_SECONDS = float(os.getenv("JOB_RETRY_BASE_SECONDS", "10"))
+RETRY_MAX_SECONDS = 3600
+KEEP_FINISHED_DAYS = int(os.getenv("JOB_KEEP_FINISHED_DAYS", "7"))
+
+# Extra lease time past the handler timeout, so a live worker never loses its job
+LEASE_GRACE_SECONDS = 60
+
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}"
+
+JobHandler = Callable[[AsyncSession, Dict[str, Any]], Awaitable[Any]]
+
+
+@dataclass
+class JobKind:
+    """A registered handler with its limits."""
+    name: str
+    handler: JobHandler
+    concurrency: int
+    max_attempts: int
+    timeout_seconds: float
+
+
+@dataclass
+class _Lease:
+    """The fields of a claimed job the runner needs after its session closes."""
+    id: int
+    kind: str
+    payload: Dict[str, Any]
+    attempts: int
+    max_attempts: int
+
+
+_kinds: Dict[str, JobKind] = {}
+
+
+def register(
+    name: str,
+    concurrency: int = 1,
+    max_attempts: int = 3,
+    timeout_seconds: float = DEFAULT_TIMEOUT_SECONDS,
+) -> Callable[[JobHandler], JobHandler]:
+    """Register ``async def handler(db, payload)`` as the job kind ``name``.
+
+    The handler's return value must be JSON-serializable and is stored as the result.
+    """
+    def decorator(handler: JobHandler) -> JobHandler:
+        _kinds[name] = JobKind(name, handler, concurrency, max_attempts, timeout_seconds)
+        return handler
+    return decorator
+
+
+def _to_response(job: Job) -> JobResponse:
+    return JobResponse(
+        id=job.id,
+        kind=job.kind,
+        payload=json.loads(job.payload) if job.payload else None,
+        status=job.status,
+        attempts=job.attempts,
+        max_attempts=job.max_attempts,
+        run_after=job.run_after,
+        leased_until=job.leased_until,
+        last_error=job.last_error,
+        result=json.loads(job.result) if job.result else None,
+        created_at=job.created_at,
+        finished_at=job.finished_at,
+    )
+
+
+async def enqueue(
+    db: AsyncSession,
+    kind: str,
+    payload: Optional[Dict[str, Any]] = None,
+    delay_seconds: float = 0,
+    max_attempts: Optional[int] = None,
+) -> JobResponse:
+    """Queue a job of a registered kind to run after ``delay_seconds``."""
+    if kind not in _kinds:
+        raise ValidationException(
+            f"Unknown job kind '{kind}'. Available: {', '.join(sorted(_kinds))}"
+        )
+
+    job = Job(
+        kind=kind,
+        payload=json.dumps(payload or {}),
+        status="queued",
+        attempts=0,
+        max_attempts=max_attempts or _kinds[kind].max_attempts,
+        run_after=datetime.utcnow() + timedelta(seconds=delay_seconds),
+    )
+    db.add(job)
+    await db.commit()
+    await db.refresh(job)
+    if not delay_seconds:
+        runner.wake()
+    return _to_response(job)
+
+
+async def get_job(db: AsyncSession, job_id: int) -> Optional[JobResponse]:
+    """Get a job by ID."""
+    job = await db.get(Job, job_id)
+    return _to_response(job) if job else None
+
+
+async def get_status(db: AsyncSession, recent: int = 20) -> JobQueueStatus:
+    """Job counts by status and kind, this worker's running jobs and the latest jobs."""
+    result = await db.execute(
+        select(Job.kind, Job.status, func.count()).group_by(Job.kind, Job.status)
+    )
+    counts: Dict[str, int] = {}
+    by_kind: Dict[str, Dict[str, int]] = {}
+    for kind, job_status, count in result.all():
+        counts[job_status] = counts.get(job_status, 0) + count
+        by_kind.setdefault(kind, {})[job_status] = count
+
+    result = await db.execute(select(Job).order_by(Job.id.desc()).limit(recent))
+    running = runner.running_counts()
+    return JobQueueStatus(
+        worker=WORKER_ID,
+        runner_active=runner.active,
+        concurrency=runner.concurrency,
+        running_here=sum(running.values()),
+        counts=counts,
+        kinds=[
+            JobKindStatus(
+                kind=kind.name,
+                concurrency=kind.concurrency,
+                max_attempts=kind.max_attempts,
+                running_here=running.get(kind.name, 0),
+                counts=by_kind.get(kind.name, {}),
+            )
+            for kind in sorted(_kinds.values(), key=lambda k: k.name)
+        ],
+        recent=[_to_response(job) for job in result.scalars().all()],
+    )
+
+
+def _due(now: datetime):
+    """Queued jobs whose time has come, and running jobs whose lease expired."""
+    return or_(
+        and_(Job.status == "queued", Job.run_after <= now),
+        and_(Job.status == "running", Job.leased_until < now, Job.attempts < Job.max_attempts),
+    )
+
+
+async def _claim(db: AsyncSession, kinds: List[str]) -> Optional[_Lease]:
+    """Lease the next due job of one of ``kinds``, or return None."""
+    now = datetime.utcnow()
+    result = await db.execute(
+        select(Job.id, Job.kind)
+        .where(_due(now), Job.kind.in_(kinds))
+        .order_by(Job.run_after, Job.id)
+        .limit(5)
+    )
+    for job_id, kind in result.all():
+        lease = now + timedelta(seconds=_kinds[kind].timeout_seconds + LEASE_GRACE_SECONDS)
+        # Only one worker's UPDATE still matches the due condition
+        claimed = await db.execute(
+            update(Job)
+            .where(Job.id == job_id, _due(now))
+            .values(
+                status="running",
+                attempts=Job.attempts + 1,
+                lease_owner=WORKER_ID,
+                leased_until=lease,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        await db.commit()
+        if claimed.rowcount == 1:
+            job = await db.get(Job, job_id, populate_existing=True)
+            payload = json.loads(job.payload or "{}")
+            return _Lease(job.id, job.kind, payload, job.attempts, job.max_attempts)
+    return None
+
+
+async def _expire_abandoned(db: AsyncSession) -> None:
+    """Fail jobs whose worker died during their final attempt."""
+    now = datetime.utcnow()
+    await db.execute(
+        update(Job)
+        .where(Job.status == "running", Job.leased_until < now, Job.attempts >= Job.max_attempts)
+        .values(
+            status="failed", last_error="Lease expired during the final attempt", finished_at=now
+        )
+        .execution_options(synchronize_session=False)
+    )
+    await db.commit()
+
+
+def _backoff(attempts: int) -> float:
+    """Exponential backoff with jitter for the retry after ``attempts`` attempts."""
+    delay = min(RETRY_BASE_SECONDS * 2 ** (attempts - 1), RETRY_MAX_SECONDS)
+    return delay * random.uniform(0.8, 1.2)
+
+
+async def _finish(lease: _Lease, values: Dict[str, Any]) -> None:
+    """Record a job outcome, unless another worker has taken the job over."""
+    async with AsyncSessionLocal() as db:
+        await db.execute(
+            update(Job)
+            .where(Job.id == lease.id, Job.lease_owner == WORKER_ID, Job.status == "running")
+            .values(leased_until=None, **values)
+            .execution_options(synchronize_session=False)
+        )
+        await db.commit()
+
+
+async def _execute(lease: _Lease) -> None:
+    """Run a leased job and record success, a scheduled retry or failure."""
+    kind = _kinds[lease.kind]
+    try:
+        async with AsyncSessionLocal() as db:
+            result = await asyncio.wait_for(kind.handler(db, lease.payload), kind.timeout_seconds)
+    except asyncio.CancelledError:
+        # Shutting down: hand the job back without using up an attempt
+        await _finish(lease, {
+            "status": "queued",
+            "attempts": lease.attempts - 1,
+            "run_after": datetime.utcnow(),
+        })
+        raise
+    except Exception as exc:
+        if isinstance(exc, asyncio.TimeoutError):
+            error = f"Timed out after {kind.timeout_seconds:g}s"
+        else:
+            error = f"{type(exc).__name__}: {exc}"
+        logger.warning(
+            "Job %d (%s) attempt %d failed: %s", lease.id, lease.kind, lease.attempts, error
+        )
+
+        if lease.attempts >= lease.max_attempts:
+            await _finish(lease, {
+                "status": "failed",
+                "last_error": error[:2000],
+                "finished_at": datetime.utcnow(),
+            })
+        else:
+            retry_at = datetime.utcnow() + timedelta(seconds=_backoff(lease.attempts))
+            await _finish(lease, {
+                "status": "queued",
+                "last_error": error[:2000],
+                "run_after": retry_at,
+            })
+        return
+
+    await _finish(lease, {
+        "status": "succeeded",
+        "result": json.dumps(result, default=str),
+        "finished_at": datetime.utcnow(),
+    })
+    logger.info("Job %d (%s) succeeded", lease.id, lease.kind)
+
+
+class JobRunner:
+    """Polls for due jobs and runs them as asyncio tasks within concurrency limits."""
+
+    def __init__(self, concurrency: int = JOB_CONCURRENCY):
+        self.concurrency = concurrency
+        self._running: Dict[int, asyncio.Task] = {}
+        self._running_kinds: Dict[int, str] = {}
+        self._loop_task: Optional[asyncio.Task] = None
+        self._wake: Optional[asyncio.Event] = None
+
+    @property
+    def active(self) -> bool:
+        return self._loop_task is not None and not self._loop_task.done()
+
+    def running_counts(self) -> Dict[str, int]:
+        counts: Dict[str, int] = {}
+        for kind in self._running_kinds.values():
+            counts[kind] = counts.get(kind, 0) + 1
+        return counts
+
+    def wake(self) -> None:
+        """Poll now instead of waiting for the next interval."""
+        if self._wake is not None:
+            self._wake.set()
+
+    def start(self) -> None:
+        if not self.active:
+            self._wake = asyncio.Event()
+            self._loop_task = asyncio.create_task(self._loop())
+            logger.info("Job runner started on %s (concurrency %d)", WORKER_ID, self.concurrency)
+
+    async def stop(self) -> None:
+        """Stop polling and hand running jobs back to the queue."""
+        tasks = list(self._running.values())
+        if self._loop_task is not None:
+            tasks.append(self._loop_task)
+            self._loop_task = None
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _loop(self) -> None:
+        while True:
+            try:
+                await self._fill()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Job runner poll failed")
+
+            self._wake.clear()
+            try:
+                await asyncio.wait_for(self._wake.wait(), POLL_INTERVAL_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _fill(self) -> None:
+        """Lease jobs until the overall or every per-kind limit is reached."""
+        async with AsyncSessionLocal() as db:
+            await _expire_abandoned(db)
+            while len(self._running) < self.concurrency:
+                running = self.running_counts()
+                kinds = [
+                    kind.name
+                    for kind in _kinds.values()
+                    if running.get(kind.name, 0) < kind.concurrency
+                ]
+                if not kinds:
+                    return
+                lease = await _claim(db, kinds)
+                if lease is None:
+                    return
+                self._running_kinds[lease.id] = lease.kind
+                self._running[lease.id] = asyncio.create_task(self._run(lease))
+
+    async def _run(self, lease: _Lease) -> None:
+        try:
+            await _execute(lease)
+        finally:
+            self._running.pop(lease.id, None)
+            self._running_kinds.pop(lease.id, None)
+            self.wake()
+
+
+runner = JobRunner()
+
+
+# Built-in maintenance jobs
+
+@register("retention", timeout_seconds=1800)
+async def _retention_job(db: AsyncSession, payload: Dict[str, Any]) -> Any:
+    from src.services import retention_service
+
+    report = await retention_service.run_retention(
+        db,
+        hot_months=payload.get("hot_months", retention_service.HOT_MONTHS),
+        retention_months=payload.get("retention_months", retention_service.RETENTION_MONTHS),
+        dry_run=payload.get("dry_run", False),
+    )
+    return report.model_dump()
+
+
+@register("reconcile_focus")
+async def _reconcile_focus_job(db: AsyncSession, payload: Dict[str, Any]) -> Any:
+    from src.services import focus_counter_service
+
+    report = await focus_counter_service.reconcile(db, fix=not payload.get("dry_run", False))
+    return report.model_dump()
+
+
+@register("reindex_search")
+async def _reindex_search_job(db: AsyncSession, payload: Dict[str, Any]) -> Any:
+    from src.services import search_service
+
+    return {"indexed_tasks": await search_service.rebuild_index(db)}
+
+
+@register("evict_idempotency")
+async def _evict_idempotency_job(db: AsyncSession, payload: Dict[str, Any]) -> Any:
+    from src.services import idempotency_service
+
+    await idempotency_service.evict_expired(db, force=True)
+    return {"evicted": True}
+
+
+@register("prune_jobs")
+async def _prune_jobs_job(db: AsyncSession, payload: Dict[str, Any]) -> Any:
+    cutoff = datetime.utcnow() - timedelta(days=payload.get("keep_days", KEEP_FINISHED_DAYS))
+    result = await db.execute(
+        delete(Job).where(Job.status.in_(("succeeded", "failed")), Job.finished_at < cutoff)
+    )
+    await db.commit()
+    return {"deleted": result.rowcount}
@@ -1,17 +1,50 @@
 """Pomodoro service for managing focus sessions."""
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, and_
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+from sqlalchemy import select, func, and_, text, update
+from sqlalchemy.exc import IntegrityError
 from src.models.pomodoro import PomodoroSession
-from src.schemas.pomodoro import PomodoroSessionCreate, PomodoroSessionUpdate, PomodoroStatsResponse
+from src.models.settings import UserSettings
+from src.schemas.pomodoro import (
+    PomodoroSessionCreate,
+    PomodoroSessionUpdate,
+    PomodoroAdvanceRequest,
+    PomodoroStatsResponse,
+    PomodoroHistoryDay,
+    PomodoroHistoryResponse,
+)
+from src.services import focus_counter_service, settings_service, sync_service, retention_service
+from src.utils.error_handling import ConflictException
 from datetime import datetime, timedelta
-from typing import Optional
+from types import SimpleNamespace
+from typing import List, Optional, Tuple
 
+# States that take part in the cycle (cancelled sessions are skipped)
+_CYCLE_STATES = ("pending", "active", "completed")
 
-async def create_session(db: AsyncSession, session_data: PomodoroSessionCreate) -> PomodoroSession:
-    """Create a new pomodoro session."""
+# Tries before update_session gives up on a session other requests keep changing
+_UPDATE_ATTEMPTS = 3
+
+# Raised when the one-active-session unique index rejects a write
+_ALREADY_ACTIVE = "Another session is already active"
+
+
+async def create_session(
+    db: AsyncSession, session_data: PomodoroSessionCreate, commit: bool = True
+) -> PomodoroSession:
+    """Create a new pomodoro session.
+
+    With ``commit=False`` the session is only flushed, for callers that commit
+    it together with their own writes.
+    """
     session = PomodoroSession(**session_data.model_dump())
     db.add(session)
-    await db.commit()
+    await db.flush()
+    await focus_counter_service.apply_change(
+        db, (None, 0, 0), focus_counter_service.contribution(session)
+    )
+    await sync_service.record_change(db, sync_service.POMODORO_SESSION, session.id)
+    if commit:
+        await db.commit()
     await db.refresh(session)
     return session
 
@@ -33,25 +66,233 @@ async def get_active_session(db: AsyncSession) -> Optional[PomodoroSession]:
     return result.scalar_one_or_none()
 
 
+async def _supersede_active(db: AsyncSession, session_id: int) -> None:
+    """Cancel the active sessions other than ``session_id``, without committing."""
+    result = await db.execute(
+        select(PomodoroSession.id)
+        .where(PomodoroSession.state == "active", PomodoroSession.id != session_id)
+    )
+    for stale_id in result.scalars().all():
+        cancelled = await db.execute(
+            update(PomodoroSession)
+            .where(PomodoroSession.id == stale_id, PomodoroSession.state == "active")
+            .values(state="cancelled")
+            .execution_options(synchronize_session=False)
+        )
+        # Active and cancelled sessions both add nothing to the task focus counters
+        if cancelled.rowcount == 1:
+            await sync_service.record_change(db, sync_service.POMODORO_SESSION, stale_id)
+
+
 async def update_session(
     db: AsyncSession,
     session_id: int,
     session_update: PomodoroSessionUpdate
 ) -> Optional[PomodoroSession]:
-    """Update a pomodoro session."""
+    """Update a pomodoro session.
+
+    The write is conditional on the state the focus counter change was
+    computed from, so concurrent updates (say, two completes) cannot both
+    count the session. If another request changed the state in between, the
+    session is re-read and the update retried.
+
+    Activating a session cancels any other session still active (left running
+    in a closed tab or on another device) in the same transaction.
+    """
     session = await get_session(db, session_id)
     if not session:
         return None
-
     update_data = session_update.model_dump(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(session, field, value)
+    if not update_data:
+        return session
 
+    for _ in range(_UPDATE_ATTEMPTS):
+        after_state = update_data.get("state", session.state)
+        before = focus_counter_service.contribution(session)
+        after = focus_counter_service.contribution(SimpleNamespace(
+            task_id=session.task_id,
+            session_type=session.session_type,
+            duration=session.duration,
+            state=after_state,
+        ))
+        try:
+            if after_state == "active" and session.state != "active":
+                await _supersede_active(db, session_id)
+            result = await db.execute(
+                update(PomodoroSession)
+                .where(PomodoroSession.id == session_id, PomodoroSession.state == session.state)
+                .values(**update_data)
+                .execution_options(synchronize_session=False)
+            )
+        except IntegrityError:
+            # A concurrent request activated another session first
+            await db.rollback()
+            raise ConflictException(_ALREADY_ACTIVE)
+        if result.rowcount == 1:
+            break
+        await db.rollback()
+        session = await get_session(db, session_id)
+        if not session:
+            return None
+        await db.refresh(session)
+    else:
+        raise ConflictException("The session is being changed by other requests, retry")
+
+    await focus_counter_service.apply_change(db, before, after)
+    await sync_service.record_change(db, sync_service.POMODORO_SESSION, session.id)
     await db.commit()
     await db.refresh(session)
     return session
 
 
+async def _cycle_position(db: AsyncSession) -> Tuple[Optional[str], int]:
+    """Type of today's latest session and how many focus sessions today has.
+
+    The cycle restarts each day (UTC, like today's stats).
+    """
+    today_start = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+    result = await db.execute(
+        select(PomodoroSession.id, PomodoroSession.session_type, PomodoroSession.created_at)
+        .where(
+            PomodoroSession.state.in_(_CYCLE_STATES),
+            PomodoroSession.created_at >= today_start,
+        )
+    )
+    rows = result.all()
+    if not rows:
+        return None, 0
+    latest = max(rows, key=lambda row: (row.created_at, row.id))
+    return latest.session_type, sum(1 for row in rows if row.session_type == "focus")
+
+
+async def _add_planned(
+    db: AsyncSession,
+    settings: UserSettings,
+    count: int,
+    task_id: Optional[int],
+) -> List[PomodoroSession]:
+    """Add the next ``count`` sessions of the cycle as pending, without committing."""
+    last_type, focus_count = await _cycle_position(db)
+    sessions = []
+    for _ in range(count):
+        if last_type != "focus":
+            session = PomodoroSession(
+                session_type="focus", duration=settings.focus_duration, task_id=task_id
+            )
+            focus_count += 1
+        else:
+            long_break = focus_count % settings.sessions_until_long_break == 0
+            duration = settings.long_break_duration if long_break else settings.break_duration
+            session = PomodoroSession(session_type="break", duration=duration)
+        session.state = "pending"
+        sessions.append(session)
+        last_type = session.session_type
+
+    db.add_all(sessions)
+    await db.flush()
+    # Pending sessions add nothing to the task focus counters
+    for session in sessions:
+        await sync_service.record_change(db, sync_service.POMODORO_SESSION, session.id)
+    return sessions
+
+
+async def plan_sessions(
+    db: AsyncSession, count: int, task_id: Optional[int] = None
+) -> List[PomodoroSession]:
+    """Create the next ``count`` sessions of the cycle from the user's settings.
+
+    Focus and break sessions alternate, and every ``sessions_until_long_break``-th
+    focus session is followed by a long break.
+    """
+    settings = await settings_service.get_settings(db)
+    sessions = await _add_planned(db, settings, count, task_id)
+    await db.commit()
+    for session in sessions:
+        await db.refresh(session)
+    return sessions
+
+
+async def advance(
+    db: AsyncSession,
+    request: PomodoroAdvanceRequest,
+) -> Tuple[Optional[PomodoroSession], PomodoroSession]:
+    """Complete the active session and activate the next one in a single transaction.
+
+    The next session is today's oldest pending one, or a newly planned one.
+    Returns (completed session or None, newly active session). Raises
+    ConflictException if another request advanced the cycle first.
+    """
+    now = datetime.utcnow()
+    completed = await get_active_session(db)
+    if completed:
+        before = focus_counter_service.contribution(completed)
+        values = {"state": "completed", "completed_at": now}
+        if request.paused_duration_ms is not None:
+            values["paused_duration_ms"] = request.paused_duration_ms
+        result = await db.execute(
+            update(PomodoroSession)
+            .where(PomodoroSession.id == completed.id, PomodoroSession.state == "active")
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount != 1:
+            await db.rollback()
+            raise ConflictException("The active session was already advanced")
+        await db.refresh(completed)
+        await focus_counter_service.apply_change(
+            db, before, focus_counter_service.contribution(completed)
+        )
+        await sync_service.record_change(db, sync_service.POMODORO_SESSION, completed.id)
+
+    today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    result = await db.execute(
+        select(PomodoroSession).where(
+            PomodoroSession.state == "pending",
+            PomodoroSession.created_at >= today_start,
+        )
+    )
+    pending = list(result.scalars().all())
+    if pending:
+        upcoming = min(pending, key=lambda session: (session.created_at, session.id))
+    else:
+        settings = await settings_service.get_settings(db)
+        upcoming = (await _add_planned(db, settings, 1, request.task_id))[0]
+
+    try:
+        result = await db.execute(
+            update(PomodoroSession)
+            .where(PomodoroSession.id == upcoming.id, PomodoroSession.state == "pending")
+            .values(state="active", started_at=now)
+            .execution_options(synchronize_session=False)
+        )
+    except IntegrityError:
+        # A concurrent advance activated a session first (ix_pomodoro_sessions_one_active)
+        await db.rollback()
+        raise ConflictException(_ALREADY_ACTIVE)
+    if result.rowcount != 1:
+        await db.rollback()
+        raise ConflictException("The next session was already started")
+    await sync_service.record_change(db, sync_service.POMODORO_SESSION, upcoming.id)
+
+    await db.commit()
+    await db.refresh(upcoming)
+    if completed:
+        await db.refresh(completed)
+    return completed, upcoming
+
+
+async def active_session_ids(conn: AsyncConnection) -> List[int]:
+    """Ids of every active session, newest first.
+
+    A database from before the one-active index may hold several, which the
+    index cannot be created over; the next session started cancels the rest.
+    """
+    result = await conn.execute(text(
+        "SELECT id FROM pomodoro_sessions WHERE state = 'active' ORDER BY created_at DESC, id DESC"
+    ))
+    return [row.id for row in result.all()]
+
+
 async def get_stats_today(db: AsyncSession) -> PomodoroStatsResponse:
     """Get pomodoro statistics for today."""
     today_start = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
@@ -86,3 +327,18 @@ async def get_stats_today(db: AsyncSession) -> PomodoroStatsResponse:
         completed_today=completed_today,
         total_focus_time_minutes=total_focus_time
     )
+
+
+async def get_stats_history(db: AsyncSession, days: int = 30) -> PomodoroHistoryResponse:
+    """Get completed focus sessions per day for the last ``days`` days.
+
+    Includes archived history.
+    """
+    today = datetime.utcnow().date()
+    start = today - timedelta(days=days - 1)
+    totals = await retention_service.get_daily_focus_history(db, start, today + timedelta(days=1))
+
+    return PomodoroHistoryResponse(days=[
+        PomodoroHistoryDay(day=day, completed=completed, focus_minutes=minutes)
+        for day, (completed, minutes) in totals.items()
+    ])
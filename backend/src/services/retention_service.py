@@ -0,0 +1,331 @@
+"""Pomodoro session archival and retention.
+
+Finished sessions older than the hot window are moved out of
+``pomodoro_sessions`` into monthly archive tables. Archive months older than
+the retention window are rolled up into ``pomodoro_daily_stats`` and dropped.
+The hot table stays small, and the history stays correct because it sums
+hot rows, archive rows and rollups. Archived sessions leave delta sync like
+deleted rows: their change log entries become tombstones.
+
+Sessions move in batches of ``ARCHIVE_BATCH_SIZE``, each in its own short
+transaction. A long run never holds the database for long, which matters most
+with the in-memory database, where the job and every request share one
+connection.
+
+On PostgreSQL the archive is one table range-partitioned by month on
+``created_at``, so old months are dropped whole. On SQLite every month is a
+separate ``pomodoro_sessions_archive_YYYY_MM`` table.
+"""
+import os
+import re
+from datetime import date, datetime
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import select, delete, func, text, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from pydantic import BaseModel
+
+from src.database import is_sqlite
+from src.models.pomodoro import PomodoroSession, PomodoroDailyStat
+from src.services import sync_service
+from src.utils import logger
+
+HOT_MONTHS = int(os.getenv("POMODORO_HOT_MONTHS", "3"))
+RETENTION_MONTHS = int(os.getenv("POMODORO_RETENTION_MONTHS", "12"))
+
+ARCHIVE_TABLE = "pomodoro_sessions_archive"
+ARCHIVE_BATCH_SIZE = 500
+FINISHED_STATES = ("completed", "cancelled")
+
+_COLUMNS = (
+    "id, task_id, session_type, duration, state, started_at, completed_at, "
+    "paused_duration_ms, created_at, updated_at"
+)
+_ARCHIVE_NAME_RE = re.compile(rf"^{ARCHIVE_TABLE}_(\d{{4}})_(\d{{2}})$")
+
+
+class RetentionReport(BaseModel):
+    """Summary of a maintenance run."""
+    archived_sessions: int = 0
+    archived_months: List[str] = []
+    compacted_months: List[str] = []
+    dry_run: bool = False
+
+
+def _month_start(day: date, months_back: int = 0) -> date:
+    """First day of the month ``months_back`` months before ``day``'s month."""
+    index = day.year * 12 + day.month - 1 - months_back
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _next_month(month: date) -> date:
+    """First day of the following month."""
+    return _month_start(month, -1)
+
+
+def _as_datetime(day: date) -> datetime:
+    """Midnight at the start of ``day``, for comparisons against timestamp columns."""
+    return datetime.combine(day, datetime.min.time())
+
+
+def _archive_name(month: date) -> str:
+    return f"{ARCHIVE_TABLE}_{month.year:04d}_{month.month:02d}"
+
+
+async def _ensure_archive(db: AsyncSession, month: date) -> str:
+    """Create the archive table (SQLite) or partition (PostgreSQL) for a month."""
+    name = _archive_name(month)
+    if is_sqlite:
+        await db.execute(text(
+            f"CREATE TABLE IF NOT EXISTS {name} ("
+            "id INTEGER PRIMARY KEY, task_id INTEGER, session_type VARCHAR(20) NOT NULL, "
+            "duration INTEGER NOT NULL, state VARCHAR(20) NOT NULL, started_at DATETIME, "
+            "completed_at DATETIME, paused_duration_ms BIGINT NOT NULL DEFAULT 0, "
+            "created_at DATETIME NOT NULL, updated_at DATETIME)"
+        ))
+        await db.execute(text(f"CREATE INDEX IF NOT EXISTS ix_{name}_task_id ON {name} (task_id)"))
+    else:
+        await db.execute(text(
+            f"CREATE TABLE IF NOT EXISTS {ARCHIVE_TABLE} ("
+            "id INTEGER NOT NULL, task_id INTEGER, session_type VARCHAR(20) NOT NULL, "
+            "duration INTEGER NOT NULL, state VARCHAR(20) NOT NULL, started_at TIMESTAMPTZ, "
+            "completed_at TIMESTAMPTZ, paused_duration_ms BIGINT NOT NULL DEFAULT 0, "
+            "created_at TIMESTAMPTZ NOT NULL, updated_at TIMESTAMPTZ, "
+            "PRIMARY KEY (id, created_at)) PARTITION BY RANGE (created_at)"
+        ))
+        await db.execute(text(
+            f"CREATE INDEX IF NOT EXISTS ix_{ARCHIVE_TABLE}_task_id ON {ARCHIVE_TABLE} (task_id)"
+        ))
+        await db.execute(text(
+            f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {ARCHIVE_TABLE} "
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{_next_month(month).isoformat()}')"
+        ))
+    return name
+
+
+async def list_archive_months(db: AsyncSession) -> List[date]:
+    """List months that currently have an archive table or partition, oldest first."""
+    if is_sqlite:
+        result = await db.execute(text(
+            "SELECT name FROM sqlite_master WHERE type = 'table' AND name LIKE :pattern"
+        ), {"pattern": f"{ARCHIVE_TABLE}_%"})
+    else:
+        result = await db.execute(text(
+            "SELECT c.relname FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid "
+            "JOIN pg_class p ON p.oid = i.inhparent "
+            "WHERE p.relname = :parent"
+        ), {"parent": ARCHIVE_TABLE})
+
+    months = []
+    for (name,) in result.all():
+        match = _ARCHIVE_NAME_RE.match(name)
+        if match:
+            months.append(date(int(match.group(1)), int(match.group(2)), 1))
+    return sorted(months)
+
+
+async def archive_sessions(
+    db: AsyncSession,
+    hot_months: int = HOT_MONTHS,
+    today: Optional[date] = None,
+    dry_run: bool = False,
+) -> Tuple[int, List[str]]:
+    """Move finished sessions created before the hot window into monthly archives.
+
+    Commits after every batch, so an interrupted run leaves whole batches archived.
+    """
+    cutoff = _month_start(today or datetime.utcnow().date(), hot_months)
+    finished_before_cutoff = (
+        PomodoroSession.state.in_(FINISHED_STATES),
+        PomodoroSession.created_at < _as_datetime(cutoff),
+    )
+
+    result = await db.execute(
+        select(func.min(PomodoroSession.created_at)).where(*finished_before_cutoff)
+    )
+    oldest = result.scalar()
+    if oldest is None:
+        return 0, []
+
+    moved = 0
+    months = []
+    month = _month_start(oldest.date() if isinstance(oldest, datetime) else oldest)
+    while month < cutoff:
+        end = _next_month(month)
+        result = await db.execute(
+            select(PomodoroSession.id).where(
+                *finished_before_cutoff,
+                PomodoroSession.created_at >= _as_datetime(month),
+                PomodoroSession.created_at < _as_datetime(end),
+            )
+        )
+        ids = list(result.scalars().all())
+
+        if ids and not dry_run:
+            name = await _ensure_archive(db, month)
+            target = ARCHIVE_TABLE if not is_sqlite else name
+            for chunk_start in range(0, len(ids), ARCHIVE_BATCH_SIZE):
+                chunk = ids[chunk_start:chunk_start + ARCHIVE_BATCH_SIZE]
+                id_list = ", ".join(str(session_id) for session_id in chunk)
+                await db.execute(text(
+                    f"INSERT INTO {target} ({_COLUMNS}) "
+                    f"SELECT {_COLUMNS} FROM pomodoro_sessions WHERE id IN ({id_list})"
+                ))
+                await db.execute(delete(PomodoroSession).where(PomodoroSession.id.in_(chunk)))
+                # Clients that already pulled these sessions drop them
+                for session_id in chunk:
+                    await sync_service.record_change(
+                        db, sync_service.POMODORO_SESSION, session_id, deleted=True
+                    )
+                await db.commit()
+
+        if ids:
+            moved += len(ids)
+            months.append(month.strftime("%Y-%m"))
+            logger.info("Archived %d pomodoro sessions from %s", len(ids), month.strftime("%Y-%m"))
+        month = end
+
+    return moved, months
+
+
+async def compact_archives(
+    db: AsyncSession,
+    retention_months: int = RETENTION_MONTHS,
+    today: Optional[date] = None,
+    dry_run: bool = False,
+) -> List[str]:
+    """Roll archive months older than the retention window into daily stats and drop them."""
+    cutoff = _month_start(today or datetime.utcnow().date(), retention_months)
+    compacted = []
+
+    for month in await list_archive_months(db):
+        if month >= cutoff:
+            break
+        compacted.append(month.strftime("%Y-%m"))
+        if dry_run:
+            continue
+
+        name = _archive_name(month)
+        await db.execute(text(
+            "INSERT INTO pomodoro_daily_stats "
+            "(day, task_id, session_type, state, session_count, total_minutes, paused_duration_ms) "
+            "SELECT date(coalesce(completed_at, created_at)), task_id, session_type, state, "
+            "count(*), coalesce(sum(duration), 0), coalesce(sum(paused_duration_ms), 0) "
+            f"FROM {name} "
+            "GROUP BY date(coalesce(completed_at, created_at)), task_id, session_type, state"
+        ))
+        if not is_sqlite:
+            await db.execute(text(f"ALTER TABLE {ARCHIVE_TABLE} DETACH PARTITION {name}"))
+        await db.execute(text(f"DROP TABLE {name}"))
+        await db.commit()
+        logger.info("Compacted pomodoro archive %s into daily stats", name)
+
+    return compacted
+
+
+async def run_retention(
+    db: AsyncSession,
+    hot_months: int = HOT_MONTHS,
+    retention_months: int = RETENTION_MONTHS,
+    today: Optional[date] = None,
+    dry_run: bool = False,
+) -> RetentionReport:
+    """Archive old finished sessions, then compact expired archive months."""
+    moved, archived_months = await archive_sessions(db, hot_months, today, dry_run)
+    compacted_months = await compact_archives(db, max(retention_months, hot_months), today, dry_run)
+    return RetentionReport(
+        archived_sessions=moved,
+        archived_months=archived_months,
+        compacted_months=compacted_months,
+        dry_run=dry_run,
+    )
+
+
+async def raw_session_tables(db: AsyncSession, since: Optional[date] = None) -> List[str]:
+    """Tables holding raw (not rolled up) sessions: the live table plus archives.
+
+    With ``since``, SQLite archive months that end before it are skipped. Sessions
+    are archived by created_at, which can precede completed_at by a month, so one
+    extra month is kept.
+    """
+    tables = ["pomodoro_sessions"]
+    months = await list_archive_months(db)
+    if not months:
+        return tables
+    if not is_sqlite:
+        return tables + [ARCHIVE_TABLE]
+
+    lower = _month_start(since, 1) if since else date.min
+    return tables + [_archive_name(month) for month in months if month >= lower]
+
+
+async def detach_task(db: AsyncSession, task_id: int) -> None:
+    """Unlink a deleted task from archived sessions and rollups, without committing.
+
+    SQLite can reuse the id of a deleted task, and a new task must not be
+    credited with the old one's history.
+    """
+    for table in (await raw_session_tables(db))[1:]:
+        await db.execute(
+            text(f"UPDATE {table} SET task_id = NULL WHERE task_id = :task_id"),
+            {"task_id": task_id},
+        )
+    await db.execute(
+        update(PomodoroDailyStat)
+        .where(PomodoroDailyStat.task_id == task_id)
+        .values(task_id=None)
+    )
+
+
+async def get_daily_focus_history(
+    db: AsyncSession, start: date, end: date
+) -> Dict[date, Tuple[int, int]]:
+    """Completed focus sessions and minutes per day in ``[start, end)``.
+
+    Sums the hot table, archive months and compacted rollups, so totals stay
+    the same no matter where a session currently lives.
+    """
+    totals: Dict[date, List[int]] = {}
+
+    def add(day, count, minutes):
+        if isinstance(day, str):
+            day = date.fromisoformat(day)
+        elif isinstance(day, datetime):
+            day = day.date()
+        bucket = totals.setdefault(day, [0, 0])
+        bucket[0] += int(count or 0)
+        bucket[1] += int(minutes or 0)
+
+    start_ts = _as_datetime(start)
+    end_ts = _as_datetime(end)
+    focus_sql = (
+        "SELECT date(completed_at) AS day, count(*), sum(duration) FROM {table} "
+        "WHERE session_type = 'focus' AND state = 'completed' "
+        "AND completed_at >= :start AND completed_at < :end GROUP BY date(completed_at)"
+    )
+    params = {"start": start_ts, "end": end_ts}
+
+    for table in await raw_session_tables(db, since=start):
+        result = await db.execute(text(focus_sql.format(table=table)), params)
+        for row in result.all():
+            add(*row)
+
+    result = await db.execute(
+        select(
+            PomodoroDailyStat.day,
+            func.sum(PomodoroDailyStat.session_count),
+            func.sum(PomodoroDailyStat.total_minutes),
+        )
+        .where(
+            PomodoroDailyStat.session_type == "focus",
+            PomodoroDailyStat.state == "completed",
+            PomodoroDailyStat.day >= start,
+            PomodoroDailyStat.day < end,
+        )
+        .group_by(PomodoroDailyStat.day)
+    )
+    for row in result.all():
+        add(*row)
+
+    return {day: (count, minutes) for day, (count, minutes) in sorted(totals.items())}
@@ -0,0 +1,162 @@
+"""Full-text search over task titles and descriptions.
+
+SQLite keeps a separate FTS5 table (``tasks_fts``, rowid = task id) that the
+task service updates on every write. PostgreSQL uses a generated ``tsvector``
+column on ``tasks`` with a GIN index, which the database keeps in sync itself.
+"""
+import re
+from typing import List
+
+from sqlalchemy import func, select, text, or_
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+from sqlalchemy.sql import column, table
+
+from src.database import is_sqlite
+from src.models.task import Task
+from src.schemas.task import TaskSearchResponse
+from src.utils import logger
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+# Lightweight handle on the FTS5 virtual table (not part of Base.metadata)
+tasks_fts = table(
+    "tasks_fts", column("rowid"), column("title"), column("description"), column("rank")
+)
+
+# Flipped off at startup if the SQLite build lacks FTS5; search then falls back to LIKE
+fts_available = True
+
+
+async def setup_search_index(conn: AsyncConnection) -> None:
+    """Create the search index structures and backfill existing tasks."""
+    global fts_available
+
+    if is_sqlite:
+        try:
+            await conn.execute(text(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS tasks_fts "
+                "USING fts5(title, description, tokenize='unicode61 remove_diacritics 2')"
+            ))
+        except OperationalError:
+            logger.warning("SQLite FTS5 unavailable, task search falls back to LIKE")
+            fts_available = False
+            return
+
+        await conn.execute(text(
+            "INSERT INTO tasks_fts(rowid, title, description) "
+            "SELECT id, title, coalesce(description, '') FROM tasks "
+            "WHERE id NOT IN (SELECT rowid FROM tasks_fts)"
+        ))
+    else:
+        await conn.execute(text(
+            "ALTER TABLE tasks ADD COLUMN IF NOT EXISTS search_vector tsvector "
+            "GENERATED ALWAYS AS ("
+            "setweight(to_tsvector('simple', coalesce(title, '')), 'A') || "
+            "setweight(to_tsvector('simple', coalesce(description, '')), 'B')"
+            ") STORED"
+        ))
+        await conn.execute(text(
+            "CREATE INDEX IF NOT EXISTS ix_tasks_search_vector ON tasks USING GIN (search_vector)"
+        ))
+
+
+async def index_task(db: AsyncSession, task: Task) -> None:
+    """Insert or refresh a task in the FTS table. No-op on PostgreSQL."""
+    if not (is_sqlite and fts_available):
+        return
+
+    await remove_task(db, task.id)
+    await db.execute(
+        text("INSERT INTO tasks_fts(rowid, title, description) VALUES (:id, :title, :description)"),
+        {"id": task.id, "title": task.title, "description": task.description or ""},
+    )
+
+
+async def remove_task(db: AsyncSession, task_id: int) -> None:
+    """Drop a task from the FTS table. No-op on PostgreSQL."""
+    if not (is_sqlite and fts_available):
+        return
+
+    await db.execute(text("DELETE FROM tasks_fts WHERE rowid = :id"), {"id": task_id})
+
+
+async def rebuild_index(db: AsyncSession) -> int:
+    """Rebuild the search index from the tasks table and return the number of tasks indexed."""
+    if is_sqlite and fts_available:
+        await db.execute(text("DELETE FROM tasks_fts"))
+        await db.execute(text(
+            "INSERT INTO tasks_fts(rowid, title, description) "
+            "SELECT id, title, coalesce(description, '') FROM tasks"
+        ))
+    elif not is_sqlite:
+        await db.execute(text("REINDEX INDEX ix_tasks_search_vector"))
+    await db.commit()
+
+    result = await db.execute(select(func.count()).select_from(Task))
+    return result.scalar() or 0
+
+
+def _query_terms(query: str) -> List[str]:
+    """Split free text into plain word terms, discarding search operators."""
+    return _WORD_RE.findall(query.lower())
+
+
+async def search_tasks(
+    db: AsyncSession,
+    query: str,
+    limit: int = 20,
+    offset: int = 0,
+    include_completed: bool = True,
+) -> TaskSearchResponse:
+    """Search tasks by title and description, best matches first.
+
+    Every word must match (as a prefix) in the title or description.
+    """
+    terms = _query_terms(query)
+    if not terms:
+        return TaskSearchResponse(query=query, items=[], limit=limit, offset=offset, has_more=False)
+
+    if is_sqlite and fts_available:
+        match = " ".join(f'"{term}"*' for term in terms)
+        stmt = (
+            select(Task)
+            .join(tasks_fts, tasks_fts.c.rowid == Task.id)
+            .where(text("tasks_fts MATCH :match").bindparams(match=match))
+            .order_by(tasks_fts.c.rank, Task.id)
+        )
+    elif is_sqlite:
+        stmt = select(Task).order_by(Task.order, Task.id)
+        for term in terms:
+            pattern = f"%{term}%"
+            stmt = stmt.where(or_(Task.title.ilike(pattern), Task.description.ilike(pattern)))
+    else:
+        tsquery = " & ".join(f"{term}:*" for term in terms)
+        stmt = (
+            select(Task)
+            .where(
+                text("tasks.search_vector @@ to_tsquery('simple', :tsquery)")
+                .bindparams(tsquery=tsquery)
+            )
+            .order_by(
+                text("ts_rank_cd(tasks.search_vector, to_tsquery('simple', :rank_query)) DESC")
+                .bindparams(rank_query=tsquery),
+                Task.id,
+            )
+        )
+
+    if not include_completed:
+        stmt = stmt.where(Task.completed.is_(False))
+
+    # Fetch one extra row to know whether another page exists without a COUNT(*)
+    result = await db.execute(stmt.limit(limit + 1).offset(offset))
+    items: List[Task] = list(result.scalars().all())
+    has_more = len(items) > limit
+
+    return TaskSearchResponse(
+        query=query,
+        items=items[:limit],
+        limit=limit,
+        offset=offset,
+        has_more=has_more,
+    )
@@ -1,5 +1,5 @@
 """Settings service for managing user preferences."""
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
 from sqlalchemy import select
 from src.models.settings import UserSettings
 from src.schemas.settings import SettingsUpdate
@@ -20,6 +20,13 @@ async def get_settings(db: AsyncSession) -> UserSettings:
     return settings
 
 
+async def ensure_default_settings(conn: AsyncConnection) -> None:
+    """Create the settings singleton with defaults if it does not exist yet."""
+    result = await conn.execute(select(UserSettings.id).where(UserSettings.id == 1))
+    if result.first() is None:
+        await conn.execute(UserSettings.__table__.insert().values(id=1))
+
+
 async def update_settings(db: AsyncSession, settings_update: SettingsUpdate) -> UserSettings:
     """Update user settings."""
     settings = await get_settings(db)
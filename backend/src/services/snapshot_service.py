@@ -0,0 +1,139 @@
+"""Disk snapshots of the in-memory SQLite database.
+
+With ``DATABASE_URL=sqlite+aiosqlite:///:memory:`` all data lives in the one
+connection the engine keeps open. When ``DATABASE_SNAPSHOT_PATH`` is set,
+``init_db`` restores the last snapshot into it at startup, and the
+``SnapshotWriter`` copies it back to disk every
+``DATABASE_SNAPSHOT_INTERVAL_SECONDS`` (0: only on shutdown). Both directions
+use the SQLite online backup API, which copies database pages directly
+instead of replaying SQL.
+
+Snapshots are written to a temporary file and renamed, so a crash mid-write
+leaves the previous snapshot intact. Anything written after the last
+snapshot is lost when the process stops without a clean shutdown.
+"""
+import asyncio
+import os
+import sqlite3
+import time
+from pathlib import Path
+from typing import Optional
+
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from src.database import engine, is_memory_db
+from src.utils import logger
+
+SNAPSHOT_PATH = os.getenv("DATABASE_SNAPSHOT_PATH")
+SNAPSHOT_INTERVAL_SECONDS = float(os.getenv("DATABASE_SNAPSHOT_INTERVAL_SECONDS", "0"))
+
+# Restore only into the fresh database, never over data written since startup
+_restored = False
+
+
+class SnapshotReport(BaseModel):
+    """Result of saving or restoring a snapshot."""
+    path: str
+    bytes: int
+    seconds: float
+
+
+async def _driver_connection(conn: AsyncConnection):
+    """The aiosqlite connection behind a checked-out engine connection."""
+    raw = await conn.get_raw_connection()
+    return raw.driver_connection
+
+
+def _report(path: str, started: float) -> SnapshotReport:
+    """Size of the database at ``path`` and the time since ``started``."""
+    return SnapshotReport(
+        path=path, bytes=os.path.getsize(path), seconds=round(time.perf_counter() - started, 3)
+    )
+
+
+async def restore_snapshot(path: Optional[str] = SNAPSHOT_PATH) -> Optional[SnapshotReport]:
+    """Copy the snapshot at ``path`` into the in-memory database, once per process."""
+    global _restored
+    if not (is_memory_db and path) or _restored:
+        return None
+    _restored = True
+    if not os.path.exists(path):
+        logger.info("No database snapshot at %s, starting empty", path)
+        return None
+
+    import aiosqlite
+
+    started = time.perf_counter()
+    async with engine.connect() as conn:
+        target = await _driver_connection(conn)
+        async with aiosqlite.connect(path) as source:
+            await source.backup(target)
+    report = _report(path, started)
+    logger.info(
+        "Restored database snapshot from %s (%d bytes) in %.3fs", path, report.bytes, report.seconds
+    )
+    return report
+
+
+async def save_snapshot(path: Optional[str] = SNAPSHOT_PATH) -> Optional[SnapshotReport]:
+    """Write the in-memory database to ``path``, replacing the previous snapshot atomically."""
+    if not (is_memory_db and path):
+        return None
+
+    started = time.perf_counter()
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    temporary = f"{path}.tmp"
+    target = sqlite3.connect(temporary, check_same_thread=False)
+    try:
+        # Holding the engine's only connection keeps writers out for the duration
+        async with engine.connect() as conn:
+            source = await _driver_connection(conn)
+            await source.backup(target)
+    finally:
+        target.close()
+    os.replace(temporary, path)
+
+    report = _report(path, started)
+    logger.info(
+        "Saved database snapshot to %s (%d bytes) in %.3fs", path, report.bytes, report.seconds
+    )
+    return report
+
+
+class SnapshotWriter:
+    """Saves snapshots periodically and once more on shutdown."""
+
+    def __init__(self, interval_seconds: float = SNAPSHOT_INTERVAL_SECONDS):
+        self.interval_seconds = interval_seconds
+        self._loop_task: Optional[asyncio.Task] = None
+
+    @property
+    def enabled(self) -> bool:
+        return is_memory_db and bool(SNAPSHOT_PATH)
+
+    def start(self) -> None:
+        if self.enabled and self.interval_seconds > 0 and self._loop_task is None:
+            self._loop_task = asyncio.create_task(self._loop())
+
+    async def stop(self) -> None:
+        """Stop the periodic writer and save a final snapshot."""
+        if self._loop_task is not None:
+            self._loop_task.cancel()
+            await asyncio.gather(self._loop_task, return_exceptions=True)
+            self._loop_task = None
+        if self.enabled:
+            await save_snapshot()
+
+    async def _loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval_seconds)
+            try:
+                await save_snapshot()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Database snapshot failed")
+
+
+writer = SnapshotWriter()
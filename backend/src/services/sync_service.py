@@ -0,0 +1,220 @@
+"""Delta sync service for offline-capable clients.
+
+Every write to ``tasks`` and ``pomodoro_sessions`` records a row in
+``change_log``. Only the latest entry per row is kept, so a client that
+passes its last ``cursor`` receives each changed or deleted row once.
+
+A cursor is only safe if entry ids become visible in id order. PostgreSQL
+hands out sequence values before commit, so concurrent transactions could
+commit out of order and a client would skip the one that committed last.
+To prevent that, changes are buffered on the session and written in a
+``before_commit`` hook while holding a transaction-level advisory lock:
+the next writer only draws ids after the previous one has committed.
+SQLite allows a single writer at a time, so its ids are already in commit
+order.
+"""
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+from sqlalchemy import event, select, delete, func, insert, text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+from pydantic import ValidationError
+from src.database import is_sqlite
+from src.models.sync import ChangeLogEntry
+from src.models.task import Task
+from src.models.pomodoro import PomodoroSession
+from src.schemas.sync import (
+    SyncDeleted,
+    SyncOperation,
+    SyncOperationResult,
+    SyncPushRequest,
+    SyncPushResponse,
+    SyncResponse,
+)
+from src.utils.error_handling import AppException
+from typing import Dict, List, Tuple
+
+TASK = "task"
+POMODORO_SESSION = "pomodoro_session"
+
+_ENTITY_TABLES = {TASK: "tasks", POMODORO_SESSION: "pomodoro_sessions"}
+
+# Session.info key for changes waiting to be written at commit
+_PENDING = "sync_pending_changes"
+# pg_advisory_xact_lock key serializing change log writers (arbitrary, app-wide)
+_CHANGE_LOG_LOCK = 7_345_021
+
+
+async def record_change(
+    db: AsyncSession, entity: str, entity_id: int, deleted: bool = False
+) -> None:
+    """Record that a row changed, replacing any older entry for it.
+
+    The entry is written when the session commits, in the same transaction
+    as the change itself, and is discarded on rollback.
+    """
+    # Make sure a transaction is open, so a rollback also clears the buffer
+    await db.connection()
+    pending: Dict[Tuple[str, int], bool] = db.info.setdefault(_PENDING, {})
+    pending[(entity, entity_id)] = deleted
+
+
+@event.listens_for(Session, "before_commit")
+def _write_pending_changes(session: Session) -> None:
+    """Write buffered changes right before commit, holding the change log lock on PostgreSQL."""
+    pending = session.info.pop(_PENDING, None)
+    if not pending:
+        return
+
+    if not is_sqlite:
+        session.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": _CHANGE_LOG_LOCK})
+    by_entity: Dict[str, List[int]] = {}
+    for entity, entity_id in pending:
+        by_entity.setdefault(entity, []).append(entity_id)
+    for entity, ids in by_entity.items():
+        for start in range(0, len(ids), 500):
+            session.execute(
+                delete(ChangeLogEntry).where(
+                    ChangeLogEntry.entity == entity,
+                    ChangeLogEntry.entity_id.in_(ids[start:start + 500]),
+                )
+            )
+    session.execute(
+        insert(ChangeLogEntry),
+        [{"entity": entity, "entity_id": entity_id, "deleted": deleted}
+         for (entity, entity_id), deleted in pending.items()],
+    )
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending_changes(session: Session) -> None:
+    session.info.pop(_PENDING, None)
+
+
+async def backfill_change_log(conn: AsyncConnection) -> None:
+    """Add entries for rows that predate the change log so a full sync sees them."""
+    if not is_sqlite:
+        await conn.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": _CHANGE_LOG_LOCK})
+    for entity, table_name in _ENTITY_TABLES.items():
+        await conn.execute(
+            text(
+                f"INSERT INTO change_log (entity, entity_id, deleted) "
+                f"SELECT :entity, id, :deleted FROM {table_name} WHERE id NOT IN "
+                f"(SELECT entity_id FROM change_log WHERE entity = :entity) ORDER BY id"
+            ),
+            {"entity": entity, "deleted": False},
+        )
+
+
+async def get_cursor(db: AsyncSession) -> int:
+    """Get the latest sync sequence number."""
+    result = await db.execute(select(func.max(ChangeLogEntry.id)))
+    return result.scalar() or 0
+
+
+async def get_changes(db: AsyncSession, since: int = 0, limit: int = 500) -> SyncResponse:
+    """Get rows changed or deleted after the ``since`` cursor, oldest change first."""
+    result = await db.execute(
+        select(ChangeLogEntry)
+        .where(ChangeLogEntry.id > since)
+        .order_by(ChangeLogEntry.id)
+        .limit(limit + 1)
+    )
+    entries = list(result.scalars().all())
+    has_more = len(entries) > limit
+    entries = entries[:limit]
+
+    changed: Dict[str, List[int]] = {TASK: [], POMODORO_SESSION: []}
+    deleted = SyncDeleted()
+    for entry in entries:
+        if entry.deleted:
+            if entry.entity == TASK:
+                deleted.tasks.append(entry.entity_id)
+            else:
+                deleted.pomodoro_sessions.append(entry.entity_id)
+        else:
+            changed[entry.entity].append(entry.entity_id)
+
+    tasks: List[Task] = []
+    if changed[TASK]:
+        result = await db.execute(select(Task).where(Task.id.in_(changed[TASK])))
+        tasks = list(result.scalars().all())
+
+    sessions: List[PomodoroSession] = []
+    if changed[POMODORO_SESSION]:
+        result = await db.execute(
+            select(PomodoroSession).where(PomodoroSession.id.in_(changed[POMODORO_SESSION]))
+        )
+        sessions = list(result.scalars().all())
+
+    return SyncResponse(
+        cursor=entries[-1].id if entries else since,
+        has_more=has_more,
+        tasks=tasks,
+        pomodoro_sessions=sessions,
+        deleted=deleted,
+    )
+
+
+async def _apply_operation(db: AsyncSession, op: SyncOperation) -> SyncOperationResult:
+    """Apply one pushed operation through the regular service write paths."""
+    from src.schemas.task import TaskCreate, TaskUpdate
+    from src.schemas.pomodoro import PomodoroSessionCreate, PomodoroSessionUpdate
+    from src.services import task_service, pomodoro_service
+
+    outcome = SyncOperationResult(
+        client_ref=op.client_ref, entity=op.entity, action=op.action, status="ok"
+    )
+
+    if op.action != "create" and op.id is None:
+        outcome.status = "invalid"
+        outcome.detail = "id is required for update and delete"
+        return outcome
+
+    try:
+        if op.entity == TASK:
+            if op.action == "create":
+                row = await task_service.create_task(db, TaskCreate(**op.data))
+            elif op.action == "update":
+                row = await task_service.update_task(db, op.id, TaskUpdate(**op.data))
+            else:
+                row = op.id if await task_service.delete_task(db, op.id) else None
+        else:
+            if op.action == "create":
+                row = await pomodoro_service.create_session(db, PomodoroSessionCreate(**op.data))
+            elif op.action == "update":
+                row = await pomodoro_service.update_session(
+                    db, op.id, PomodoroSessionUpdate(**op.data)
+                )
+            else:
+                outcome.status = "invalid"
+                outcome.detail = "pomodoro sessions cannot be deleted"
+                return outcome
+    except ValidationError as exc:
+        outcome.status = "invalid"
+        outcome.detail = str(exc)
+        return outcome
+    except (AppException, SQLAlchemyError) as exc:
+        # Every service write commits on its own, so rolling back the open
+        # transaction undoes exactly this operation and keeps the earlier ones
+        await db.rollback()
+        if isinstance(exc, AppException):
+            outcome.status = "conflict" if exc.status_code == 409 else "invalid"
+            outcome.detail = str(exc.detail)
+        else:
+            outcome.status = "error"
+            outcome.detail = f"{type(exc).__name__}: {str(exc).splitlines()[0][:500]}"
+        outcome.id = op.id
+        return outcome
+
+    if row is None:
+        outcome.status = "not_found"
+        outcome.id = op.id
+    else:
+        outcome.id = row if isinstance(row, int) else row.id
+    return outcome
+
+
+async def push_changes(db: AsyncSession, batch: SyncPushRequest) -> SyncPushResponse:
+    """Apply a batch of queued client writes in order."""
+    results = [await _apply_operation(db, op) for op in batch.operations]
+    return SyncPushResponse(results=results, cursor=await get_cursor(db))
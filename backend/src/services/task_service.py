@@ -1,13 +1,19 @@
 """Task service for managing tasks."""
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, desc
+from sqlalchemy import select, desc, update
 from src.models.task import Task
+from src.models.pomodoro import PomodoroSession
 from src.schemas.task import TaskCreate, TaskUpdate
+from src.services import retention_service, search_service, sync_service
 from typing import List, Optional
 
 
-async def create_task(db: AsyncSession, task_data: TaskCreate) -> Task:
-    """Create a new task."""
+async def create_task(db: AsyncSession, task_data: TaskCreate, commit: bool = True) -> Task:
+    """Create a new task.
+
+    With ``commit=False`` the task is only flushed, for callers that commit it
+    together with their own writes.
+    """
     # Get the highest order value
     result = await db.execute(select(Task).order_by(desc(Task.order)).limit(1))
     last_task = result.scalar_one_or_none()
@@ -15,7 +21,11 @@ async def create_task(db: AsyncSession, task_data: TaskCreate) -> Task:
 
     task = Task(**task_data.model_dump(), order=next_order)
     db.add(task)
-    await db.commit()
+    await db.flush()
+    await search_service.index_task(db, task)
+    await sync_service.record_change(db, sync_service.TASK, task.id)
+    if commit:
+        await db.commit()
     await db.refresh(task)
     return task
 
@@ -46,6 +56,10 @@ async def update_task(db: AsyncSession, task_id: int, task_update: TaskUpdate) -
     for field, value in update_data.items():
         setattr(task, field, value)
 
+    if "title" in update_data or "description" in update_data:
+        await search_service.index_task(db, task)
+    await sync_service.record_change(db, sync_service.TASK, task.id)
+
     await db.commit()
     await db.refresh(task)
     return task
@@ -57,6 +71,21 @@ async def delete_task(db: AsyncSession, task_id: int) -> bool:
     if not task:
         return False
 
+    # Detach linked sessions explicitly (SET NULL is not enforced on SQLite) and sync them
+    result = await db.execute(select(PomodoroSession.id).where(PomodoroSession.task_id == task_id))
+    session_ids = list(result.scalars().all())
+    if session_ids:
+        await db.execute(
+            update(PomodoroSession)
+            .where(PomodoroSession.id.in_(session_ids))
+            .values(task_id=None)
+        )
+        for session_id in session_ids:
+            await sync_service.record_change(db, sync_service.POMODORO_SESSION, session_id)
+    await retention_service.detach_task(db, task_id)
+
     await db.delete(task)
+    await search_service.remove_task(db, task_id)
+    await sync_service.record_change(db, sync_service.TASK, task_id, deleted=True)
     await db.commit()
     return True
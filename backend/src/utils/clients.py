@@ -0,0 +1,25 @@
+"""Client identification helpers."""
+from starlette.types import Scope
+
+
+def client_address(scope: Scope) -> str:
+    """The client's address.
+
+    Behind a proxy listed in ``FORWARDED_ALLOW_IPS`` uvicorn has already
+    replaced the peer with the ``X-Forwarded-For`` address.
+    """
+    client = scope.get("client")
+    return client[0] if client else ""
+
+
+def scope_client_key(scope: Scope) -> str:
+    """Identify a client as its address, narrowed by its ``X-Client-Id`` header if sent.
+
+    The header is chosen by the client, so it only tells apart clients that
+    share an address (``<address>/<client id>``) and never replaces the address.
+    """
+    address = client_address(scope)
+    for name, value in scope.get("headers", []):
+        if name == b"x-client-id" and value:
+            return f"{address}/{value.decode('latin-1')[:64]}"
+    return address
@@ -1,20 +1,14 @@
 """Error handling and logging utilities."""
 import logging
-import sys
 from datetime import datetime
 from typing import Any, Dict
 from fastapi import HTTPException, Request, status
 from fastapi.responses import JSONResponse
+from src.utils.logging_config import configure_logging
 
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-    handlers=[
-        logging.StreamHandler(sys.stdout),
-    ],
-)
+# Configure logging (queued, written by a background thread)
+configure_logging()
 
 logger = logging.getLogger(__name__)
 
@@ -45,9 +39,16 @@ class ValidationException(AppException):
         super().__init__(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=detail)
 
 
+class ConflictException(AppException):
+    """Request conflicts with the current state of a resource."""
+
+    def __init__(self, detail: str = "Conflict"):
+        super().__init__(status_code=status.HTTP_409_CONFLICT, detail=detail)
+
+
 async def app_exception_handler(request: Request, exc: AppException) -> JSONResponse:
     """Handle application exceptions."""
-    logger.error(f"Application error: {exc.detail}")
+    logger.error("Application error: %s", exc.detail)
     return JSONResponse(
         status_code=exc.status_code,
         content={
@@ -60,7 +61,7 @@ async def app_exception_handler(request: Request, exc: AppException) -> JSONResp
 
 async def general_exception_handler(request: Request, exc: Exception) -> JSONResponse:
     """Handle general exceptions."""
-    logger.exception(f"Unhandled exception: {str(exc)}")
+    logger.exception("Unhandled exception: %s", exc)
     return JSONResponse(
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
         content={
@@ -0,0 +1,169 @@
+"""Non-blocking logging setup.
+
+Log calls only put the record on a bounded in-memory queue. A background
+``QueueListener`` thread formats and writes them, so a slow stdout (a full
+pipe, a container log driver under pressure) never stalls the event loop.
+Records carry the current request id. High-volume INFO and DEBUG records can
+be sampled. Warnings and errors are always kept. Uvicorn's own loggers,
+including the access log, go through the same queue and formatter.
+
+Configuration (environment variables):
+    LOG_LEVEL             Root level (default: INFO)
+    LOG_FORMAT            json or text (default: json in production, text otherwise)
+    LOG_INFO_SAMPLE_RATE  Fraction of INFO/DEBUG records kept, 0-1 (default: 1)
+    LOG_QUEUE_SIZE        Records buffered before new ones are dropped (default: 10000)
+"""
+import atexit
+import copy
+import json
+import logging
+import os
+import queue
+import random
+import sys
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_FORMAT = os.getenv(
+    "LOG_FORMAT",
+    "json" if os.getenv("ENVIRONMENT", "development").lower() == "production" else "text",
+).lower()
+INFO_SAMPLE_RATE = float(os.getenv("LOG_INFO_SAMPLE_RATE", "1"))
+QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+
+# Uvicorn configures these with their own stream handlers; they propagate to root instead
+UVICORN_LOGGERS = ("uvicorn", "uvicorn.error", "uvicorn.access")
+
+TEXT_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - [%(request_id)s] %(message)s"
+
+# Set per request by RequestIdMiddleware; "-" outside a request
+request_id_var: ContextVar[str] = ContextVar("request_id", default="-")
+
+# Attributes every LogRecord has; anything else came from ``extra=`` and goes into the JSON.
+# color_message is uvicorn's ANSI-coloured duplicate of the message.
+_RECORD_ATTRS = frozenset(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {
+    "message",
+    "request_id",
+    "color_message",
+}
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line, including fields passed with ``extra=``."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(
+                timespec="milliseconds"
+            ),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "request_id": getattr(record, "request_id", "-"),
+            "pid": record.process,
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_text:
+            entry["exc_info"] = record.exc_text
+        elif record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class _SamplingQueueHandler(QueueHandler):
+    """Queue handler that samples low-level records and never blocks or raises on a full queue."""
+
+    def __init__(self, log_queue: queue.Queue, sample_rate: float) -> None:
+        super().__init__(log_queue)
+        self.sample_rate = sample_rate
+        self.dropped = 0
+        self.sampled_out = 0
+
+    def emit(self, record: logging.LogRecord) -> None:
+        if (
+            record.levelno <= logging.INFO
+            and self.sample_rate < 1
+            and random.random() >= self.sample_rate
+        ):
+            self.sampled_out += 1
+            return
+        super().emit(record)
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Runs in the caller: capture the request id and merge args into the message while
+        # they still hold the values logged. The formatter and the write run in the listener.
+        record = copy.copy(record)
+        record.request_id = request_id_var.get()
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        record.stack_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+_handler: Optional[_SamplingQueueHandler] = None
+_listener: Optional[QueueListener] = None
+
+
+def configure_logging(stream=None) -> None:
+    """Route the root and uvicorn loggers through the queue. Safe to call more than once."""
+    global _handler, _listener
+    if _listener is not None:
+        return
+
+    output = logging.StreamHandler(stream or sys.stdout)
+    if LOG_FORMAT == "json":
+        output.setFormatter(JsonFormatter())
+    else:
+        output.setFormatter(logging.Formatter(TEXT_FORMAT))
+
+    log_queue: queue.Queue = queue.Queue(QUEUE_SIZE)
+    _handler = _SamplingQueueHandler(log_queue, INFO_SAMPLE_RATE)
+    _listener = QueueListener(log_queue, output, respect_handler_level=True)
+
+    root = logging.getLogger()
+    for existing in list(root.handlers):
+        root.removeHandler(existing)
+    root.addHandler(_handler)
+    root.setLevel(LOG_LEVEL)
+
+    for name in UVICORN_LOGGERS:
+        uvicorn_logger = logging.getLogger(name)
+        for existing in list(uvicorn_logger.handlers):
+            uvicorn_logger.removeHandler(existing)
+        uvicorn_logger.propagate = True
+
+    _listener.start()
+    atexit.register(shutdown_logging)
+
+
+def shutdown_logging() -> None:
+    """Flush queued records and stop the listener thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def logging_stats() -> dict:
+    """Counters for records dropped on a full queue or removed by sampling."""
+    if _handler is None:
+        return {"queued": 0, "dropped": 0, "sampled_out": 0}
+    return {
+        "queued": _handler.queue.qsize(),
+        "dropped": _handler.dropped,
+        "sampled_out": _handler.sampled_out,
+    }
@@ -0,0 +1,56 @@
+"""Single-flight request coalescing."""
+import asyncio
+from typing import Any, Awaitable, Callable, Dict
+
+
+class _LeaderCancelled(Exception):
+    """The caller running the shared call was cancelled (say, its client disconnected)."""
+
+
+class SingleFlight:
+    """Share one in-flight call among concurrent callers with the same key.
+
+    The first caller runs the coroutine and later callers await its result
+    (or exception). If the first caller is cancelled, the others start the
+    call again. Nothing is cached once the call finishes.
+    """
+
+    def __init__(self) -> None:
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.calls = 0
+        self.shared = 0
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        future = self._inflight.get(key)
+        while future is not None:
+            self.shared += 1
+            try:
+                return await asyncio.shield(future)
+            except _LeaderCancelled:
+                # Whoever gets here first runs the call again, the rest join it
+                future = self._inflight.get(key)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        self.calls += 1
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            # Cancelling the future would cancel the callers waiting on it too
+            future.set_exception(_LeaderCancelled())
+            future.exception()
+            raise
+        except BaseException as exc:
+            future.set_exception(exc)
+            # Mark retrieved so an exception nobody else awaited is not logged
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del self._inflight[key]
+
+
+# Shared coalescer for polling endpoints
+polling = SingleFlight()
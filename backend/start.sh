@@ -19,5 +19,5 @@ echo "Current directory: $(pwd)"
 # alembic upgrade head
 
 # Start the application
-echo "Starting uvicorn server..."
-exec uvicorn src.main:app --host 0.0.0.0 --port ${PORT:-8000}
+echo "Starting uvicorn workers..."
+exec python -m src.server
@@ -0,0 +1,68 @@
+"""Shared fixtures: the app on an in-memory SQLite database, emptied between tests."""
+import asyncio
+import os
+
+# Configure before anything imports src.database
+os.environ["DATABASE_URL"] = "sqlite+aiosqlite:///:memory:"
+os.environ["ENVIRONMENT"] = "test"
+os.environ["RATE_LIMIT_PER_SECOND"] = "0"
+os.environ["JOB_RUNNER_ENABLED"] = "false"
+os.environ.pop("DATABASE_SNAPSHOT_PATH", None)
+os.environ.pop("DATABASE_READ_URL", None)
+os.environ.pop("ADMIN_TOKEN", None)
+
+import httpx  # noqa: E402
+import pytest  # noqa: E402
+from sqlalchemy import text  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def event_loop():
+    # The in-memory database lives in one pooled connection, bound to one loop
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest.fixture(scope="session")
+async def app():
+    from src.database import init_db
+    from src.main import app
+
+    await init_db()
+    return app
+
+
+@pytest.fixture(autouse=True)
+async def clean_db(app):
+    """Empty every table after each test."""
+    yield
+    from src.database import Base, engine
+    from src.services import idempotency_service, retention_service
+    from src.services.settings_service import ensure_default_settings
+
+    async with engine.begin() as conn:
+        for table in await retention_service.raw_session_tables(conn):
+            if table != "pomodoro_sessions":
+                await conn.execute(text(f"DROP TABLE {table}"))
+        for table in reversed(Base.metadata.sorted_tables):
+            await conn.execute(table.delete())
+        await conn.execute(text("DELETE FROM tasks_fts"))
+        await conn.execute(text("DELETE FROM sqlite_sequence"))
+        await ensure_default_settings(conn)
+    idempotency_service.clear_cache()
+
+
+@pytest.fixture
+async def client(app):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client
+
+
+@pytest.fixture
+async def db(app):
+    from src.database import AsyncSessionLocal
+
+    async with AsyncSessionLocal() as session:
+        yield session
@@ -0,0 +1,54 @@
+"""Compression middleware: weak content ETags shared by every encoding."""
+
+
+async def _many_tasks(client, count=30):
+    for i in range(count):
+        task = {"title": f"Task number {i}", "description": "x" * 40}
+        await client.post("/api/v1/tasks", json=task)
+
+
+async def test_encodings_share_a_weak_etag(client):
+    await _many_tasks(client)
+    gzipped = await client.get("/api/v1/tasks", headers={"Accept-Encoding": "gzip"})
+    # A conditional request gets an ETag even when it cannot be compressed
+    identity = await client.get(
+        "/api/v1/tasks", headers={"Accept-Encoding": "identity", "If-None-Match": '"other"'}
+    )
+
+    assert gzipped.headers["content-encoding"] == "gzip"
+    assert "content-encoding" not in identity.headers
+    assert gzipped.headers["etag"].startswith('W/"')
+    assert gzipped.headers["etag"] == identity.headers["etag"]
+    assert gzipped.json() == identity.json()
+
+
+async def test_if_none_match_uses_weak_comparison(client):
+    await _many_tasks(client)
+    etag = (await client.get("/api/v1/tasks")).headers["etag"]
+
+    for tag in (etag, etag[2:], f'"other", {etag}', "*"):
+        response = await client.get("/api/v1/tasks", headers={"If-None-Match": tag})
+        assert response.status_code == 304, tag
+        assert response.content == b""
+
+    stale = await client.get("/api/v1/tasks", headers={"If-None-Match": '"other"'})
+    assert stale.status_code == 200
+
+
+async def test_if_none_match_is_ignored_on_writes(client):
+    response = await client.put(
+        "/api/v1/settings",
+        json={"focus_duration": 30},
+        headers={"If-None-Match": "*", "Accept-Encoding": "gzip"},
+    )
+    assert response.status_code == 200
+    assert response.json()["focus_duration"] == 30
+
+
+async def test_bootstrap_etag_is_weak(client):
+    response = await client.get("/api/v1/bootstrap")
+    etag = response.headers["etag"]
+    assert etag.startswith('W/"')
+
+    again = await client.get("/api/v1/bootstrap", headers={"If-None-Match": etag})
+    assert again.status_code == 304
@@ -0,0 +1,145 @@
+"""Idempotency-Key: replay, body conflicts and duplicates racing for one key."""
+import asyncio
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, select
+
+from src.models.idempotency import IdempotencyRecord
+from src.models.task import Task
+from src.schemas.task import TaskCreate
+from src.services import idempotency_service, task_service
+
+
+async def _count(db, model):
+    count = await db.scalar(select(func.count()).select_from(model))
+    # Hand the in-memory database's single connection back to the pool
+    await db.rollback()
+    return count
+
+
+async def test_retry_replays_first_response(client, db):
+    headers = {"Idempotency-Key": "create-1"}
+    first = await client.post("/api/v1/tasks", json={"title": "Once"}, headers=headers)
+    assert first.status_code == 201
+    assert "idempotent-replayed" not in first.headers
+
+    # Replayed from the table, not just this worker's cache
+    idempotency_service.clear_cache()
+    retry = await client.post("/api/v1/tasks", json={"title": "Once"}, headers=headers)
+    assert retry.status_code == 201
+    assert retry.headers["idempotent-replayed"] == "true"
+    assert retry.json() == first.json()
+    assert await _count(db, Task) == 1
+
+
+async def test_key_reused_with_different_body_is_rejected(client, db):
+    headers = {"Idempotency-Key": "create-2"}
+    await client.post("/api/v1/tasks", json={"title": "First"}, headers=headers)
+    response = await client.post("/api/v1/tasks", json={"title": "Second"}, headers=headers)
+    assert response.status_code == 422
+    assert await _count(db, Task) == 1
+
+
+async def test_concurrent_duplicates_create_once(client, db):
+    headers = {"Idempotency-Key": "create-3"}
+    responses = await asyncio.gather(*(
+        client.post("/api/v1/tasks", json={"title": "Raced"}, headers=headers) for _ in range(4)
+    ))
+    assert [response.status_code for response in responses] == [201] * 4
+    assert len({response.json()["id"] for response in responses}) == 1
+    assert sum("idempotent-replayed" in response.headers for response in responses) == 3
+    assert await _count(db, Task) == 1
+
+
+async def test_duplicate_waits_for_pending_record(client, db):
+    # Another worker holds the key; the duplicate gets its response once stored
+    now = datetime.utcnow()
+    db.add(IdempotencyRecord(
+        key="tasks:create-4",
+        request_hash=idempotency_service._request_hash(
+            TaskCreate(title="Elsewhere").model_dump(mode="json")
+        ),
+        created_at=now,
+        expires_at=now + timedelta(hours=1),
+    ))
+    await db.commit()
+
+    async def finish_elsewhere():
+        await asyncio.sleep(0.1)
+        record = await db.get(IdempotencyRecord, "tasks:create-4")
+        record.status_code = 201
+        record.response_body = '{"id": 42}'
+        await db.commit()
+
+    response, _ = await asyncio.gather(
+        client.post(
+            "/api/v1/tasks", json={"title": "Elsewhere"},
+            headers={"Idempotency-Key": "create-4"},
+        ),
+        finish_elsewhere(),
+    )
+    assert response.status_code == 201
+    assert response.json() == {"id": 42}
+    assert await _count(db, Task) == 0
+
+
+async def test_duplicate_gives_up_on_stuck_record(client, db, monkeypatch):
+    monkeypatch.setattr(idempotency_service, "WAIT_SECONDS", 0.1)
+    now = datetime.utcnow()
+    db.add(IdempotencyRecord(
+        key="tasks:create-5",
+        request_hash=idempotency_service._request_hash(
+            TaskCreate(title="Stuck").model_dump(mode="json")
+        ),
+        created_at=now,
+        expires_at=now + timedelta(hours=1),
+    ))
+    await db.commit()
+
+    response = await client.post(
+        "/api/v1/tasks", json={"title": "Stuck"}, headers={"Idempotency-Key": "create-5"}
+    )
+    assert response.status_code == 409
+
+
+async def test_failed_write_releases_key(client, db, monkeypatch):
+    create_task = task_service.create_task
+
+    async def failing_create(session, task, commit=True):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(task_service, "create_task", failing_create)
+    headers = {"Idempotency-Key": "create-6"}
+    try:
+        await client.post("/api/v1/tasks", json={"title": "Retry me"}, headers=headers)
+    except RuntimeError:
+        pass
+    assert await _count(db, IdempotencyRecord) == 0
+
+    monkeypatch.setattr(task_service, "create_task", create_task)
+    response = await client.post("/api/v1/tasks", json={"title": "Retry me"}, headers=headers)
+    assert response.status_code == 201
+    assert "idempotent-replayed" not in response.headers
+
+
+async def test_failure_after_the_write_leaves_nothing_behind(client, db, monkeypatch):
+    # Storing the response fails after the task row was written
+    async def failing_store(session, key, entry):
+        raise RuntimeError("lost connection")
+
+    store_response = idempotency_service._store_response
+    monkeypatch.setattr(idempotency_service, "_store_response", failing_store)
+    headers = {"Idempotency-Key": "create-7"}
+    try:
+        await client.post("/api/v1/tasks", json={"title": "Atomic"}, headers=headers)
+    except RuntimeError:
+        pass
+    assert await _count(db, Task) == 0
+    assert await _count(db, IdempotencyRecord) == 0
+
+    monkeypatch.setattr(idempotency_service, "_store_response", store_response)
+    first = await client.post("/api/v1/tasks", json={"title": "Atomic"}, headers=headers)
+    retry = await client.post("/api/v1/tasks", json={"title": "Atomic"}, headers=headers)
+    assert first.status_code == retry.status_code == 201
+    assert retry.json() == first.json()
+    assert await _count(db, Task) == 1
@@ -0,0 +1,102 @@
+"""Job queue: one worker wins each lease, retries back off, expired leases move on."""
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import update
+
+from src.models.job import Job
+from src.services import job_service
+
+
+@pytest.fixture
+def kinds(monkeypatch):
+    calls = []
+
+    async def echo(db, payload):
+        calls.append(payload)
+        return {"echo": payload["value"]}
+
+    async def broken(db, payload):
+        raise RuntimeError("handler failed")
+
+    for name, handler in (("test_echo", echo), ("test_broken", broken)):
+        monkeypatch.setitem(
+            job_service._kinds, name, job_service.JobKind(name, handler, 1, 2, 5)
+        )
+    return calls
+
+
+# Each helper ends its read, handing the in-memory database's single connection back
+
+async def _claim(db, kind):
+    lease = await job_service._claim(db, [kind])
+    await db.commit()
+    return lease
+
+
+async def _job(db, job_id):
+    job = await db.get(Job, job_id, populate_existing=True)
+    await db.commit()
+    return job
+
+
+async def test_a_job_is_leased_once_and_runs(db, kinds):
+    queued = await job_service.enqueue(db, "test_echo", {"value": 7})
+
+    lease = await _claim(db, "test_echo")
+    assert lease.id == queued.id and lease.attempts == 1
+    assert await _claim(db, "test_echo") is None
+
+    await job_service._execute(lease)
+    job = await _job(db, queued.id)
+    assert job.status == "succeeded" and job.result == '{"echo": 7}'
+    assert kinds == [{"value": 7}]
+
+
+async def test_failures_retry_with_backoff_then_fail(db, kinds):
+    queued = await job_service.enqueue(db, "test_broken")
+
+    await job_service._execute(await _claim(db, "test_broken"))
+    job = await _job(db, queued.id)
+    assert job.status == "queued" and job.attempts == 1
+    assert job.run_after.replace(tzinfo=None) > datetime.utcnow()
+    assert "handler failed" in job.last_error
+    # Not due until the backoff has passed
+    assert await _claim(db, "test_broken") is None
+
+    await db.execute(update(Job).values(run_after=datetime.utcnow() - timedelta(seconds=1)))
+    await db.commit()
+    await job_service._execute(await _claim(db, "test_broken"))
+    job = await _job(db, queued.id)
+    assert job.status == "failed" and job.attempts == 2 and job.finished_at is not None
+
+
+async def test_expired_lease_is_taken_over(db, kinds, monkeypatch):
+    queued = await job_service.enqueue(db, "test_echo", {"value": 1})
+    stale = await _claim(db, "test_echo")
+
+    # The first worker stalls past its lease; another worker takes the job
+    await db.execute(update(Job).values(leased_until=datetime.utcnow() - timedelta(seconds=1)))
+    await db.commit()
+    original_worker = job_service.WORKER_ID
+    monkeypatch.setattr(job_service, "WORKER_ID", "other-worker")
+    fresh = await _claim(db, "test_echo")
+    assert fresh.id == queued.id and fresh.attempts == 2
+
+    # The stalled worker's late outcome is ignored
+    monkeypatch.setattr(job_service, "WORKER_ID", original_worker)
+    await job_service._finish(stale, {"status": "failed", "finished_at": datetime.utcnow()})
+    job = await _job(db, queued.id)
+    assert job.status == "running" and job.lease_owner == "other-worker"
+
+
+async def test_lease_expired_on_final_attempt_fails_the_job(db, kinds):
+    queued = await job_service.enqueue(db, "test_echo", {"value": 1}, max_attempts=1)
+    await _claim(db, "test_echo")
+    await db.execute(update(Job).values(leased_until=datetime.utcnow() - timedelta(seconds=1)))
+    await db.commit()
+
+    assert await _claim(db, "test_echo") is None
+    await job_service._expire_abandoned(db)
+    job = await _job(db, queued.id)
+    assert job.status == "failed" and "Lease expired" in job.last_error
@@ -0,0 +1,30 @@
+"""Logging setup: uvicorn's loggers share the root queue handler."""
+import logging
+
+from src.server import server_options
+from src.utils import logging_config
+
+
+def test_uvicorn_loggers_propagate_to_the_queue(app):
+    root_handlers = logging.getLogger().handlers
+    assert any(isinstance(h, logging_config._SamplingQueueHandler) for h in root_handlers)
+
+    for name in logging_config.UVICORN_LOGGERS:
+        uvicorn_logger = logging.getLogger(name)
+        assert uvicorn_logger.handlers == []
+        assert uvicorn_logger.propagate is True
+
+    # uvicorn.run would otherwise install its own stream handlers again
+    assert server_options()["log_config"] is None
+
+
+def test_prepare_freezes_the_message_in_the_caller():
+    handler = logging_config._SamplingQueueHandler(None, 1)
+    items = ["first"]
+    record = logging.LogRecord("uvicorn.access", logging.INFO, __file__, 1, "%s", (items,), None)
+
+    prepared = handler.prepare(record)
+    items.append("second")
+
+    assert prepared.getMessage() == "['first']"
+    assert prepared.request_id == "-"
@@ -0,0 +1,148 @@
+"""Pomodoro sessions: focus counters, advancing the cycle and the one-active rule."""
+from sqlalchemy import select, text, update
+
+from src.models.pomodoro import PomodoroSession
+from src.schemas.pomodoro import PomodoroSessionUpdate
+from src.services import pomodoro_service
+
+
+async def _task_with_session(client):
+    task = (await client.post("/api/v1/tasks", json={"title": "Deep work"})).json()
+    session = (await client.post(
+        "/api/v1/pomodoro/sessions",
+        json={"session_type": "focus", "duration": 25, "task_id": task["id"]},
+    )).json()
+    return task, session
+
+
+async def _counters(client, task_id):
+    task = (await client.get(f"/api/v1/tasks/{task_id}")).json()
+    return task["focus_sessions_completed"], task["focus_minutes"]
+
+
+async def test_completing_counts_once(client):
+    task, session = await _task_with_session(client)
+    for _ in range(2):
+        response = await client.put(
+            f"/api/v1/pomodoro/sessions/{session['id']}", json={"state": "completed"}
+        )
+        assert response.status_code == 200
+    assert await _counters(client, task["id"]) == (1, 25)
+
+    await client.put(f"/api/v1/pomodoro/sessions/{session['id']}", json={"state": "cancelled"})
+    assert await _counters(client, task["id"]) == (0, 0)
+
+
+async def test_stale_read_does_not_double_count(client, db):
+    task, session = await _task_with_session(client)
+    # This request read the session before it was completed...
+    stale = await pomodoro_service.get_session(db, session["id"])
+    assert stale.state == "pending"
+    # (ending the read keeps the loaded state and frees the in-memory connection)
+    await db.commit()
+
+    # ...then another request completed it
+    await client.put(f"/api/v1/pomodoro/sessions/{session['id']}", json={"state": "completed"})
+    assert await _counters(client, task["id"]) == (1, 25)
+
+    updated = await pomodoro_service.update_session(
+        db, session["id"], PomodoroSessionUpdate(state="completed")
+    )
+    assert updated.state == "completed"
+    await db.rollback()
+    assert await _counters(client, task["id"]) == (1, 25)
+
+
+async def _active_ids(db):
+    result = await db.execute(
+        select(PomodoroSession.id).where(PomodoroSession.state == "active")
+    )
+    ids = list(result.scalars())
+    await db.rollback()
+    return ids
+
+
+async def test_advance_walks_the_cycle(client, db):
+    first = (await client.post("/api/v1/pomodoro/advance")).json()
+    assert first["completed"] is None
+    assert first["active"]["session_type"] == "focus"
+    assert first["active"]["state"] == "active"
+
+    second = (await client.post("/api/v1/pomodoro/advance")).json()
+    assert second["completed"]["id"] == first["active"]["id"]
+    assert second["completed"]["state"] == "completed"
+    assert second["active"]["session_type"] == "break"
+    assert await _active_ids(db) == [second["active"]["id"]]
+
+
+async def test_advance_starts_the_oldest_pending_session(client):
+    planned = (await client.post("/api/v1/pomodoro/plan", json={"count": 3})).json()
+    advanced = (await client.post("/api/v1/pomodoro/advance")).json()
+    assert advanced["active"]["id"] == planned[0]["id"]
+
+
+async def test_concurrent_advance_cannot_start_a_second_session(client, db, monkeypatch):
+    active = (await client.post("/api/v1/pomodoro/advance")).json()["active"]
+
+    # A concurrent advance that read "no active session" before this one committed
+    async def no_active_session(session):
+        return None
+
+    monkeypatch.setattr(pomodoro_service, "get_active_session", no_active_session)
+    response = await client.post("/api/v1/pomodoro/advance")
+    assert response.status_code == 409
+    assert await _active_ids(db) == [active["id"]]
+
+
+async def _new_session(client):
+    return (await client.post(
+        "/api/v1/pomodoro/sessions", json={"session_type": "focus", "duration": 25}
+    )).json()
+
+
+async def test_starting_a_session_cancels_the_stale_active_one(client, db):
+    # Left running in a closed tab or on another device
+    stale = (await client.post("/api/v1/pomodoro/advance")).json()["active"]
+    other = await _new_session(client)
+
+    response = await client.put(
+        f"/api/v1/pomodoro/sessions/{other['id']}", json={"state": "active"}
+    )
+    assert response.status_code == 200
+    assert await _active_ids(db) == [other["id"]]
+    stale = (await client.get(f"/api/v1/pomodoro/sessions/{stale['id']}")).json()
+    assert stale["state"] == "cancelled"
+
+
+async def test_startup_keeps_several_active_sessions(client, db):
+    from src.database import init_db
+    from src.models.pomodoro import ONE_ACTIVE_INDEX
+
+    async def index_exists():
+        result = await db.execute(text(
+            "SELECT count(*) FROM sqlite_master WHERE type = 'index' AND name = :name"
+        ), {"name": ONE_ACTIVE_INDEX})
+        exists = result.scalar() == 1
+        await db.rollback()
+        return exists
+
+    # A database from before the one-active index
+    await db.execute(text(f"DROP INDEX {ONE_ACTIVE_INDEX}"))
+    await db.commit()
+    first, second = await _new_session(client), await _new_session(client)
+    await db.execute(
+        update(PomodoroSession)
+        .where(PomodoroSession.id.in_([first["id"], second["id"]]))
+        .values(state="active")
+    )
+    await db.commit()
+
+    await init_db()
+    assert sorted(await _active_ids(db)) == [first["id"], second["id"]]
+    assert not await index_exists()
+
+    third = await _new_session(client)
+    await client.put(f"/api/v1/pomodoro/sessions/{third['id']}", json={"state": "active"})
+    await init_db()
+    assert await _active_ids(db) == [third["id"]]
+    assert await index_exists()
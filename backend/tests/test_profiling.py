@@ -0,0 +1,36 @@
+"""Request profiles are stored in PROFILE_DIR, visible to every worker."""
+from src.middleware import profiling
+
+
+async def test_profile_is_served_from_the_shared_directory(client, tmp_path, monkeypatch):
+    monkeypatch.setattr(profiling, "PROFILE_DIR", tmp_path)
+
+    response = await client.get("/api/v1/tasks", headers={"X-Profile": "1"})
+    profile_id = response.headers["x-profile-id"]
+    assert (tmp_path / f"{profile_id}.json").exists()
+
+    # Another worker has no in-memory state, only the directory
+    listed = (await client.get("/api/v1/admin/profiles")).json()
+    assert [profile["id"] for profile in listed] == [profile_id]
+    assert listed[0]["path"] == "/api/v1/tasks" and listed[0]["status_code"] == 200
+
+    stacks = await client.get(f"/api/v1/admin/profiles/{profile_id}")
+    assert stacks.status_code == 200
+
+
+async def test_oldest_profiles_are_pruned(client, tmp_path, monkeypatch):
+    monkeypatch.setattr(profiling, "PROFILE_DIR", tmp_path)
+    monkeypatch.setattr(profiling, "MAX_STORED", 2)
+
+    ids = [
+        (await client.get("/api/v1/tasks", headers={"X-Profile": "1"})).headers["x-profile-id"]
+        for _ in range(3)
+    ]
+    listed = [profile["id"] for profile in (await client.get("/api/v1/admin/profiles")).json()]
+    assert len(listed) == 2 and ids[0] not in listed
+
+
+async def test_unknown_or_unsafe_profile_id_is_not_found(client, tmp_path, monkeypatch):
+    monkeypatch.setattr(profiling, "PROFILE_DIR", tmp_path)
+    for profile_id in ("missing", "..%2Fsecret", ".hidden"):
+        assert (await client.get(f"/api/v1/admin/profiles/{profile_id}")).status_code == 404
@@ -0,0 +1,25 @@
+"""Smoke run of benchmarks/check_query_plans.py against a small seeded database."""
+import importlib.util
+from pathlib import Path
+
+from sqlalchemy import text
+
+from src.database import engine
+from src.services import seed_service
+
+_SCRIPT = Path(__file__).parent.parent / "benchmarks" / "check_query_plans.py"
+_spec = importlib.util.spec_from_file_location("check_query_plans", _SCRIPT)
+check_query_plans = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(check_query_plans)
+
+
+async def test_hot_queries_use_indexes():
+    await seed_service.seed(tasks=200, sessions=1000, days=60, random_seed=1)
+    async with engine.begin() as conn:
+        await conn.execute(text("ANALYZE"))
+
+    findings = await check_query_plans.check_plans()
+
+    assert findings
+    problems = [(f.query, f.statement, f.problems) for f in findings if f.problems]
+    assert problems == []
@@ -0,0 +1,100 @@
+"""Rate limiting by address (X-Client-Id only narrows it), its 429s, and polling flights."""
+import asyncio
+
+import httpx
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+
+from src.database import AsyncSessionLocal, database_role
+from src.middleware.rate_limit import InMemoryBackend, RateLimitMiddleware
+from src.utils.singleflight import SingleFlight
+
+
+def _client(clients_per_address=2):
+    async def ok(request):
+        return PlainTextResponse("ok")
+
+    app = RateLimitMiddleware(
+        Starlette(routes=[Route("/", ok)]),
+        rate=0.001,
+        burst=2,
+        backend=InMemoryBackend(),
+        clients_per_address=clients_per_address,
+    )
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+
+
+async def _statuses(client, count, headers=None):
+    return [(await client.get("/", headers=headers)).status_code for _ in range(count)]
+
+
+async def test_client_is_limited_by_address():
+    async with _client() as client:
+        assert await _statuses(client, 3) == [200, 200, 429]
+
+
+async def test_rotating_client_ids_share_the_address_budget():
+    async with _client(clients_per_address=2) as client:
+        statuses = []
+        for i in range(6):
+            statuses += await _statuses(client, 1, {"X-Client-Id": f"device-{i}"})
+        # Two client budgets of two requests each, then the address is spent
+        assert statuses == [200, 200, 200, 200, 429, 429]
+
+
+async def test_client_ids_split_an_address():
+    async with _client() as client:
+        assert await _statuses(client, 3, {"X-Client-Id": "phone"}) == [200, 200, 429]
+        assert await _statuses(client, 1, {"X-Client-Id": "laptop"}) == [200]
+
+
+async def test_polling_keys_name_the_database():
+    replica = create_async_engine("sqlite+aiosqlite://")
+    try:
+        assert database_role(AsyncSessionLocal()) == "primary"
+        assert database_role(AsyncSession(bind=replica)) == "replica"
+    finally:
+        await replica.dispose()
+
+
+async def test_429_is_readable_by_the_browser(app, client, monkeypatch):
+    await client.get("/api/v1/health")
+    limiter = app.middleware_stack
+    while not isinstance(limiter, RateLimitMiddleware):
+        limiter = limiter.app
+    monkeypatch.setattr(limiter, "rate", 0.001)
+    monkeypatch.setattr(limiter, "burst", 1)
+    monkeypatch.setattr(limiter, "backend", InMemoryBackend())
+
+    headers = {"Origin": "http://localhost:5173"}
+    assert (await client.get("/api/v1/tasks", headers=headers)).status_code == 200
+    response = await client.get("/api/v1/tasks", headers=headers)
+    assert response.status_code == 429
+    assert response.headers["access-control-allow-origin"] == "http://localhost:5173"
+    assert "Retry-After" in response.headers["access-control-expose-headers"]
+    assert int(response.headers["retry-after"]) >= 1
+
+
+async def test_followers_retry_when_the_leader_is_cancelled():
+    flight = SingleFlight()
+    calls = []
+    release = asyncio.Event()
+
+    async def load():
+        calls.append(len(calls))
+        await release.wait()
+        return len(calls)
+
+    leader = asyncio.create_task(flight.do("stats", load))
+    await asyncio.sleep(0)
+    follower = asyncio.create_task(flight.do("stats", load))
+    await asyncio.sleep(0)
+
+    # The leader's client disconnected
+    leader.cancel()
+    await asyncio.sleep(0)
+    release.set()
+    assert await follower == 2
+    assert leader.cancelled()
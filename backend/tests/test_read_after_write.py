@@ -0,0 +1,46 @@
+"""Read-after-write tokens route a client's reads to the primary after it writes."""
+from starlette.requests import Request
+
+import src.database as database
+from src.database import (
+    READ_AFTER_WRITE_HEADER,
+    AsyncReadSessionLocal,
+    AsyncSessionLocal,
+    read_session_factory,
+)
+
+
+def _request(token=None):
+    headers = [(READ_AFTER_WRITE_HEADER.lower().encode(), token.encode())] if token else []
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": headers})
+
+
+async def test_write_token_keeps_reads_on_primary(client, monkeypatch):
+    monkeypatch.setattr(database, "read_engine", object())
+
+    response = await client.post("/api/v1/tasks", json={"title": "Fresh"})
+    token = response.headers[READ_AFTER_WRITE_HEADER]
+    assert read_session_factory(_request(token)) is AsyncSessionLocal
+    assert read_session_factory(_request()) is AsyncReadSessionLocal
+
+    # Reads do not issue tokens
+    assert READ_AFTER_WRITE_HEADER not in (await client.get("/api/v1/tasks")).headers
+
+
+async def test_forged_or_expired_token_reads_from_replica(monkeypatch):
+    monkeypatch.setattr(database, "read_engine", object())
+    token = database.read_after_write_token()
+    expires, _, signature = token.partition(":")
+
+    extended = f"{float(expires) + 3600:.3f}:{signature}"
+    assert read_session_factory(_request(extended)) is AsyncReadSessionLocal
+    assert read_session_factory(_request("garbage")) is AsyncReadSessionLocal
+
+    monkeypatch.setattr(database, "READ_AFTER_WRITE_SECONDS", -1)
+    expired = database.read_after_write_token()
+    assert read_session_factory(_request(expired)) is AsyncReadSessionLocal
+
+
+async def test_no_token_without_replica(client):
+    response = await client.post("/api/v1/tasks", json={"title": "Single database"})
+    assert READ_AFTER_WRITE_HEADER not in response.headers
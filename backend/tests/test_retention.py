@@ -0,0 +1,136 @@
+"""Retention: archiving and compacting old sessions keeps history and counters intact."""
+from datetime import date, datetime
+
+from sqlalchemy import func, select
+
+from src.models.pomodoro import PomodoroDailyStat, PomodoroSession
+from src.models.task import Task
+from src.services import focus_counter_service, retention_service, sync_service, task_service
+
+TODAY = date(2026, 10, 15)
+
+
+def _session(task_id, created, state="completed", session_type="focus", duration=25):
+    created_at = datetime.combine(created, datetime.min.time()).replace(hour=9)
+    return PomodoroSession(
+        task_id=task_id,
+        session_type=session_type,
+        duration=duration,
+        state=state,
+        created_at=created_at,
+        completed_at=created_at.replace(hour=10) if state == "completed" else None,
+    )
+
+
+async def _seed(db):
+    task = Task(title="Thesis")
+    db.add(task)
+    await db.flush()
+    db.add_all([
+        _session(task.id, date(2025, 6, 10)),  # past retention: rolled up
+        _session(task.id, date(2025, 6, 11), state="cancelled"),
+        _session(task.id, date(2026, 5, 3)),  # past the hot window: archived
+        _session(None, date(2026, 5, 3), session_type="break", duration=5),
+        _session(task.id, date(2026, 1, 5), state="active"),  # unfinished: stays
+        _session(task.id, date(2026, 9, 20)),  # hot
+    ])
+    await db.commit()
+    await focus_counter_service.reconcile(db, fix=True)
+    await db.commit()
+    return task.id
+
+
+async def _history(db):
+    return await retention_service.get_daily_focus_history(db, date(2025, 1, 1), date(2026, 11, 1))
+
+
+async def test_retention_moves_sessions_and_keeps_history(db):
+    task_id = await _seed(db)
+    history = await _history(db)
+    assert history[date(2025, 6, 10)] == (1, 25)
+
+    report = await retention_service.run_retention(
+        db, hot_months=3, retention_months=12, today=TODAY
+    )
+    assert report.archived_sessions == 4
+    assert report.archived_months == ["2025-06", "2026-05"]
+    assert report.compacted_months == ["2025-06"]
+
+    live = await db.execute(select(PomodoroSession.state, PomodoroSession.created_at))
+    assert sorted(row.state for row in live) == ["active", "completed"]
+    assert await retention_service.list_archive_months(db) == [date(2026, 5, 1)]
+    assert await db.scalar(select(func.count()).select_from(PomodoroDailyStat)) == 2
+
+    assert await _history(db) == history
+    assert (await focus_counter_service.reconcile(db, fix=False)).mismatched == 0
+    task = await db.get(Task, task_id)
+    assert (task.focus_sessions_completed, task.focus_minutes) == (3, 75)
+
+
+async def test_dry_run_changes_nothing(db):
+    await _seed(db)
+    report = await retention_service.run_retention(db, today=TODAY, dry_run=True)
+    assert report.dry_run and report.archived_months == ["2025-06", "2026-05"]
+    assert await db.scalar(select(func.count()).select_from(PomodoroSession)) == 6
+    assert await retention_service.list_archive_months(db) == []
+
+
+async def test_rerun_is_a_no_op(db):
+    await _seed(db)
+    await retention_service.run_retention(db, today=TODAY)
+    again = await retention_service.run_retention(db, today=TODAY)
+    assert again.archived_sessions == 0 and again.compacted_months == []
+
+
+async def test_archived_sessions_leave_delta_sync(db):
+    await _seed(db)
+    live = await db.execute(select(PomodoroSession.id))
+    synced = set(live.scalars())
+    await sync_service.backfill_change_log(await db.connection())
+    await db.commit()
+
+    await retention_service.run_retention(db, today=TODAY)
+    changes = await sync_service.get_changes(db, since=0)
+    remaining = {session.id for session in changes.pomodoro_sessions}
+    assert set(changes.deleted.pomodoro_sessions) == synced - remaining
+    assert len(remaining) == 2
+
+
+async def test_deleted_task_history_is_not_inherited(db):
+    task_id = await _seed(db)
+    await retention_service.run_retention(db, hot_months=3, retention_months=12, today=TODAY)
+    await task_service.delete_task(db, task_id)
+
+    # SQLite hands the freed id to the next task
+    reused = Task(id=task_id, title="New task")
+    db.add(reused)
+    await db.commit()
+    report = await focus_counter_service.reconcile(db, fix=False)
+    assert report.mismatched == 0
+    linked = await db.scalar(
+        select(func.count()).select_from(PomodoroDailyStat)
+        .where(PomodoroDailyStat.task_id == task_id)
+    )
+    assert linked == 0
+
+
+async def test_archiving_commits_in_batches(db, monkeypatch):
+    await _seed(db)
+    db.add_all([_session(None, date(2026, 5, day)) for day in range(4, 9)])
+    await db.commit()
+    monkeypatch.setattr(retention_service, "ARCHIVE_BATCH_SIZE", 2)
+
+    commits = []
+    monkeypatch.setattr(db, "commit", _counting(db.commit, commits))
+    moved, _ = await retention_service.archive_sessions(db, hot_months=3, today=TODAY)
+
+    # 2025-06: 2 sessions in one batch; 2026-05: 7 sessions in four batches
+    assert moved == 9
+    assert len(commits) == 5
+
+
+def _counting(commit, calls):
+    async def counted():
+        calls.append(1)
+        await commit()
+    return counted
@@ -0,0 +1,82 @@
+"""Task search: FTS5 matching, ranking, the completed filter, paging and the LIKE fallback."""
+from src.services import search_service
+
+
+async def _create(client, title, description=None):
+    response = await client.post("/api/v1/tasks", json={"title": title, "description": description})
+    assert response.status_code == 201
+    return response.json()["id"]
+
+
+async def _search(client, q, **params):
+    response = await client.get("/api/v1/tasks/search", params={"q": q, **params})
+    assert response.status_code == 200
+    return response.json()
+
+
+def _titles(page):
+    return [task["title"] for task in page["items"]]
+
+
+async def test_matches_title_and_description_by_prefix(client):
+    await _create(client, "Quarterly budget")
+    await _create(client, "Call the bank", "Ask about the budgeting tool")
+    await _create(client, "Water the plants")
+
+    assert sorted(_titles(await _search(client, "budg"))) == ["Call the bank", "Quarterly budget"]
+    # Every word has to match somewhere in the task
+    assert _titles(await _search(client, "bank budget")) == ["Call the bank"]
+    # Quotes and operators are dropped rather than passed to the MATCH syntax
+    assert _titles(await _search(client, '"plants* -(')) == ["Water the plants"]
+    assert _titles(await _search(client, "!!")) == []
+
+
+async def test_best_match_comes_first(client):
+    await _create(client, "Weekly review", "Notes on the report, plus inbox, calendar and backlog")
+    await _create(client, "Report")
+    await _create(client, "Report draft", "Finish the report before the report meeting")
+
+    # Short, focused titles beat a passing mention in a long description
+    assert _titles(await _search(client, "report")) == ["Report", "Report draft", "Weekly review"]
+
+
+async def test_index_follows_updates_and_deletes(client):
+    renamed = await _create(client, "Draft slides")
+    removed = await _create(client, "Draft letter")
+
+    await client.put(f"/api/v1/tasks/{renamed}", json={"title": "Final slides"})
+    await client.delete(f"/api/v1/tasks/{removed}")
+
+    assert _titles(await _search(client, "draft")) == []
+    assert _titles(await _search(client, "final")) == ["Final slides"]
+
+
+async def test_completed_tasks_can_be_excluded(client):
+    done = await _create(client, "Pay rent")
+    await _create(client, "Pay invoice")
+    await client.put(f"/api/v1/tasks/{done}", json={"completed": True})
+
+    assert sorted(_titles(await _search(client, "pay"))) == ["Pay invoice", "Pay rent"]
+    assert _titles(await _search(client, "pay", include_completed=False)) == ["Pay invoice"]
+
+
+async def test_pages_with_has_more(client):
+    for i in range(5):
+        await _create(client, f"Errand {i}")
+
+    first = await _search(client, "errand", limit=3)
+    second = await _search(client, "errand", limit=3, offset=3)
+
+    assert first["has_more"] is True and len(first["items"]) == 3
+    assert second["has_more"] is False and len(second["items"]) == 2
+    assert sorted(_titles(first) + _titles(second)) == [f"Errand {i}" for i in range(5)]
+
+
+async def test_like_fallback_without_fts5(client, monkeypatch):
+    await _create(client, "Book flights", "Check baggage allowance")
+    await _create(client, "Book dentist")
+
+    monkeypatch.setattr(search_service, "fts_available", False)
+
+    assert _titles(await _search(client, "book")) == ["Book flights", "Book dentist"]
+    assert _titles(await _search(client, "book baggage")) == ["Book flights"]
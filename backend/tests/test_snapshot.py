@@ -0,0 +1,38 @@
+"""In-memory database snapshots: save to disk and restore into the live database."""
+import sqlite3
+
+from sqlalchemy import select
+
+from src.models.task import Task
+from src.services import snapshot_service
+
+
+async def _titles(db):
+    titles = set((await db.execute(select(Task.title))).scalars())
+    await db.commit()
+    return titles
+
+
+async def test_snapshot_round_trip(client, db, tmp_path, monkeypatch):
+    path = str(tmp_path / "focusflow.db")
+    await client.post("/api/v1/tasks", json={"title": "Saved"})
+
+    report = await snapshot_service.save_snapshot(path)
+    assert report.bytes > 0
+    with sqlite3.connect(path) as saved:
+        assert saved.execute("SELECT title FROM tasks").fetchall() == [("Saved",)]
+
+    await client.post("/api/v1/tasks", json={"title": "After the snapshot"})
+    assert await _titles(db) == {"Saved", "After the snapshot"}
+
+    monkeypatch.setattr(snapshot_service, "_restored", False)
+    assert await snapshot_service.restore_snapshot(path) is not None
+    assert await _titles(db) == {"Saved"}
+
+    # Only once per process, never over data written since
+    assert await snapshot_service.restore_snapshot(path) is None
+
+
+async def test_missing_snapshot_starts_empty(tmp_path, monkeypatch):
+    monkeypatch.setattr(snapshot_service, "_restored", False)
+    assert await snapshot_service.restore_snapshot(str(tmp_path / "absent.db")) is None
@@ -0,0 +1,104 @@
+"""Delta sync: change log ordering, pull/push round trips and per-operation errors."""
+from sqlalchemy import func, select
+from sqlalchemy.exc import IntegrityError
+
+from src.models.sync import ChangeLogEntry
+from src.models.task import Task
+from src.services import sync_service, task_service
+
+
+async def test_push_then_pull_round_trip(client):
+    response = await client.post("/api/v1/sync", json={"operations": [
+        {"entity": "task", "action": "create", "client_ref": "a",
+         "data": {"title": "Write report"}},
+        {"entity": "task", "action": "create", "client_ref": "b", "data": {"title": "Review"}},
+    ]})
+    assert response.status_code == 200
+    pushed = response.json()
+    assert [result["status"] for result in pushed["results"]] == ["ok", "ok"]
+    first_id, second_id = (result["id"] for result in pushed["results"])
+
+    full = (await client.get("/api/v1/sync", params={"since": 0})).json()
+    assert {task["title"] for task in full["tasks"]} == {"Write report", "Review"}
+    assert full["cursor"] == pushed["cursor"]
+
+    empty = (await client.get("/api/v1/sync", params={"since": full["cursor"]})).json()
+    assert empty["tasks"] == [] and empty["cursor"] == full["cursor"]
+
+    await client.post("/api/v1/sync", json={"operations": [
+        {"entity": "task", "action": "update", "id": first_id, "data": {"completed": True}},
+        {"entity": "task", "action": "delete", "id": second_id},
+    ]})
+    delta = (await client.get("/api/v1/sync", params={"since": full["cursor"]})).json()
+    assert [task["id"] for task in delta["tasks"]] == [first_id]
+    assert delta["tasks"][0]["completed"] is True
+    assert delta["deleted"]["tasks"] == [second_id]
+    assert delta["cursor"] > full["cursor"]
+
+
+async def test_pull_pages_with_has_more(client):
+    for i in range(5):
+        await client.post("/api/v1/tasks", json={"title": f"Task {i}"})
+
+    seen, cursor = [], 0
+    while True:
+        page = (await client.get("/api/v1/sync", params={"since": cursor, "limit": 2})).json()
+        seen += [task["title"] for task in page["tasks"]]
+        cursor = page["cursor"]
+        if not page["has_more"]:
+            break
+    assert sorted(seen) == [f"Task {i}" for i in range(5)]
+
+
+async def test_change_entry_written_at_commit_and_dropped_on_rollback(db):
+    await sync_service.record_change(db, sync_service.TASK, 41)
+    await db.rollback()
+    await sync_service.record_change(db, sync_service.TASK, 42)
+    await sync_service.record_change(db, sync_service.TASK, 42, deleted=True)
+    await db.commit()
+
+    result = await db.execute(select(ChangeLogEntry.entity_id, ChangeLogEntry.deleted))
+    assert result.all() == [(42, True)]
+
+
+async def test_rewritten_row_moves_past_the_cursor(client, db):
+    task = (await client.post("/api/v1/tasks", json={"title": "Old"})).json()
+    other = (await client.post("/api/v1/tasks", json={"title": "Other"})).json()
+    cursor = (await client.get("/api/v1/sync")).json()["cursor"]
+
+    await client.put(f"/api/v1/tasks/{task['id']}", json={"title": "New"})
+    delta = (await client.get("/api/v1/sync", params={"since": cursor})).json()
+    assert [row["title"] for row in delta["tasks"]] == ["New"]
+    assert other["id"] not in [row["id"] for row in delta["tasks"]]
+    assert (await db.execute(select(func.count()).select_from(ChangeLogEntry))).scalar() == 2
+
+
+async def test_failing_operation_is_reported_and_batch_continues(client, monkeypatch):
+    create_task = task_service.create_task
+
+    async def flaky_create(db, task_data):
+        if task_data.title == "boom":
+            # Fail after writing but before committing, like a constraint violation at flush
+            db.add(Task(title=task_data.title, order=0))
+            await db.flush()
+            await sync_service.record_change(db, sync_service.TASK, 12345)
+            raise IntegrityError("INSERT", {}, Exception("constraint failed"))
+        return await create_task(db, task_data)
+
+    monkeypatch.setattr(task_service, "create_task", flaky_create)
+    response = await client.post("/api/v1/sync", json={"operations": [
+        {"entity": "task", "action": "create", "data": {"title": "first"}},
+        {"entity": "task", "action": "create", "data": {"title": "boom"}},
+        {"entity": "task", "action": "update", "id": 999, "data": {"title": "x"}},
+        {"entity": "task", "action": "create", "data": {"title": "last"}},
+    ]})
+
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [result["status"] for result in results] == ["ok", "error", "not_found", "ok"]
+    assert results[1]["detail"].startswith("IntegrityError")
+
+    titles = [task["title"] for task in (await client.get("/api/v1/tasks")).json()]
+    assert titles == ["first", "last"]
+    synced = (await client.get("/api/v1/sync")).json()
+    assert sorted(task["title"] for task in synced["tasks"]) == ["first", "last"]
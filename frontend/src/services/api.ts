@@ -31,9 +31,17 @@ export const api = axios.create({
   withCredentials: false, // Set to true if using cookies/sessions
 })
 
+// Token from our last write; sending it back keeps our reads on the primary
+// database (not a lagging replica) for a few seconds after the write
+const READ_AFTER_WRITE_HEADER = 'X-Read-After-Write'
+let readAfterWriteToken: string | null = null
+
 // Request interceptor
 api.interceptors.request.use(
   (config) => {
+    if (readAfterWriteToken) {
+      config.headers.set(READ_AFTER_WRITE_HEADER, readAfterWriteToken)
+    }
     return config
   },
   (error) => {
@@ -43,7 +51,13 @@ api.interceptors.request.use(
 
 // Response interceptor
 api.interceptors.response.use(
-  (response) => response,
+  (response) => {
+    const token = response.headers[READ_AFTER_WRITE_HEADER.toLowerCase()]
+    if (token) {
+      readAfterWriteToken = token
+    }
+    return response
+  },
   (error) => {
     if (error.response) {
       console.error('API Error:', error.response.data)
@@ -3,6 +3,9 @@ import {
   PomodoroSession,
   PomodoroSessionCreate,
   PomodoroSessionUpdate,
+  PomodoroPlanRequest,
+  PomodoroAdvanceRequest,
+  PomodoroAdvanceResponse,
   PomodoroStats,
 } from '@/types/pomodoro'
 
@@ -27,6 +30,16 @@ export const pomodoroService = {
     return response.data
   },
 
+  async planSessions(plan: PomodoroPlanRequest = {}): Promise<PomodoroSession[]> {
+    const response = await api.post('/pomodoro/plan', plan)
+    return response.data
+  },
+
+  async advance(request: PomodoroAdvanceRequest = {}): Promise<PomodoroAdvanceResponse> {
+    const response = await api.post('/pomodoro/advance', request)
+    return response.data
+  },
+
   async getStatsToday(): Promise<PomodoroStats> {
     const response = await api.get('/pomodoro/stats/today')
     return response.data
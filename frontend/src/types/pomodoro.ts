@@ -24,6 +24,21 @@ export interface PomodoroSessionUpdate {
   paused_duration_ms?: number
 }
 
+export interface PomodoroPlanRequest {
+  count?: number
+  task_id?: number
+}
+
+export interface PomodoroAdvanceRequest {
+  task_id?: number
+  paused_duration_ms?: number
+}
+
+export interface PomodoroAdvanceResponse {
+  completed: PomodoroSession | null
+  active: PomodoroSession
+}
+
 export interface PomodoroStats {
   completed_today: number
   total_focus_time_minutes: number
@@ -4,6 +4,8 @@ export interface Task {
   description?: string
   completed: boolean
   order: number
+  focus_sessions_completed: number
+  focus_minutes: number
   created_at: string
   updated_at?: string
 }